@@ -1,8 +1,14 @@
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 
+from app.core.lifespan import lifespan
 from app.core.settings import app_settings
-from app.db.db_redis import lifespan_redis
+from app.middlewares.compression import CompressionMiddleware
+from app.middlewares.metrics import MetricsMiddleware
+from app.middlewares.profiling import ProfilingMiddleware
+from app.middlewares.sql_stats import SQLStatsMiddleware
 from app.routers import main_router
+from app.utils.responses import ModelJSONResponse
 
 _app = None
 
@@ -11,10 +17,33 @@ def _create_app() -> FastAPI:
     app = FastAPI(
         debug=app_settings.DEBUG,
         title="Meduzzen internship",
-        lifespan=lifespan_redis,
+        lifespan=lifespan,
+        default_response_class=(
+            ModelJSONResponse
+            if app_settings.FAST_JSON_RESPONSE
+            else JSONResponse
+        ),
     )
 
     app.include_router(main_router)
+    app.add_middleware(SQLStatsMiddleware, debug=app_settings.DEBUG)
+    if app_settings.COMPRESSION_ENABLED:
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=app_settings.COMPRESSION_MINIMUM_SIZE,
+            thread_threshold=app_settings.COMPRESSION_THREAD_THRESHOLD,
+            max_concurrent=app_settings.COMPRESSION_MAX_CONCURRENT,
+        )
+    if app_settings.PROFILING_ENABLED:
+        app.add_middleware(
+            ProfilingMiddleware,
+            directory=app_settings.PROFILE_DIR,
+            sample_rate=app_settings.PROFILE_SAMPLE_RATE,
+            slow_threshold=app_settings.PROFILE_SLOW_THRESHOLD,
+            max_duration=app_settings.PROFILE_MAX_DURATION,
+        )
+    if app_settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
 
     return app
 
@@ -2,11 +2,67 @@ USERS_PAGE_LIMIT: int = 10
 COMPANIES_PAGE_LIMIT: int = 5
 COMPANIES_MEMBERS_PAGE_LIMIT: int = 20
 COMPANIES_USERS_REQUEST_PAGE_LIMIT: int = 20
+# users or requests handled by one bulk membership call
+COMPANY_BULK_ACTION_LIMIT: int = 5000
 
 QUIZ_PAGE_LIMIT: int = 5
+# quizzes loaded and announced to company members at once
+QUIZ_BULK_BATCH_SIZE: int = 100
 
 DAYS_DATE_FILTER_RANGE = 30
+# percentiles of the score distribution analytics
+SCORE_PERCENTILES: tuple[int, ...] = (25, 50, 75, 90, 95, 99)
+LEADERBOARD_PAGE_LIMIT: int = 20
+LEADERBOARD_PAGE_MAX_LIMIT: int = 100
+# seconds till a leaderboard is filled from Postgres again, bounds drift
+# of attempts recorded while it was being filled
+LEADERBOARD_EXPIRE_TIME: int = 60 * 60
+# members or quizzes handled by one batch analytics call
+ANALYTICS_BATCH_LIMIT: int = 500
+
+EXPORT_CHUNK_SIZE: int = 64 * 1024
+# seconds shared caches keep public company responses
+PUBLIC_CACHE_MAX_AGE: int = 60
+
+# compression levels of the response encodings, fast over small
+COMPRESSION_GZIP_LEVEL: int = 6
+COMPRESSION_BROTLI_QUALITY: int = 4
+COMPRESSION_ZSTD_LEVEL: int = 3
 
 # redis
 REDIS_MAX_CONNECTIONS: int = 10
 USER_QUIZ_ANSWERS_EXPIRE_TIME: int = 60 * 60 * 48
+
+# notifications
+NOTIFICATIONS_PAGE_LIMIT: int = 20
+NOTIFICATIONS_PAGE_MAX_LIMIT: int = 100
+# bounds the drift of a counter missing a concurrent update
+NOTIFICATIONS_UNREAD_COUNT_EXPIRE_TIME: int = 60 * 60
+# months kept before the current one, older partitions are dropped
+NOTIFICATIONS_RETENTION_MONTHS: int = 6
+NOTIFICATION_STREAM_KEEPALIVE: float = 15.0
+# undelivered notifications kept per connection, slow clients lose the rest
+NOTIFICATION_STREAM_QUEUE_SIZE: int = 100
+
+# partitions
+PARTITIONS_AHEAD_MONTHS: int = 3
+PARTITIONS_MAINTENANCE_INTERVAL: float = 6 * 60 * 60
+
+# health
+HEALTH_PROBE_TIMEOUT: float = 0.5
+HEALTH_CACHE_TTL: float = 1.0
+HEALTH_MAX_POOL_SATURATION: float = 1.0
+HEALTH_MAX_EVENT_LOOP_LAG: float = 0.5
+EVENT_LOOP_MONITOR_INTERVAL: float = 0.25
+
+# sql instrumentation
+N_PLUS_ONE_THRESHOLD: int = 5
+
+# metrics
+METRICS_FLUSH_INTERVAL: float = 5.0
+METRICS_STALE_AFTER: float = 30.0
+
+# profiling
+PROFILE_STACK_SAMPLE_INTERVAL: float = 0.01
+PROFILE_MAX_FILES: int = 200
+PROFILE_TOP_FUNCTIONS: int = 30
@@ -0,0 +1,121 @@
+import logging
+import typing
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Awaitable, Callable
+
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+
+from app.core.settings import get_app_settings, get_postgres_config
+from app.db.db_redis import lifespan_redis
+from app.db.postgres import get_engine, lifespan_postgres
+from app.jobs.partitions import PartitionMaintenance
+from app.services.health import HealthService
+from app.services.notification_stream import get_notification_broker
+from app.services.redis import RedisService
+from app.utils.metrics import get_metrics_exporter
+from app.utils.schemas import list_adapter
+
+type Warmup = Callable[[FastAPI], Awaitable[None]]
+
+_warmups: list[Warmup] = []
+
+
+def on_warmup(func: Warmup) -> Warmup:
+    """
+    Register coroutine run after resources are up, before worker is ready.
+    """
+    _warmups.append(func)
+    return func
+
+
+@on_warmup
+async def warm_up_list_adapters(app: FastAPI) -> None:
+    """
+    Build list TypeAdapters of the response models list fields.
+    """
+    for route in app.routes:
+        if not isinstance(route, APIRoute) or not isinstance(
+            route.response_model, type
+        ):
+            continue
+        if not issubclass(route.response_model, BaseModel):
+            continue
+        for field in route.response_model.model_fields.values():
+            if typing.get_origin(field.annotation) not in (list, typing.List):
+                continue
+            (item,) = typing.get_args(field.annotation)
+            if isinstance(item, type) and issubclass(item, BaseModel):
+                list_adapter(item)
+
+
+@asynccontextmanager
+async def lifespan_health(app: FastAPI):
+    config = get_postgres_config()
+    health = HealthService()
+    try:
+        health._init_health(
+            engine=get_engine(),
+            redis=RedisService()._get_redis(),
+            max_pool_size=(
+                config.POSTGRES_POOL_SIZE + config.POSTGRES_MAX_OVERFLOW
+            ),
+        )
+        yield
+    finally:
+        await health._close_health()
+
+
+@asynccontextmanager
+async def lifespan_partitions(app: FastAPI):
+    maintenance = PartitionMaintenance(engine=get_engine())
+    maintenance.start()
+    try:
+        yield
+    finally:
+        await maintenance.stop()
+
+
+@asynccontextmanager
+async def lifespan_notifications(app: FastAPI):
+    broker = get_notification_broker()
+    try:
+        broker._init_broker(redis=RedisService()._get_redis())
+        yield
+    finally:
+        await broker._close_broker()
+
+
+@asynccontextmanager
+async def lifespan_metrics(app: FastAPI):
+    exporter = get_metrics_exporter()
+    if get_app_settings().METRICS_ENABLED:
+        exporter.start()
+    try:
+        yield
+    finally:
+        await exporter.stop()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Start resources and background monitors, run warmups, mark ready.
+    """
+    app.state.ready = False
+    async with AsyncExitStack() as stack:
+        await stack.enter_async_context(lifespan_postgres(app))
+        await stack.enter_async_context(lifespan_partitions(app))
+        await stack.enter_async_context(lifespan_redis(app))
+        await stack.enter_async_context(lifespan_health(app))
+        await stack.enter_async_context(lifespan_notifications(app))
+        await stack.enter_async_context(lifespan_metrics(app))
+        for warmup in _warmups:
+            await warmup(app)
+        app.state.ready = True
+        logging.info("Application is ready")
+        try:
+            yield
+        finally:
+            app.state.ready = False
@@ -1,3 +1,6 @@
+from functools import cache
+from typing import Any, Literal
+
 from pydantic_settings import BaseSettings
 
 
@@ -7,6 +10,35 @@ class _AppSettings(BaseSettings):
     PORT: int = 8000
     RELOAD: bool = False
     SECRET_KEY: str = "secret_key"
+    FAST_JSON_RESPONSE: bool = True
+
+    # production server, workers = 0 means one worker per available CPU
+    PRODUCTION: bool = False
+    WORKERS: int = 0
+    LOOP: Literal["auto", "asyncio", "uvloop"] = "auto"
+    HTTP: Literal["auto", "h11", "httptools"] = "auto"
+    BACKLOG: int = 2048
+    TIMEOUT_KEEP_ALIVE: int = 5
+    TIMEOUT_GRACEFUL_SHUTDOWN: int | None = 30
+    LIMIT_CONCURRENCY: int | None = None
+
+    # metrics, with several workers snapshots are shared through the dir
+    METRICS_ENABLED: bool = True
+    METRICS_DIR: str | None = None
+
+    # response compression, max concurrent = 0 means one per CPU
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_THREAD_THRESHOLD: int = 32 * 1024
+    COMPRESSION_MAX_CONCURRENT: int = 0
+
+    # profiling of sampled and slow requests, admin endpoints need token
+    PROFILING_ENABLED: bool = False
+    PROFILE_SAMPLE_RATE: float = 0.0
+    PROFILE_SLOW_THRESHOLD: float | None = 1.0
+    PROFILE_MAX_DURATION: float | None = 10.0
+    PROFILE_DIR: str = "profiles"
+    ADMIN_TOKEN: str | None = None
 
     class Config:
         env_file = ".env"
@@ -14,7 +46,9 @@ class _AppSettings(BaseSettings):
         extra = "ignore"
 
 
-app_settings = _AppSettings()
+@cache
+def get_app_settings() -> _AppSettings:
+    return _AppSettings()
 
 
 # postgres settings
@@ -26,6 +60,11 @@ class _PostgresConfig(BaseSettings):
     POSTGRES_DB: str = "postgres"
     POSTGRES_USER: str = "postgres"
     POSTGRES_PASSWORD: str = "postgres"
+    POSTGRES_POOL_SIZE: int = 10
+    POSTGRES_MAX_OVERFLOW: int = 10
+    POSTGRES_POOL_TIMEOUT: int = 30
+    POSTGRES_POOL_RECYCLE: int = 1800
+    POSTGRES_POOL_PRE_PING: bool = False
 
     class Config:
         env_file = ".env.docker"
@@ -33,7 +72,9 @@ class _PostgresConfig(BaseSettings):
         extra = "ignore"
 
 
-postgres_config = _PostgresConfig()
+@cache
+def get_postgres_config() -> _PostgresConfig:
+    return _PostgresConfig()
 
 
 class _PostgresConfigTest(BaseSettings):
@@ -49,7 +90,9 @@ class _PostgresConfigTest(BaseSettings):
         extra = "ignore"
 
 
-postgres_config_test = _PostgresConfigTest()
+@cache
+def get_postgres_config_test() -> _PostgresConfigTest:
+    return _PostgresConfigTest()
 
 
 # redis settings
@@ -65,7 +108,9 @@ class _RedisConfig(BaseSettings):
         extra = "ignore"
 
 
-redis_conf = _RedisConfig()
+@cache
+def get_redis_config() -> _RedisConfig:
+    return _RedisConfig()
 
 
 # GWT
@@ -82,7 +127,9 @@ class _GWTConfig(BaseSettings):
         extra = "ignore"
 
 
-gwt_config = _GWTConfig()
+@cache
+def get_gwt_config() -> _GWTConfig:
+    return _GWTConfig()
 
 
 # AUTH0
@@ -101,4 +148,24 @@ class _Auth0Config(BaseSettings):
         extra = "ignore"
 
 
-auth0_config = _Auth0Config()
+@cache
+def get_auth0_config() -> _Auth0Config:
+    return _Auth0Config()
+
+
+# settings are built on first access, so importing the app does not
+# require the whole environment, e.g. GWT and AUTH0 variables
+_lazy_settings = {
+    "app_settings": get_app_settings,
+    "postgres_config": get_postgres_config,
+    "postgres_config_test": get_postgres_config_test,
+    "redis_conf": get_redis_config,
+    "gwt_config": get_gwt_config,
+    "auth0_config": get_auth0_config,
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _lazy_settings:
+        return _lazy_settings[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,45 @@
+from typing import Iterable, Sequence
+
+from sqlalchemy import Table, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+async def copy_records(
+    conn: AsyncConnection,
+    table: Table,
+    records: Iterable[Sequence],
+    columns: Sequence[str] | None = None,
+) -> int:
+    """
+    Load records into table with binary COPY, return loaded rows count.
+
+    COPY runs on the asyncpg connection of conn, in its transaction.
+    Records may be a generator, asyncpg consumes it in chunks.
+    """
+    raw_connection = await conn.get_raw_connection()
+    status = await raw_connection.driver_connection.copy_records_to_table(
+        table.name,
+        records=records,
+        columns=list(columns or table.columns.keys()),
+        schema_name=table.schema,
+    )
+    # status is "COPY <rows>"
+    return int(status.split()[-1])
+
+
+async def disable_triggers(conn: AsyncConnection) -> bool:
+    """
+    Skip triggers, foreign key checks included, till the transaction end.
+
+    Only for rows known to be consistent. Needs superuser rights, returns
+    False when the role lacks them and the checks stay on.
+    """
+    try:
+        async with conn.begin_nested():
+            await conn.execute(
+                text("SET LOCAL session_replication_role = replica")
+            )
+    except DBAPIError:
+        return False
+    return True
@@ -1,16 +1,19 @@
 from contextlib import asynccontextmanager
 
-from app.core.settings import redis_conf
+from app.core.settings import get_redis_config
 from app.services.redis import RedisService
 
-redis_url = f"redis://{redis_conf.REDIS_HOST}:{redis_conf.REDIS_PORT}"
+
+def get_redis_url() -> str:
+    redis_conf = get_redis_config()
+    return f"redis://{redis_conf.REDIS_HOST}:{redis_conf.REDIS_PORT}"
 
 
 @asynccontextmanager
 async def lifespan_redis(app):
     rs = RedisService()
     try:
-        rs._init_redis(url=redis_url)
+        rs._init_redis(url=get_redis_url())
         redis = rs._get_redis()
         await redis.ping()
         yield
@@ -2,10 +2,38 @@ import datetime
 import enum
 import uuid
 
-from sqlalchemy import Boolean, Column, Enum, ForeignKey, Integer, String
-from sqlalchemy.dialects.postgresql import TIMESTAMP, UUID
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Date,
+    Enum,
+    ForeignKey,
+    ForeignKeyConstraint,
+    Index,
+    Integer,
+    String,
+    func,
+    true,
+)
+from sqlalchemy.dialects.postgresql import JSONB, TIMESTAMP, UUID
 from sqlalchemy.orm import DeclarativeBase, relationship
 
+from app.core.constants import (
+    NOTIFICATIONS_RETENTION_MONTHS,
+    PARTITIONS_AHEAD_MONTHS,
+)
+from app.db.partitions import MonthlyPartitions
+
+
+def _updated_at_column() -> Column:
+    # version marker of the row for conditional requests
+    return Column(
+        TIMESTAMP(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
 
 class Base(DeclarativeBase):
     __repr_cols_num: int = 1
@@ -54,6 +82,7 @@ class User(Base):
     email = Column(String, nullable=False, unique=True)
     is_active = Column(Boolean(), default=True, nullable=False)
     hashed_password = Column(String)
+    updated_at = _updated_at_column()
 
     companies = relationship(
         "Company", back_populates="owner", cascade="all, delete-orphan"
@@ -87,6 +116,7 @@ class Company(Base):
         nullable=False,
     )
     is_active = Column(Boolean(), default=True, nullable=False)
+    updated_at = _updated_at_column()
 
     owner = relationship("User", back_populates="companies")
     members = relationship("CompanyMember", back_populates="company")
@@ -126,10 +156,18 @@ class CompanyMember(Base):
         Enum(CompanyRole), default=CompanyRole.member, nullable=False
     )
     is_active = Column(Boolean(), default=True, nullable=False)
+    # latest attempt of the user on the company quizzes
+    last_attempt_at = Column(TIMESTAMP(timezone=True))
 
     company = relationship("Company", back_populates="members")
     user = relationship("User", back_populates="employments")
 
+    __table_args__ = (
+        Index(
+            "ix_company_members_company_id_user_id", "company_id", "user_id"
+        ),
+    )
+
     __repr_cols_num = 3
     __repr_cols = ("is_active",)
 
@@ -215,6 +253,9 @@ class Quiz(Base):
     description = Column(String)
     pass_rate = Column(Integer, default=0, nullable=False)
     is_active = Column(Boolean(), default=True, nullable=False)
+    last_attempt_at = Column(TIMESTAMP(timezone=True))
+    # bumped by changes of the questions and answers as well
+    updated_at = _updated_at_column()
 
     questions = relationship(
         "Question", back_populates="quiz", cascade="all, delete-orphan"
@@ -223,6 +264,8 @@ class Quiz(Base):
     company = relationship("Company", back_populates="quizzes")
     users = relationship("UserQuiz", back_populates="quiz")
 
+    __table_args__ = (Index("ix_quizzes_company_id", "company_id"),)
+
     __repr_cols_num = 3
 
 
@@ -284,8 +327,10 @@ class UserQuiz(Base):
     quiz_id = Column(
         UUID(as_uuid=True), ForeignKey("quizzes.quiz_id"), nullable=False
     )
+    # partition key, a part of the primary key
     attempt_time = Column(
         TIMESTAMP(timezone=True),
+        primary_key=True,
         default=lambda: datetime.datetime.now(datetime.timezone.utc),
     )
     correct_answers_count = Column(Integer, default=0, nullable=False)
@@ -295,6 +340,8 @@ class UserQuiz(Base):
     quiz = relationship("Quiz", back_populates="users")
     answers = relationship("UserQuizAnswers", back_populates="user_quiz")
 
+    __table_args__ = ({"postgresql_partition_by": "RANGE (attempt_time)"},)
+
     __repr_cols_num = 3
 
 
@@ -304,11 +351,9 @@ class UserQuizAnswers(Base):
     user_answer_id = Column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
     )
-    user_quiz_id = Column(
-        UUID(as_uuid=True),
-        ForeignKey("user_quizzes.user_quiz_id"),
-        nullable=False,
-    )
+    user_quiz_id = Column(UUID(as_uuid=True), nullable=False)
+    # attempt_time of the user quiz, partitions follow the attempts ones
+    attempt_time = Column(TIMESTAMP(timezone=True), primary_key=True)
     question_id = Column(
         UUID(as_uuid=True), ForeignKey("questions.question_id"), nullable=False
     )
@@ -320,9 +365,86 @@ class UserQuizAnswers(Base):
     question = relationship("Question", back_populates="user_answers")
     answer = relationship("Answer", back_populates="user_answers")
 
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["user_quiz_id", "attempt_time"],
+            ["user_quizzes.user_quiz_id", "user_quizzes.attempt_time"],
+        ),
+        Index(
+            "ix_user_quiz_answers_user_quiz_id",
+            "user_quiz_id",
+            "attempt_time",
+        ),
+        {"postgresql_partition_by": "RANGE (attempt_time)"},
+    )
+
+    __repr_cols_num = 4
+
+
+# score totals, running sums of the attempts on active quizzes
+
+
+class UserScoreTotal(Base):
+    __tablename__ = "user_score_totals"
+
+    user_id = Column(
+        UUID(as_uuid=True), ForeignKey("users.user_id"), primary_key=True
+    )
+    attempts = Column(Integer, default=0, nullable=False)
+    correct_answers_count = Column(Integer, default=0, nullable=False)
+    total_questions = Column(Integer, default=0, nullable=False)
+
     __repr_cols_num = 4
 
 
+class CompanyUserScoreTotal(Base):
+    __tablename__ = "company_user_score_totals"
+
+    company_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("companies.company_id"),
+        primary_key=True,
+    )
+    user_id = Column(
+        UUID(as_uuid=True), ForeignKey("users.user_id"), primary_key=True
+    )
+    attempts = Column(Integer, default=0, nullable=False)
+    correct_answers_count = Column(Integer, default=0, nullable=False)
+    total_questions = Column(Integer, default=0, nullable=False)
+
+    __repr_cols_num = 5
+
+
+# score histograms
+
+
+class QuizScoreHistogram(Base):
+    __tablename__ = "quiz_score_histograms"
+
+    quiz_id = Column(
+        UUID(as_uuid=True), ForeignKey("quizzes.quiz_id"), primary_key=True
+    )
+    day = Column(Date, primary_key=True)
+    # attempts count by score percent, only the scores met
+    counts = Column(JSONB, nullable=False, default=dict)
+
+    __repr_cols_num = 3
+
+
+class CompanyScoreHistogram(Base):
+    __tablename__ = "company_score_histograms"
+
+    company_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("companies.company_id"),
+        primary_key=True,
+    )
+    day = Column(Date, primary_key=True)
+    counts = Column(JSONB, nullable=False, default=dict)
+
+    __repr_cols_num = 3
+
+
 # notifications
 
 
@@ -338,8 +460,10 @@ class Notification(Base):
         ForeignKey("users.user_id", ondelete="CASCADE"),
         nullable=False,
     )
+    # partition key, a part of the primary key of a partitioned table
     time = Column(
         TIMESTAMP(timezone=True),
+        primary_key=True,
         default=lambda: datetime.datetime.now(datetime.timezone.utc),
     )
     status = Column(
@@ -348,4 +472,40 @@ class Notification(Base):
 
     user = relationship("User", back_populates="notifications")
 
+    __table_args__ = (
+        # user feed, newest first, keyset pagination
+        Index(
+            "ix_notifications_user_id_time",
+            "user_id",
+            "time",
+            "notification_id",
+        ),
+        # unread count
+        Index(
+            "ix_notifications_user_id_unread",
+            "user_id",
+            postgresql_where=status == true(),
+        ),
+        {"postgresql_partition_by": "RANGE (time)"},
+    )
+
     __repr_cols_num = 5
+
+
+notification_partitions = MonthlyPartitions(
+    Notification.__table__,
+    "time",
+    ahead_months=PARTITIONS_AHEAD_MONTHS,
+    retention_months=NOTIFICATIONS_RETENTION_MONTHS,
+)
+
+
+# attempts are kept, old partitions are detached for archiving
+user_quiz_partitions = MonthlyPartitions(
+    UserQuiz.__table__, "attempt_time", ahead_months=PARTITIONS_AHEAD_MONTHS
+)
+user_quiz_answer_partitions = MonthlyPartitions(
+    UserQuizAnswers.__table__,
+    "attempt_time",
+    ahead_months=PARTITIONS_AHEAD_MONTHS,
+)
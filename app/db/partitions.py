@@ -0,0 +1,274 @@
+"""
+Monthly range partitions of time series tables.
+"""
+
+import datetime
+import logging
+
+from sqlalchemy import Connection, Table, event, func, select, text
+
+logger = logging.getLogger(__name__)
+
+
+def month_start(moment: datetime.datetime) -> datetime.datetime:
+    moment = moment.astimezone(datetime.timezone.utc)
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime.datetime, months: int) -> datetime.datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def _now() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+class MonthlyPartitions:
+    """
+    Monthly range partitions of a table on a timestamp column.
+
+    Partitions are created ahead_months ahead of the current month. With
+    retention_months set, months older than that are dropped as whole
+    partitions instead of deleting rows, without it old months can be
+    detached to archive them. The table must be declared with
+    postgresql_partition_by="RANGE (<column>)", the partitions of the
+    retained months are created together with it.
+    """
+
+    def __init__(
+        self,
+        table: Table,
+        column: str,
+        ahead_months: int,
+        retention_months: int | None = None,
+    ):
+        self.table = table
+        self.column = table.c[column]
+        self.ahead_months = ahead_months
+        self.retention_months = retention_months
+        event.listen(table, "after_create", self._after_create)
+
+    def _after_create(self, target, connection: Connection, **kwargs):
+        self.create(connection)
+
+    def _quote(self, conn: Connection, name: str) -> str:
+        return conn.dialect.identifier_preparer.quote(name)
+
+    def name(self, month: datetime.datetime) -> str:
+        return f"{self.table.name}_p{month:%Y_%m}"
+
+    def cutoff(self, now: datetime.datetime | None = None):
+        """
+        Start of the oldest retained month, None when nothing expires.
+        """
+        if self.retention_months is None:
+            return None
+        return add_months(month_start(now or _now()), -self.retention_months)
+
+    def partitions(self, conn: Connection) -> dict[datetime.datetime, str]:
+        """
+        Existing partitions by their month.
+        """
+        query = text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(:table)"
+        )
+        prefix = f"{self.table.name}_p"
+        partitions = {}
+        for name in conn.execute(query, {"table": self.table.name}).scalars():
+            if not name.startswith(prefix):
+                continue
+            month = datetime.datetime.strptime(name[len(prefix) :], "%Y_%m")
+            partitions[month.replace(tzinfo=datetime.timezone.utc)] = name
+        return partitions
+
+    def create(
+        self,
+        conn: Connection,
+        now: datetime.datetime | None = None,
+        since: datetime.datetime | None = None,
+        until: datetime.datetime | None = None,
+    ) -> list[str]:
+        """
+        Create missing partitions of the retained and the coming months.
+
+        since and until extend the range to hold older or later rows.
+        """
+        now = now or _now()
+        month = month_start(now)
+        if cutoff := self.cutoff(now):
+            month = cutoff
+        if since is not None:
+            month = min(month, month_start(since))
+        end = add_months(month_start(now), self.ahead_months)
+        if until is not None:
+            end = max(end, month_start(until))
+
+        existing = self.partitions(conn)
+        table = self._quote(conn, self.table.name)
+        created = []
+        while month <= end:
+            if month not in existing:
+                name = self.name(month)
+                conn.execute(
+                    text(
+                        f"CREATE TABLE IF NOT EXISTS "
+                        f"{self._quote(conn, name)} PARTITION OF {table} "
+                        f"FOR VALUES FROM ('{month.isoformat()}') "
+                        f"TO ('{add_months(month, 1).isoformat()}')"
+                    )
+                )
+                created.append(name)
+            month = add_months(month, 1)
+        return created
+
+    def drop_expired(
+        self, conn: Connection, now: datetime.datetime | None = None
+    ) -> list[str]:
+        cutoff = self.cutoff(now)
+        if cutoff is None:
+            return []
+        dropped = []
+        for month, name in sorted(self.partitions(conn).items()):
+            if month < cutoff:
+                conn.execute(text(f"DROP TABLE {self._quote(conn, name)}"))
+                dropped.append(name)
+        return dropped
+
+    def detach(self, conn: Connection, before: datetime.datetime) -> list[str]:
+        """
+        Detach partitions of the months before the given one, they stay
+        as plain tables to archive and drop.
+
+        Tables referencing this one must detach the same months first.
+        Foreign keys of the detached tables are dropped, archived rows
+        are not checked against the live tables.
+        """
+        before = month_start(before)
+        table = self._quote(conn, self.table.name)
+        detached = []
+        for month, name in sorted(self.partitions(conn).items()):
+            if month >= before:
+                continue
+            partition = self._quote(conn, name)
+            conn.execute(
+                text(f"ALTER TABLE {table} DETACH PARTITION {partition}")
+            )
+            foreign_keys = conn.execute(
+                text(
+                    "SELECT conname FROM pg_constraint "
+                    "WHERE conrelid = to_regclass(:t) AND contype = 'f'"
+                ),
+                {"t": name},
+            ).scalars()
+            for constraint in list(foreign_keys):
+                conn.execute(
+                    text(
+                        f"ALTER TABLE {partition} "
+                        f"DROP CONSTRAINT {self._quote(conn, constraint)}"
+                    )
+                )
+            detached.append(name)
+        return detached
+
+    def maintain(
+        self, conn: Connection, now: datetime.datetime | None = None
+    ) -> tuple[list[str], list[str]]:
+        """
+        Create the coming partitions and drop the expired ones.
+
+        Runs in the connection transaction, concurrent callers skip the
+        work while one of them holds the table lock. A missing table is
+        skipped.
+        """
+        acquired = conn.execute(
+            select(
+                func.pg_try_advisory_xact_lock(func.hashtext(self.table.name))
+            )
+        ).scalar()
+        # the table is created by migrations, maybe not yet
+        exists = conn.execute(
+            select(func.to_regclass(self.table.name).is_not(None))
+        ).scalar()
+        if not acquired or not exists:
+            return [], []
+        return self.create(conn, now), self.drop_expired(conn, now)
+
+    def partition_existing(
+        self, conn: Connection, now: datetime.datetime | None = None
+    ) -> int | None:
+        """
+        Replace a plain table with the partitioned one, moving retained
+        rows. Return moved rows count, None when already partitioned.
+        """
+        name = self.table.name
+        relkind = conn.execute(
+            text(
+                "SELECT relkind::text FROM pg_class "
+                "WHERE oid = to_regclass(:t)"
+            ),
+            {"t": name},
+        ).scalar()
+        if relkind == "p":
+            return None
+        if relkind is None:
+            self.table.create(conn)
+            return 0
+
+        legacy = f"{name}_legacy"
+        conn.execute(
+            text(
+                f"ALTER TABLE {self._quote(conn, name)} "
+                f"RENAME TO {self._quote(conn, legacy)}"
+            )
+        )
+        # index names share the namespace with the new table indexes
+        indexes = conn.execute(
+            text("SELECT indexname FROM pg_indexes WHERE tablename = :t"),
+            {"t": legacy},
+        ).scalars()
+        for index in list(indexes):
+            conn.execute(
+                text(
+                    f"ALTER INDEX {self._quote(conn, index)} RENAME TO "
+                    f"{self._quote(conn, f'{index[:55]}_legacy')}"
+                )
+            )
+
+        column = self._quote(conn, self.column.name)
+        # the plain column is nullable, the partition key is not
+        backfilled = conn.execute(
+            text(
+                f"UPDATE {self._quote(conn, legacy)} SET {column} = now() "
+                f"WHERE {column} IS NULL"
+            )
+        ).rowcount
+        if backfilled:
+            logger.warning(
+                f"{backfilled} {name} rows without {self.column.name} "
+                f"are moved with the current time"
+            )
+        condition = "TRUE"
+        if cutoff := self.cutoff(now):
+            condition = f"{column} >= '{cutoff.isoformat()}'"
+        since, until = conn.execute(
+            text(
+                f"SELECT min({column}), max({column}) "
+                f"FROM {self._quote(conn, legacy)} WHERE {condition}"
+            )
+        ).one()
+        self.table.create(conn)
+        self.create(conn, now, since=since, until=until)
+
+        columns = ", ".join(self._quote(conn, c.name) for c in self.table.c)
+        moved = conn.execute(
+            text(
+                f"INSERT INTO {self._quote(conn, name)} ({columns}) "
+                f"SELECT {columns} FROM {self._quote(conn, legacy)} "
+                f"WHERE {condition}"
+            )
+        ).rowcount
+        conn.execute(text(f"DROP TABLE {self._quote(conn, legacy)}"))
+        return moved
@@ -1,15 +1,23 @@
+import asyncio
 import logging
-from typing import AsyncGenerator
+import time
+from contextlib import asynccontextmanager
+from functools import cache
+from typing import AsyncGenerator, Awaitable, Callable
 
 from pydantic_settings import BaseSettings
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
-from app.core.settings import app_settings, postgres_config
+from app.core.settings import get_app_settings, get_postgres_config
+from app.utils.metrics import DB_POOL_CHECKOUT_WAIT
+from app.utils.stats import get_request_stats
 
 
 class PostgresDB[T: BaseSettings]:
@@ -29,16 +37,117 @@ class PostgresDB[T: BaseSettings]:
         return self._DATABASE_URL
 
 
-_engine = create_async_engine(
-    PostgresDB(postgres_config).url,
-    poolclass=NullPool,
-    echo=True if app_settings.DEBUG is True else False,
-)
-_async_session_maker = async_sessionmaker(_engine, expire_on_commit=False)
+class TimedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that records how long checkouts wait for a connection.
+    """
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+
+
+def instrument_engine(engine: AsyncEngine) -> AsyncEngine:
+    """
+    Record executed statements into the current request stats.
+    """
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, params, context, many):
+        context._query_start_time = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, params, context, many):
+        if stats := get_request_stats():
+            duration = time.perf_counter() - context._query_start_time
+            stats.add_query(statement, duration)
+
+    return engine
 
-logging.info(f"Database URL: {PostgresDB(postgres_config).url}")
+
+@cache
+def get_engine() -> AsyncEngine:
+    """
+    Engine is created on first use, not on import.
+    """
+    config = get_postgres_config()
+    url = PostgresDB(config).url
+    logging.info(f"Database URL: {url}")
+    engine = create_async_engine(
+        url,
+        poolclass=TimedAsyncAdaptedQueuePool,
+        pool_size=config.POSTGRES_POOL_SIZE,
+        max_overflow=config.POSTGRES_MAX_OVERFLOW,
+        pool_timeout=config.POSTGRES_POOL_TIMEOUT,
+        pool_recycle=config.POSTGRES_POOL_RECYCLE,
+        pool_pre_ping=config.POSTGRES_POOL_PRE_PING,
+        echo=True if get_app_settings().DEBUG is True else False,
+    )
+    instrument_engine(engine)
+    return engine
+
+
+@cache
+def get_session_maker() -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(get_engine(), expire_on_commit=False)
 
 
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
-    async with _async_session_maker() as session:
+    async with get_session_maker()() as session:
         yield session
+
+
+# session.info key of the callbacks waiting for commit
+_AFTER_COMMIT = "after_commit"
+
+
+def on_commit(
+    session: AsyncSession, callback: Callable[[], Awaitable[None]]
+) -> None:
+    """
+    Run callback once the session transaction is committed.
+
+    Callbacks are dropped on rollback, so side effects never announce rows
+    which were not stored.
+    """
+    session.info.setdefault(_AFTER_COMMIT, []).append(callback)
+
+
+async def run_after_commit(session: AsyncSession) -> None:
+    for callback in session.info.pop(_AFTER_COMMIT, []):
+        # the data is committed already, a failed side effect is only logged
+        try:
+            await callback()
+        except Exception:
+            logging.exception("After commit callback failed")
+
+
+def discard_after_commit(session: AsyncSession) -> None:
+    session.info.pop(_AFTER_COMMIT, None)
+
+
+async def warm_up_engine(engine: AsyncEngine, connections: int) -> None:
+    """
+    Open pool connections ahead of the first requests.
+    """
+
+    async def connect():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(connect() for _ in range(connections)))
+
+
+@asynccontextmanager
+async def lifespan_postgres(app):
+    engine = get_engine()
+    try:
+        await warm_up_engine(
+            engine, connections=get_postgres_config().POSTGRES_POOL_SIZE
+        )
+        yield
+    finally:
+        await engine.dispose()
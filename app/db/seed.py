@@ -0,0 +1,459 @@
+"""
+Synthetic data generator for scale testing.
+
+Generates users, companies with members, quizzes with questions and
+answers, quiz attempts spread over time with their answers and
+notifications, and bulk loads them with COPY.
+
+Usage:
+    python -m app.db.seed [--preset small|medium|large] [--recreate]
+        [--database-url URL] [--<field> N ...]
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import datetime
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Iterator
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from app.db.bulk import copy_records, disable_triggers
+from app.db.models import (
+    Answer,
+    Base,
+    Company,
+    CompanyMember,
+    CompanyRole,
+    Notification,
+    Question,
+    Quiz,
+    User,
+    UserQuiz,
+    UserQuizAnswers,
+)
+from app.jobs.partitions import PARTITIONED_TABLES
+from app.repositories.score_histogram import ScoreHistogramRepository
+from app.repositories.score_total import ScoreTotalRepository
+from app.repositories.user_quiz import UserQuizRepository
+
+# attempts generated and loaded at once
+ATTEMPTS_BATCH_SIZE = 20_000
+
+
+@dataclass(frozen=True)
+class SeedConfig:
+    users: int
+    companies: int
+    members: int
+    quizzes: int
+    questions: int
+    answers: int
+    attempts: int
+    notifications: int
+    history_days: int = 60
+    seed: int = 0
+
+    def __post_init__(self):
+        if self.members >= self.users:
+            raise ValueError("Company members must be fewer than users.")
+        if self.companies > self.users:
+            raise ValueError("Every company needs its own owner user.")
+        if self.answers < 2:
+            raise ValueError("Question must have at least two answers.")
+
+
+PRESETS = {
+    "small": SeedConfig(
+        users=500,
+        companies=2,
+        members=200,
+        quizzes=10,
+        questions=10,
+        answers=4,
+        attempts=10_000,
+        notifications=10,
+    ),
+    "medium": SeedConfig(
+        users=10_000,
+        companies=5,
+        members=2_000,
+        quizzes=50,
+        questions=20,
+        answers=4,
+        attempts=200_000,
+        notifications=20,
+    ),
+    "large": SeedConfig(
+        users=50_000,
+        companies=10,
+        members=5_000,
+        quizzes=200,
+        questions=20,
+        answers=4,
+        attempts=2_000_000,
+        notifications=50,
+    ),
+}
+
+
+@dataclass
+class _Question:
+    question_id: str
+    correct_answer_id: str
+    wrong_answer_ids: list[str]
+
+
+@dataclass
+class _Company:
+    company_id: str
+    member_ids: list[str]
+    quizzes: dict[str, list[_Question]]
+
+
+class DataGenerator:
+    """
+    Deterministic rows generator, the same config gives the same rows.
+
+    Rows are tuples in the column order of the table they are loaded to.
+    """
+
+    def __init__(
+        self, config: SeedConfig, now: datetime.datetime | None = None
+    ):
+        self.config = config
+        self.now = now or datetime.datetime.now(datetime.timezone.utc)
+        self._rng = random.Random(config.seed)
+        self.user_ids: list[str] = []
+        # chance to answer a question right, per user
+        self.skills: dict[str, float] = {}
+        self.companies: list[_Company] = []
+
+    def _uuid(self) -> str:
+        # asyncpg takes hex strings for uuid columns, building str
+        # objects would take most of the generation time
+        return self._rng.randbytes(16).hex()
+
+    def _past(self) -> datetime.datetime:
+        seconds = self._rng.random() * self.config.history_days * 86400
+        return self.now - datetime.timedelta(seconds=seconds)
+
+    def users(self) -> Iterator[tuple]:
+        for n in range(self.config.users):
+            user_id = self._uuid()
+            self.user_ids.append(user_id)
+            self.skills[user_id] = self._rng.uniform(0.3, 0.95)
+            yield (
+                user_id,
+                f"User{n}",
+                str(n),
+                self._past(),
+                f"user_{n}@example.com",
+                True,
+                "-",
+            )
+
+    def companies_rows(self) -> Iterator[tuple]:
+        for i in range(self.config.companies):
+            company_id = self._uuid()
+            candidates = self.user_ids[:i] + self.user_ids[i + 1 :]
+            self.companies.append(
+                _Company(
+                    company_id=company_id,
+                    member_ids=self._rng.sample(
+                        candidates, self.config.members
+                    ),
+                    quizzes={},
+                )
+            )
+            yield (
+                company_id,
+                f"company_{i}",
+                f"Generated company {i}",
+                True,
+                self.user_ids[i],
+                True,
+            )
+
+    def members(self) -> Iterator[tuple]:
+        for company in self.companies:
+            for user_id in company.member_ids:
+                yield (
+                    self._uuid(),
+                    company.company_id,
+                    user_id,
+                    CompanyRole.member.name,
+                    True,
+                )
+
+    def quizzes(self) -> Iterator[tuple]:
+        for company in self.companies:
+            for j in range(self.config.quizzes):
+                quiz_id = self._uuid()
+                company.quizzes[quiz_id] = []
+                yield (
+                    quiz_id,
+                    company.company_id,
+                    f"quiz {j}",
+                    "Generated quiz",
+                    0,
+                    True,
+                )
+
+    def questions(self) -> Iterator[tuple]:
+        for company in self.companies:
+            for quiz_id, questions in company.quizzes.items():
+                for k in range(self.config.questions):
+                    question = _Question(
+                        question_id=self._uuid(),
+                        correct_answer_id=self._uuid(),
+                        wrong_answer_ids=[
+                            self._uuid()
+                            for _ in range(self.config.answers - 1)
+                        ],
+                    )
+                    questions.append(question)
+                    yield question.question_id, quiz_id, f"question {k}"
+
+    def answers(self) -> Iterator[tuple]:
+        for company in self.companies:
+            for questions in company.quizzes.values():
+                for question in questions:
+                    yield (
+                        question.correct_answer_id,
+                        question.question_id,
+                        "answer 0",
+                        True,
+                    )
+                    for m, answer_id in enumerate(question.wrong_answer_ids):
+                        yield (
+                            answer_id,
+                            question.question_id,
+                            f"answer {m + 1}",
+                            False,
+                        )
+
+    def attempts(self) -> Iterator[tuple[list[tuple], list[tuple]]]:
+        """
+        Batches of attempts rows and their answers rows.
+        """
+        per_company = self.config.attempts // max(self.config.companies, 1)
+        for company in self.companies:
+            quiz_ids = list(company.quizzes)
+            for start in range(0, per_company, ATTEMPTS_BATCH_SIZE):
+                size = min(ATTEMPTS_BATCH_SIZE, per_company - start)
+                yield self._attempts_batch(company, quiz_ids, size)
+
+    def _attempts_batch(
+        self, company: _Company, quiz_ids: list[str], size: int
+    ) -> tuple[list[tuple], list[tuple]]:
+        rng = self._rng
+        attempts, answers = [], []
+        for _ in range(size):
+            user_quiz_id = self._uuid()
+            attempt_time = self._past()
+            user_id = rng.choice(company.member_ids)
+            quiz_id = rng.choice(quiz_ids)
+            skill = self.skills[user_id]
+            questions = company.quizzes[quiz_id]
+            correct = 0
+            for question in questions:
+                if rng.random() < skill:
+                    answer_id = question.correct_answer_id
+                    correct += 1
+                else:
+                    wrong = question.wrong_answer_ids
+                    answer_id = wrong[int(rng.random() * len(wrong))]
+                answers.append(
+                    (
+                        self._uuid(),
+                        user_quiz_id,
+                        attempt_time,
+                        question.question_id,
+                        answer_id,
+                    )
+                )
+            attempts.append(
+                (
+                    user_quiz_id,
+                    user_id,
+                    quiz_id,
+                    attempt_time,
+                    correct,
+                    len(questions),
+                )
+            )
+        return attempts, answers
+
+    def notifications(self) -> Iterator[tuple]:
+        for user_id in self.user_ids:
+            for n in range(self.config.notifications):
+                yield (
+                    self._uuid(),
+                    f"Generated notification {n}",
+                    user_id,
+                    self._past(),
+                    self._rng.random() < 0.3,
+                )
+
+
+# column order of the generated rows
+COLUMNS = {
+    User: (
+        "user_id",
+        "first_name",
+        "last_name",
+        "registered_at",
+        "email",
+        "is_active",
+        "hashed_password",
+    ),
+    Company: (
+        "company_id",
+        "name",
+        "description",
+        "visibility",
+        "owner_id",
+        "is_active",
+    ),
+    CompanyMember: ("member_id", "company_id", "user_id", "role", "is_active"),
+    Quiz: (
+        "quiz_id",
+        "company_id",
+        "name",
+        "description",
+        "pass_rate",
+        "is_active",
+    ),
+    Question: ("question_id", "quiz_id", "text"),
+    Answer: ("answer_id", "question_id", "text", "is_correct"),
+    UserQuiz: (
+        "user_quiz_id",
+        "user_id",
+        "quiz_id",
+        "attempt_time",
+        "correct_answers_count",
+        "total_questions",
+    ),
+    UserQuizAnswers: (
+        "user_answer_id",
+        "user_quiz_id",
+        "attempt_time",
+        "question_id",
+        "answer_id",
+    ),
+    Notification: ("notification_id", "text", "user_id", "time", "status"),
+}
+
+
+async def _copy(
+    conn: AsyncConnection, model, rows, counts: dict[str, int]
+) -> None:
+    table = model.__table__
+    loaded = await copy_records(conn, table, rows, columns=COLUMNS[model])
+    counts[table.name] = counts.get(table.name, 0) + loaded
+
+
+async def _create_partitions(
+    conn: AsyncConnection, generator: DataGenerator
+) -> None:
+    """
+    Create partitions of the generated history months.
+    """
+    days = generator.config.history_days
+    since = generator.now - datetime.timedelta(days=days)
+    for partitions in PARTITIONED_TABLES:
+        await conn.run_sync(partitions.create, generator.now, since)
+
+
+async def seed_database(
+    engine: AsyncEngine, config: SeedConfig, recreate: bool = False
+) -> dict[str, int]:
+    """
+    Load generated rows, return rows count per table.
+    """
+    if recreate:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+
+    generator = DataGenerator(config)
+    counts: dict[str, int] = {}
+    async with engine.begin() as conn:
+        # generated rows reference only generated rows, per row foreign
+        # key checks would take most of the load time
+        if not await disable_triggers(conn):
+            logging.warning("No rights to skip foreign key checks")
+        await _create_partitions(conn, generator)
+        await _copy(conn, User, generator.users(), counts)
+        await _copy(conn, Company, generator.companies_rows(), counts)
+        await _copy(conn, CompanyMember, generator.members(), counts)
+        await _copy(conn, Quiz, generator.quizzes(), counts)
+        await _copy(conn, Question, generator.questions(), counts)
+        await _copy(conn, Answer, generator.answers(), counts)
+        for attempts, answers in generator.attempts():
+            await _copy(conn, UserQuiz, attempts, counts)
+            await _copy(conn, UserQuizAnswers, answers, counts)
+        await _copy(conn, Notification, generator.notifications(), counts)
+        # attempts are loaded bypassing record_user_quiz
+        async with AsyncSession(bind=conn) as session:
+            await ScoreHistogramRepository(session).rebuild()
+            await ScoreTotalRepository(session).repair()
+            await UserQuizRepository(session).backfill_last_attempts()
+
+    # ANALYZE can not run inside a transaction block
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("ANALYZE"))
+    return counts
+
+
+def main():
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from app.core.settings import get_postgres_config
+    from app.db.postgres import PostgresDB
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--preset", choices=PRESETS, default="small")
+    parser.add_argument(
+        "--recreate",
+        action="store_true",
+        help="drop and create all tables before loading",
+    )
+    parser.add_argument("--database-url")
+    for field in dataclasses.fields(SeedConfig):
+        parser.add_argument(f"--{field.name.replace('_', '-')}", type=int)
+    args = parser.parse_args()
+
+    overrides = {
+        field.name: getattr(args, field.name)
+        for field in dataclasses.fields(SeedConfig)
+        if getattr(args, field.name) is not None
+    }
+    config = dataclasses.replace(PRESETS[args.preset], **overrides)
+    url = args.database_url or PostgresDB(get_postgres_config()).url
+    engine = create_async_engine(url)
+
+    async def run() -> dict[str, int]:
+        try:
+            return await seed_database(engine, config, args.recreate)
+        finally:
+            await engine.dispose()
+
+    logging.basicConfig(level=logging.INFO)
+    start = time.perf_counter()
+    counts = asyncio.run(run())
+    for table, rows in counts.items():
+        logging.info(f"{table}: {rows} rows")
+    elapsed = time.perf_counter() - start
+    logging.info(f"{sum(counts.values())} rows loaded in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
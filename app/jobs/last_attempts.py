@@ -0,0 +1,55 @@
+"""
+Backfill last attempt times of quizzes and company members.
+
+The times are moved forward with every recorded attempt, the command sets
+them from the user quizzes once the columns are added by the migration,
+and after attempts are loaded in bulk.
+
+Usage:
+    python -m app.jobs.last_attempts [--database-url URL]
+"""
+
+import argparse
+import asyncio
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.repositories.user_quiz import UserQuizRepository
+
+logger = logging.getLogger(__name__)
+
+
+async def backfill_last_attempts(engine: AsyncEngine) -> int:
+    async with AsyncSession(engine) as session:
+        changed = await UserQuizRepository(session).backfill_last_attempts()
+        await session.commit()
+    logger.info(f"Last attempt times set: {changed} rows")
+    return changed
+
+
+def main():
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from app.core.settings import get_postgres_config
+    from app.db.postgres import PostgresDB
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--database-url")
+    args = parser.parse_args()
+
+    url = args.database_url or PostgresDB(get_postgres_config()).url
+    engine = create_async_engine(url)
+
+    async def run():
+        try:
+            await backfill_last_attempts(engine)
+        finally:
+            await engine.dispose()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Refill company and quiz leaderboards in Redis from Postgres.
+
+Leaderboards are updated by every recorded attempt and a missing one is
+filled on its first read, the command refills all of them at once after
+the Redis data is lost.
+
+Usage:
+    python -m app.jobs.leaderboards [--database-url URL]
+"""
+
+import argparse
+import asyncio
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.repositories.user_quiz import UserQuizRepository
+from app.services.leaderboard import (
+    company_leaderboard_key,
+    fill_leaderboards,
+    quiz_leaderboard_key,
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def rebuild_leaderboards(engine: AsyncEngine) -> None:
+    async with AsyncSession(engine) as session:
+        repo = UserQuizRepository(session)
+        company_sums = await repo.get_score_sums_for_each_company_user()
+        quiz_sums = await repo.get_score_sums_for_each_quiz_user()
+    companies = await fill_leaderboards(company_leaderboard_key, company_sums)
+    quizzes = await fill_leaderboards(quiz_leaderboard_key, quiz_sums)
+    logger.info(
+        f"Leaderboards filled: {companies} companies, {quizzes} quizzes"
+    )
+
+
+def main():
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from app.core.settings import get_postgres_config
+    from app.db.db_redis import lifespan_redis
+    from app.db.postgres import PostgresDB
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--database-url")
+    args = parser.parse_args()
+
+    url = args.database_url or PostgresDB(get_postgres_config()).url
+    engine = create_async_engine(url)
+
+    async def run():
+        try:
+            async with lifespan_redis(None):
+                await rebuild_leaderboards(engine)
+        finally:
+            await engine.dispose()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+Partitions maintenance of the time partitioned tables.
+
+Creates partitions of the coming months and drops the expired ones. Runs
+periodically in the application, the command is for cron, for turning
+existing plain tables into partitioned ones and for detaching old months
+of the kept tables to archive them.
+
+Usage:
+    python -m app.jobs.partitions [--convert] [--detach-before YYYY-MM]
+        [--database-url URL]
+"""
+
+import argparse
+import asyncio
+import datetime
+import logging
+
+from sqlalchemy import Connection, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.constants import PARTITIONS_MAINTENANCE_INTERVAL
+from app.db.models import (
+    notification_partitions,
+    user_quiz_answer_partitions,
+    user_quiz_partitions,
+)
+
+# referenced tables go first, they are converted before the referencing
+PARTITIONED_TABLES = (
+    notification_partitions,
+    user_quiz_partitions,
+    user_quiz_answer_partitions,
+)
+# detached in the reverse order, referencing tables first
+ARCHIVED_TABLES = (user_quiz_answer_partitions, user_quiz_partitions)
+
+logger = logging.getLogger(__name__)
+
+
+async def maintain_partitions(engine: AsyncEngine) -> None:
+    for partitions in PARTITIONED_TABLES:
+        async with engine.begin() as conn:
+            created, dropped = await conn.run_sync(partitions.maintain)
+        for name in created:
+            logger.info(f"Partition {name} created")
+        for name in dropped:
+            logger.info(f"Partition {name} dropped")
+
+
+def _add_answers_attempt_time(conn: Connection) -> None:
+    """
+    Copy attempt_time of the attempts to a plain answers table, the
+    partitioned one references attempts by both columns. The foreign key
+    to the plain attempts table is dropped, it would keep the table.
+    """
+    relkind = conn.execute(
+        text(
+            "SELECT relkind::text FROM pg_class "
+            "WHERE oid = to_regclass('user_quiz_answers')"
+        )
+    ).scalar()
+    if relkind != "r":
+        return
+    # attempts without a time get it here, for their answers to match
+    backfilled = conn.execute(
+        text(
+            "UPDATE user_quizzes SET attempt_time = now() "
+            "WHERE attempt_time IS NULL"
+        )
+    ).rowcount
+    if backfilled:
+        logger.warning(
+            f"{backfilled} user_quizzes rows without attempt_time "
+            f"are moved with the current time"
+        )
+    conn.execute(
+        text(
+            "ALTER TABLE user_quiz_answers "
+            "ADD COLUMN IF NOT EXISTS attempt_time timestamptz"
+        )
+    )
+    conn.execute(
+        text(
+            "UPDATE user_quiz_answers a SET attempt_time = q.attempt_time "
+            "FROM user_quizzes q "
+            "WHERE q.user_quiz_id = a.user_quiz_id "
+            "AND a.attempt_time IS NULL"
+        )
+    )
+    foreign_keys = conn.execute(
+        text(
+            "SELECT conname FROM pg_constraint "
+            "WHERE conrelid = to_regclass('user_quiz_answers') "
+            "AND confrelid = to_regclass('user_quizzes') AND contype = 'f'"
+        )
+    ).scalars()
+    for constraint in list(foreign_keys):
+        conn.execute(
+            text(
+                f"ALTER TABLE user_quiz_answers "
+                f'DROP CONSTRAINT "{constraint}"'
+            )
+        )
+
+
+async def convert_tables(engine: AsyncEngine) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(_add_answers_attempt_time)
+    for partitions in PARTITIONED_TABLES:
+        async with engine.begin() as conn:
+            moved = await conn.run_sync(partitions.partition_existing)
+        name = partitions.table.name
+        if moved is None:
+            logger.info(f"{name} is partitioned already")
+        else:
+            logger.info(f"{name} partitioned, {moved} rows moved")
+
+
+async def detach_partitions(
+    engine: AsyncEngine, before: datetime.datetime
+) -> None:
+    async with engine.begin() as conn:
+        for partitions in ARCHIVED_TABLES:
+            detached = await conn.run_sync(partitions.detach, before)
+            for name in detached:
+                logger.info(f"Partition {name} detached")
+
+
+def _month(value: str) -> datetime.datetime:
+    month = datetime.datetime.strptime(value, "%Y-%m")
+    return month.replace(tzinfo=datetime.timezone.utc)
+
+
+class PartitionMaintenance:
+    """
+    Run partitions maintenance at start and then every interval.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        interval: float = PARTITIONS_MAINTENANCE_INTERVAL,
+    ):
+        self._engine = engine
+        self._interval = interval
+        self._task: asyncio.Task | None = None
+
+    async def _run(self):
+        while True:
+            try:
+                await maintain_partitions(self._engine)
+            except Exception:
+                logger.exception("Partitions maintenance failed")
+            await asyncio.sleep(self._interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+def main():
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from app.core.settings import get_postgres_config
+    from app.db.postgres import PostgresDB
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--convert",
+        action="store_true",
+        help="replace plain tables with partitioned ones, moving rows",
+    )
+    parser.add_argument(
+        "--detach-before",
+        type=_month,
+        metavar="YYYY-MM",
+        help="detach partitions of the kept tables older than the month",
+    )
+    parser.add_argument("--database-url")
+    args = parser.parse_args()
+
+    url = args.database_url or PostgresDB(get_postgres_config()).url
+    engine = create_async_engine(url)
+
+    async def run():
+        try:
+            if args.convert:
+                await convert_tables(engine)
+            await maintain_partitions(engine)
+            if args.detach_before is not None:
+                await detach_partitions(engine, args.detach_before)
+        finally:
+            await engine.dispose()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Recount score histograms from the user quizzes.
+
+Histograms are updated by every recorded attempt, the command rebuilds
+them for attempts loaded in bulk or recorded before the histograms.
+
+Usage:
+    python -m app.jobs.score_histograms [--since YYYY-MM-DD]
+        [--database-url URL]
+"""
+
+import argparse
+import asyncio
+import datetime
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.repositories.score_histogram import ScoreHistogramRepository
+
+logger = logging.getLogger(__name__)
+
+
+async def rebuild_score_histograms(
+    engine: AsyncEngine, since: datetime.date | None = None
+) -> None:
+    async with AsyncSession(engine) as session:
+        await ScoreHistogramRepository(session).rebuild(since=since)
+        await session.commit()
+    logger.info(f"Score histograms rebuilt since {since or 'the start'}")
+
+
+def main():
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from app.core.settings import get_postgres_config
+    from app.db.postgres import PostgresDB
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--since",
+        type=datetime.date.fromisoformat,
+        metavar="YYYY-MM-DD",
+        help="rebuild only the days since, all days by default",
+    )
+    parser.add_argument("--database-url")
+    args = parser.parse_args()
+
+    url = args.database_url or PostgresDB(get_postgres_config()).url
+    engine = create_async_engine(url)
+
+    async def run():
+        try:
+            await rebuild_score_histograms(engine, since=args.since)
+        finally:
+            await engine.dispose()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
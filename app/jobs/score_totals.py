@@ -0,0 +1,55 @@
+"""
+Repair the running score totals of users and company members.
+
+Totals are updated with every recorded attempt and deactivated quiz, the
+command recounts them from the user quizzes and fixes the rows which
+drifted, e.g. after attempts were loaded in bulk.
+
+Usage:
+    python -m app.jobs.score_totals [--database-url URL]
+"""
+
+import argparse
+import asyncio
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.repositories.score_total import ScoreTotalRepository
+
+logger = logging.getLogger(__name__)
+
+
+async def repair_score_totals(engine: AsyncEngine) -> int:
+    async with AsyncSession(engine) as session:
+        repaired = await ScoreTotalRepository(session).repair()
+        await session.commit()
+    logger.info(f"Score totals repaired: {repaired} rows")
+    return repaired
+
+
+def main():
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from app.core.settings import get_postgres_config
+    from app.db.postgres import PostgresDB
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--database-url")
+    args = parser.parse_args()
+
+    url = args.database_url or PostgresDB(get_postgres_config()).url
+    engine = create_async_engine(url)
+
+    async def run():
+        try:
+            await repair_score_totals(engine)
+        finally:
+            await engine.dispose()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,51 @@
-import uvicorn
+import os
 
 from app.core.application import get_app
 from app.core.settings import app_settings
 
 app = get_app()
 
-if __name__ == "__main__":
+
+def get_workers_count() -> int:
+    if app_settings.WORKERS > 0:
+        return app_settings.WORKERS
+    try:
+        # respects cpu affinity limits set for the container
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def run_production():
+    import uvicorn
+
+    uvicorn.run(
+        "app.main:app",
+        host=app_settings.HOST,
+        port=app_settings.PORT,
+        workers=get_workers_count(),
+        loop=app_settings.LOOP,
+        http=app_settings.HTTP,
+        backlog=app_settings.BACKLOG,
+        timeout_keep_alive=app_settings.TIMEOUT_KEEP_ALIVE,
+        timeout_graceful_shutdown=app_settings.TIMEOUT_GRACEFUL_SHUTDOWN,
+        limit_concurrency=app_settings.LIMIT_CONCURRENCY,
+    )
+
+
+def run_development():
+    import uvicorn
+
     uvicorn.run(
         "app.main:app",
         host=app_settings.HOST,
         port=app_settings.PORT,
         reload=app_settings.RELOAD,
     )
+
+
+if __name__ == "__main__":
+    if app_settings.PRODUCTION:
+        run_production()
+    else:
+        run_development()
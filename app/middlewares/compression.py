@@ -0,0 +1,288 @@
+import asyncio
+import os
+import zlib
+from importlib.util import find_spec
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.constants import (
+    COMPRESSION_BROTLI_QUALITY,
+    COMPRESSION_GZIP_LEVEL,
+    COMPRESSION_ZSTD_LEVEL,
+)
+
+# long-lived streams are flushed per event and gain next to nothing
+UNCOMPRESSED_MEDIA_TYPES = ("text/event-stream",)
+COMPRESSED_MEDIA_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/xml",
+)
+
+
+class _GzipCompressor:
+    def __init__(self):
+        # wbits 31 writes the gzip header and trailer
+        self._compressor = zlib.compressobj(
+            COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31
+        )
+
+    def compress(self, data: bytes) -> bytes:
+        # sync flush sends the chunk now instead of holding it back
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliCompressor:
+    def __init__(self):
+        import brotli
+
+        self._compressor = brotli.Compressor(
+            quality=COMPRESSION_BROTLI_QUALITY
+        )
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdCompressor:
+    def __init__(self):
+        import zstandard
+
+        self._flush_mode = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        self._compressor = zstandard.ZstdCompressor(
+            level=COMPRESSION_ZSTD_LEVEL
+        ).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            self._flush_mode
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+# in order of preference, with the module the encoding needs
+CODECS = {
+    "zstd": ("zstandard", _ZstdCompressor),
+    "br": ("brotli", _BrotliCompressor),
+    "gzip": (None, _GzipCompressor),
+}
+
+
+def available_encodings() -> list[str]:
+    return [
+        encoding
+        for encoding, (module, _) in CODECS.items()
+        if module is None or find_spec(module) is not None
+    ]
+
+
+def negotiate_encoding(
+    accept_encoding: str, encodings: list[str]
+) -> str | None:
+    """
+    Pick the encoding of the highest quality in Accept-Encoding, ties go
+    to the first one of encodings.
+    """
+    qualities = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        qualities[coding] = q
+    wildcard = qualities.get("*", 0.0)
+    best, best_q = None, 0.0
+    for encoding in encodings:
+        q = qualities.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    media_type = content_type.partition(";")[0].strip().lower()
+    if media_type in UNCOMPRESSED_MEDIA_TYPES:
+        return False
+    return (
+        media_type.startswith("text/")
+        or media_type.endswith("+json")
+        or media_type in COMPRESSED_MEDIA_TYPES
+    )
+
+
+class CompressionMiddleware:
+    """
+    Compress response bodies with the encoding negotiated by
+    Accept-Encoding, gzip always and zstd or br when their modules are
+    installed.
+
+    Streaming responses are compressed chunk by chunk and every chunk is
+    flushed, nothing but the first minimum_size bytes is buffered.
+    Chunks of thread_threshold bytes and more are compressed in a thread
+    so the event loop keeps serving other requests meanwhile.
+    max_concurrent is the CPU budget, at most that many responses are
+    compressed at once and the rest are sent uncompressed.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        thread_threshold: int = 32 * 1024,
+        max_concurrent: int | None = None,
+        encodings: list[str] | None = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.thread_threshold = thread_threshold
+        self.max_concurrent = max_concurrent or os.cpu_count() or 1
+        self.encodings = (
+            encodings if encodings is not None else available_encodings()
+        )
+        self.active = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            return await self.app(scope, receive, send)
+
+        encoding = negotiate_encoding(
+            Headers(scope=scope).get("accept-encoding", ""), self.encodings
+        )
+        responder = _CompressionResponder(self, encoding, send)
+        try:
+            await self.app(scope, receive, responder.send)
+        finally:
+            responder.release()
+
+
+class _CompressionResponder:
+    def __init__(
+        self,
+        middleware: CompressionMiddleware,
+        encoding: str | None,
+        send: Send,
+    ):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start: Message | None = None
+        self.buffer = bytearray()
+        self.compressor = None
+        self.passthrough = False
+        self.acquired = False
+
+    def release(self):
+        if self.acquired:
+            self.acquired = False
+            self.middleware.active -= 1
+
+    async def send(self, message: Message):
+        if self.passthrough:
+            return await self._send(message)
+
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            compressible = (
+                message["status"] not in (204, 304)
+                and "content-encoding" not in headers
+                and is_compressible(headers.get("content-type", ""))
+            )
+            if not compressible:
+                self.passthrough = True
+                return await self._send(message)
+            # caches keep a representation per encoding
+            MutableHeaders(raw=message["headers"]).add_vary_header(
+                "Accept-Encoding"
+            )
+            content_length = headers.get("content-length")
+            if (
+                self.encoding is None
+                or content_length is not None
+                and int(content_length) < self.middleware.minimum_size
+            ):
+                self.passthrough = True
+                return await self._send(message)
+            self.start = message
+            return
+
+        if message["type"] != "http.response.body":
+            return await self._send(message)
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.compressor is None:
+            self.buffer += body
+            if more_body and len(self.buffer) < self.middleware.minimum_size:
+                return
+            body, self.buffer = bytes(self.buffer), bytearray()
+            if not await self._start_compression(body, more_body):
+                await self._send(self.start)
+                return await self._send(
+                    {
+                        "type": "http.response.body",
+                        "body": body,
+                        "more_body": more_body,
+                    }
+                )
+
+        chunk = await self._compress(body) if body else b""
+        if not more_body:
+            chunk += self.compressor.finish()
+            self.release()
+        if chunk or not more_body:
+            await self._send(
+                {
+                    "type": "http.response.body",
+                    "body": chunk,
+                    "more_body": more_body,
+                }
+            )
+
+    async def _start_compression(self, body: bytes, more_body: bool) -> bool:
+        """
+        Send the response start for the compressed body, or leave the
+        response uncompressed when it is small or over the CPU budget.
+        """
+        middleware = self.middleware
+        if not more_body and len(body) < middleware.minimum_size:
+            self.passthrough = True
+            return False
+        if middleware.active >= middleware.max_concurrent:
+            self.passthrough = True
+            return False
+        middleware.active += 1
+        self.acquired = True
+
+        self.compressor = CODECS[self.encoding][1]()
+        headers = MutableHeaders(raw=self.start["headers"])
+        headers["Content-Encoding"] = self.encoding
+        del headers["Content-Length"]
+        # the compressed body is not byte for byte the tagged one
+        etag = headers.get("etag")
+        if etag is not None and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+        await self._send(self.start)
+        return True
+
+    async def _compress(self, data: bytes) -> bytes:
+        if len(data) >= self.middleware.thread_threshold:
+            return await asyncio.to_thread(self.compressor.compress, data)
+        return self.compressor.compress(data)
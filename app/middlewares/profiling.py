@@ -0,0 +1,233 @@
+import asyncio
+import cProfile
+import random
+import time
+from collections import Counter
+from logging import getLogger
+from pathlib import Path
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.constants import PROFILE_STACK_SAMPLE_INTERVAL
+from app.middlewares.sql_stats import get_route_path
+from app.schemas.profiling import ProfileSummaryScheme, TimeBreakdownScheme
+from app.services.profiling import ProfilingService
+from app.utils.stats import RequestStats, collect_request_stats
+
+logger = getLogger(__name__)
+
+# long-lived responses are not profiled
+STREAMING_MEDIA_TYPES = ("text/event-stream",)
+
+
+def _coroutine_stack(coro) -> list[str]:
+    """
+    Frames of the awaited coroutines chain, outermost first.
+    """
+    frames = []
+    while coro is not None:
+        frame = (
+            getattr(coro, "cr_frame", None)
+            or getattr(coro, "ag_frame", None)
+            or getattr(coro, "gi_frame", None)
+        )
+        if frame is None:
+            break
+        code = frame.f_code
+        frames.append(
+            f"{code.co_qualname} "
+            f"({Path(code.co_filename).name}:{frame.f_lineno})"
+        )
+        coro = (
+            getattr(coro, "cr_await", None)
+            or getattr(coro, "ag_await", None)
+            or getattr(coro, "gi_yieldfrom", None)
+        )
+    return frames
+
+
+class StackSampler:
+    """
+    Sample the await stack of a task once it runs longer than delay,
+    until it runs longer than max_duration.
+
+    Before the delay passes the only cost is one scheduled callback.
+    """
+
+    def __init__(
+        self,
+        task: asyncio.Task,
+        delay: float,
+        interval: float = PROFILE_STACK_SAMPLE_INTERVAL,
+        max_duration: float | None = None,
+    ):
+        self._task = task
+        self._delay = delay
+        self._interval = interval
+        self._max_duration = max_duration
+        self._loop = asyncio.get_running_loop()
+        self._handle: asyncio.TimerHandle | None = None
+        self._deadline: float | None = None
+        self.samples: Counter = Counter()
+
+    def start(self):
+        if self._max_duration is not None:
+            self._deadline = self._loop.time() + self._max_duration
+        self._handle = self._loop.call_later(self._delay, self._sample)
+
+    def _sample(self):
+        if self._task.done():
+            return
+        if self._deadline is not None and self._loop.time() >= self._deadline:
+            return
+        if stack := _coroutine_stack(self._task.get_coro()):
+            self.samples[";".join(stack)] += 1
+        self._handle = self._loop.call_later(self._interval, self._sample)
+
+    def stop(self):
+        if self._handle is not None:
+            self._handle.cancel()
+
+
+class ProfilingMiddleware:
+    """
+    Profile a sampled fraction of requests and every slow request.
+
+    Sampled requests run under cProfile. Note that cProfile sees all
+    code running on the event loop meanwhile, so only one request is
+    profiled at a time. Requests over the slow threshold get await
+    stack samples taken after the threshold. Both get a time breakdown
+    into DB, Redis, serialization and the remaining python time.
+
+    Profiling and sampling stop once the request runs longer than
+    max_duration, the summary is then marked as truncated. Event streams
+    are left out once their response starts.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        directory: str,
+        sample_rate: float = 0.0,
+        slow_threshold: float | None = None,
+        max_duration: float | None = None,
+    ):
+        self.app = app
+        self.service = ProfilingService(directory)
+        self.sample_rate = sample_rate
+        self.slow_threshold = slow_threshold
+        self.max_duration = max_duration
+        self._profile: cProfile.Profile | None = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        profile = self._start_profile()
+        sampler = None
+        timeout = None
+        if profile is not None and self.max_duration is not None:
+            timeout = asyncio.get_running_loop().call_later(
+                self.max_duration, self._stop_profile, profile
+            )
+        if profile is None and self.slow_threshold is not None:
+            sampler = StackSampler(
+                asyncio.current_task(),
+                delay=self.slow_threshold,
+                max_duration=self.max_duration,
+            )
+            sampler.start()
+
+        def stop():
+            if timeout is not None:
+                timeout.cancel()
+            self._stop_profile(profile)
+            if sampler is not None:
+                sampler.stop()
+
+        status = 500
+        streaming = False
+
+        async def send_with_status(message: Message):
+            nonlocal status, streaming
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                content_type = Headers(raw=message["headers"]).get(
+                    "content-type", ""
+                )
+                # streams stay open as long as the client is connected
+                if content_type.startswith(STREAMING_MEDIA_TYPES):
+                    streaming = True
+                    stop()
+            await send(message)
+
+        start = time.perf_counter()
+        with collect_request_stats() as stats:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                total = time.perf_counter() - start
+                stop()
+
+        if streaming:
+            return
+        slow = self.slow_threshold is not None and total >= self.slow_threshold
+        if profile is None and not slow:
+            return
+        summary = ProfileSummaryScheme(
+            method=scope["method"],
+            route=get_route_path(scope),
+            path=scope["path"],
+            status=status,
+            reason="sampled" if profile is not None else "slow",
+            queries=stats.queries,
+            time=self._time_breakdown(total, stats),
+            truncated=(
+                self.max_duration is not None and total > self.max_duration
+            ),
+        )
+        try:
+            await asyncio.to_thread(
+                self.service.save_profile,
+                summary,
+                profile,
+                sampler.samples if sampler is not None else None,
+            )
+        except OSError as e:
+            logger.error(f"Profile of {summary.path} is not saved: {e}")
+
+    def _start_profile(self) -> cProfile.Profile | None:
+        if (
+            self._profile is not None
+            or self.sample_rate <= 0
+            or random.random() >= self.sample_rate
+        ):
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # another profiler is active in this thread
+            return None
+        self._profile = profile
+        return profile
+
+    def _stop_profile(self, profile: cProfile.Profile | None):
+        if profile is not None and self._profile is profile:
+            profile.disable()
+            self._profile = None
+
+    @staticmethod
+    def _time_breakdown(
+        total: float, stats: RequestStats
+    ) -> TimeBreakdownScheme:
+        python = total - stats.db_time - stats.redis_time
+        python -= stats.serialization_time
+        return TimeBreakdownScheme(
+            total_ms=round(total * 1000, 3),
+            db_ms=round(stats.db_time * 1000, 3),
+            redis_ms=round(stats.redis_time * 1000, 3),
+            serialization_ms=round(stats.serialization_time * 1000, 3),
+            python_ms=round(max(python, 0.0) * 1000, 3),
+        )
@@ -0,0 +1,66 @@
+from logging import getLogger
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.constants import N_PLUS_ONE_THRESHOLD
+from app.utils.metrics import DB_N_PLUS_ONE, DB_QUERIES, DB_QUERY_TIME
+from app.utils.stats import RequestStats, collect_request_stats
+
+logger = getLogger(__name__)
+
+
+def get_route_path(scope: Scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class SQLStatsMiddleware:
+    """
+    Collect statements count and DB time of every request.
+
+    The stats are exported as per route metrics and in debug mode also
+    sent in X-DB-* response headers. Repeated statements are logged as
+    N+1 candidates.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        debug: bool = False,
+        n_plus_one_threshold: int = N_PLUS_ONE_THRESHOLD,
+    ):
+        self.app = app
+        self.debug = debug
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        with collect_request_stats() as stats:
+
+            async def send_with_stats(message: Message):
+                if message["type"] == "http.response.start":
+                    self._record(scope, stats)
+                    if self.debug:
+                        headers = MutableHeaders(scope=message)
+                        headers["X-DB-Query-Count"] = str(stats.queries)
+                        headers["X-DB-Time-Ms"] = f"{stats.db_time * 1000:.3f}"
+                        headers["X-DB-Max-Repeats"] = str(stats.max_repeats)
+                await send(message)
+
+            await self.app(scope, receive, send_with_stats)
+
+    def _record(self, scope: Scope, stats: RequestStats):
+        path = get_route_path(scope)
+        repeated = stats.repeated(self.n_plus_one_threshold)
+        DB_QUERIES.inc(path, amount=stats.queries)
+        DB_QUERY_TIME.inc(path, amount=stats.db_time)
+        if repeated:
+            DB_N_PLUS_ONE.inc(path)
+        for statement, count in repeated.items():
+            logger.warning(
+                f"Possible N+1 in {scope['method']} {path}: "
+                f"statement executed {count} times: {statement[:200]}"
+            )
@@ -1,6 +1,7 @@
+from typing import Sequence
 from uuid import UUID
 
-from sqlalchemy import and_, insert, select, update
+from sqlalchemy import RowMapping, and_, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models import Company
@@ -39,6 +40,17 @@ class CompanyRepository:
             return company
         raise CompanyNotFoundException(**kwargs)
 
+    async def get_company_updated_at(self, company_id: UUID):
+        query = select(Company.updated_at).where(
+            and_(
+                Company.company_id == company_id,
+                Company.is_active == True,
+                Company.visibility == True,
+            )
+        )
+        result = await self.session.execute(query)
+        return result.scalar()
+
     async def get_companies_list_by_attributes(
         self,
         page: int,
@@ -46,7 +58,7 @@ class CompanyRepository:
         visibility: bool | None = True,
         is_active: bool = True,
         **kwargs,
-    ) -> list[Company]:
+    ) -> Sequence[RowMapping]:
         kwargs.update(is_active=is_active)
         if visibility is not None:
             kwargs.update(visibility=visibility)
@@ -59,7 +71,7 @@ class CompanyRepository:
             session=self.session,
             filter_condition=filter_condition,
         )
-        companies = await paginator.paginate(page=page, limit=limit)
+        companies = await paginator.paginate_rows(page=page, limit=limit)
         return companies
 
     async def create_company(
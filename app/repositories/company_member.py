@@ -1,7 +1,7 @@
 from typing import Sequence
 from uuid import UUID
 
-from sqlalchemy import and_, insert, update
+from sqlalchemy import and_, exists, insert, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import joinedload
@@ -133,3 +133,60 @@ class CompanyMemberRepository:
         )
         result = await self.session.execute(query)
         return result.scalars().all()
+
+    async def is_active_member(self, company_id: UUID, user_id: UUID) -> bool:
+        query = select(
+            exists().where(
+                CompanyMember.company_id == company_id,
+                CompanyMember.user_id == user_id,
+                CompanyMember.is_active == True,
+            )
+        )
+        result = await self.session.execute(query)
+        return result.scalar()
+
+    async def get_active_member_ids(self, company_id: UUID) -> Sequence:
+        query = select(CompanyMember.member_id).where(
+            and_(
+                CompanyMember.company_id == company_id,
+                CompanyMember.is_active == True,
+            )
+        )
+        result = await self.session.execute(query)
+        return result.scalars().all()
+
+    async def add_users_to_company(
+        self, company_id: UUID, user_ids: Sequence[UUID]
+    ) -> Sequence[CompanyMember]:
+        if not user_ids:
+            return []
+        # executed as multi-row INSERT statements
+        result = await self.session.scalars(
+            insert(CompanyMember).returning(CompanyMember),
+            [
+                {"company_id": company_id, "user_id": user_id}
+                for user_id in user_ids
+            ],
+        )
+        return result.all()
+
+    async def remove_users_from_company(
+        self, company_id: UUID, user_ids: Sequence[UUID]
+    ) -> Sequence[UUID]:
+        """
+        Deactivate the memberships, return ids of the removed users.
+        """
+        query = (
+            update(CompanyMember)
+            .where(
+                and_(
+                    CompanyMember.company_id == company_id,
+                    CompanyMember.user_id.in_(user_ids),
+                    CompanyMember.is_active == True,
+                )
+            )
+            .values(is_active=False)
+            .returning(CompanyMember.user_id)
+        )
+        result = await self.session.execute(query)
+        return result.scalars().all()
@@ -1,10 +1,16 @@
+from typing import Sequence
 from uuid import UUID
 
-from sqlalchemy import and_, insert, update
+from sqlalchemy import RowMapping, and_, exists, insert, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
-from app.db.models import CompanyRequest
+from app.db.models import (
+    CompanyMember,
+    CompanyRequest,
+    CompanyRequestStatus,
+    User,
+)
 from app.schemas.company_request import CompanyRequestCreateScheme
 from app.utils.exceptions.company import CompanyRequestNotFoundException
 from app.utils.paginator import Paginator
@@ -38,7 +44,7 @@ class CompanyRequestRepository:
         limit: int,
         is_active: bool = True,
         **kwargs,
-    ) -> list[CompanyRequest]:
+    ) -> Sequence[RowMapping]:
         kwargs.update(is_active=is_active)
 
         filter_condition = [
@@ -50,7 +56,7 @@ class CompanyRequestRepository:
             session=self.session,
             filter_condition=filter_condition,
         )
-        requests = await paginator.paginate(page=page, limit=limit)
+        requests = await paginator.paginate_rows(page=page, limit=limit)
         return requests
 
     async def create_company_request(
@@ -109,3 +115,49 @@ class CompanyRequestRepository:
         raise CompanyRequestNotFoundException(
             request_id=request_id, is_active=True
         )
+
+    async def get_invite_candidates(
+        self, company_id: UUID, user_ids: Sequence[UUID]
+    ) -> Sequence[RowMapping]:
+        """
+        Active users among user_ids, flagged when they are already company
+        members or have a pending company request.
+        """
+        is_member = exists().where(
+            CompanyMember.company_id == company_id,
+            CompanyMember.user_id == User.user_id,
+            CompanyMember.is_active == True,
+        )
+        is_invited = exists().where(
+            CompanyRequest.company_id == company_id,
+            CompanyRequest.user_id == User.user_id,
+            CompanyRequest.status == CompanyRequestStatus.pending.value,
+            CompanyRequest.is_active == True,
+        )
+        query = select(
+            User.user_id,
+            is_member.label("is_member"),
+            is_invited.label("is_invited"),
+        ).where(
+            and_(
+                User.user_id.in_(user_ids),
+                User.is_active == True,
+            )
+        )
+        result = await self.session.execute(query)
+        return result.mappings().all()
+
+    async def create_company_requests(
+        self, company_id: UUID, user_ids: Sequence[UUID]
+    ) -> Sequence[CompanyRequest]:
+        if not user_ids:
+            return []
+        # executed as multi-row INSERT statements
+        result = await self.session.scalars(
+            insert(CompanyRequest).returning(CompanyRequest),
+            [
+                {"company_id": company_id, "user_id": user_id}
+                for user_id in user_ids
+            ],
+        )
+        return result.all()
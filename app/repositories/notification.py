@@ -1,17 +1,40 @@
 from typing import Sequence
 from uuid import UUID
 
-from sqlalchemy import and_, insert, select, update
+from sqlalchemy import (
+    RowMapping,
+    and_,
+    func,
+    insert,
+    literal,
+    select,
+    true,
+    tuple_,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.models import Notification
+from app.db.models import (
+    CompanyMember,
+    Notification,
+    notification_partitions,
+)
 from app.schemas.notification import NotificationCreateScheme
+from app.utils.paginator import TimeCursor
 
 
 class NotificationRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    @staticmethod
+    def _retained():
+        """
+        Rows of the retained months, expired partitions are pruned even
+        before the maintenance drops them.
+        """
+        return Notification.time >= notification_partitions.cutoff()
+
     async def create_notification(
         self, scheme: NotificationCreateScheme
     ) -> Notification:
@@ -20,14 +43,51 @@ class NotificationRepository:
         result = await self.session.execute(query)
         return result.scalar()
 
+    async def create_company_members_notifications(
+        self, company_id: UUID, text: str
+    ) -> Sequence[RowMapping]:
+        """
+        Notify all active company members with one INSERT ... SELECT.
+        """
+        members = select(
+            func.gen_random_uuid(),
+            literal(text),
+            CompanyMember.user_id,
+            func.now(),
+            true(),
+        ).where(
+            and_(
+                CompanyMember.company_id == company_id,
+                CompanyMember.is_active == True,
+            )
+        )
+        query = (
+            insert(Notification)
+            .from_select(
+                ["notification_id", "text", "user_id", "time", "status"],
+                members,
+            )
+            .returning(*Notification.__table__.c)
+        )
+        result = await self.session.execute(query)
+        return result.mappings().all()
+
     async def get_user_notifications(
         self, user_id: UUID
-    ) -> Sequence[Notification]:
-        query = select(Notification).where(
-            and_(Notification.user_id == user_id, Notification.status == True)
+    ) -> Sequence[RowMapping]:
+        query = (
+            select(*Notification.__table__.c)
+            .where(
+                and_(
+                    Notification.user_id == user_id,
+                    Notification.status == True,
+                    self._retained(),
+                )
+            )
+            .order_by(Notification.time.desc())
         )
         result = await self.session.execute(query)
-        return result.scalars().all()
+        return result.mappings().all()
 
     async def update_user_notification_status(
         self, notification_id: UUID, user_id: UUID, status: bool
@@ -45,3 +105,61 @@ class NotificationRepository:
         )
         result = await self.session.execute(query)
         return result.scalar()
+
+    async def get_user_notifications_page(
+        self,
+        user_id: UUID,
+        limit: int,
+        cursor: TimeCursor | None = None,
+        unread: bool = False,
+    ) -> Sequence[RowMapping]:
+        """
+        Newest first notifications after cursor, keyset paginated.
+        """
+        query = (
+            select(*Notification.__table__.c)
+            .where(Notification.user_id == user_id, self._retained())
+            .order_by(
+                Notification.time.desc(), Notification.notification_id.desc()
+            )
+            .limit(limit)
+        )
+        if cursor is not None:
+            query = query.where(
+                tuple_(Notification.time, Notification.notification_id)
+                < tuple_(cursor.time, cursor.id)
+            )
+        if unread:
+            query = query.where(Notification.status == True)
+        result = await self.session.execute(query)
+        return result.mappings().all()
+
+    async def count_user_unread_notifications(self, user_id: UUID) -> int:
+        query = (
+            select(func.count())
+            .select_from(Notification)
+            .where(
+                and_(
+                    Notification.user_id == user_id,
+                    Notification.status == True,
+                    self._retained(),
+                )
+            )
+        )
+        result = await self.session.execute(query)
+        return result.scalar()
+
+    async def mark_user_notifications_as_read(self, user_id: UUID) -> int:
+        query = (
+            update(Notification)
+            .where(
+                and_(
+                    Notification.user_id == user_id,
+                    Notification.status == True,
+                    self._retained(),
+                )
+            )
+            .values(status=False)
+        )
+        result = await self.session.execute(query)
+        return result.rowcount
@@ -1,9 +1,21 @@
+from typing import Iterable, Sequence
 from uuid import UUID
 
-from sqlalchemy import and_, insert, select, update
+from sqlalchemy import (
+    String,
+    and_,
+    cast,
+    func,
+    insert,
+    literal,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
+from app.db.bulk import copy_records
 from app.db.models import Answer, Question, Quiz
 
 
@@ -34,6 +46,54 @@ class QuizRepository:
         result = await self.session.execute(query)
         return result.unique().scalars().all()
 
+    async def get_quiz_updated_at(self, quiz_id: UUID):
+        query = select(Quiz.updated_at).where(
+            and_(Quiz.quiz_id == quiz_id, Quiz.is_active == True)
+        )
+        result = await self.session.execute(query)
+        return result.scalar()
+
+    async def get_company_quizzes_fingerprint(
+        self, company_id: UUID
+    ) -> tuple[int, str | None]:
+        """
+        Count and digest of the versions of the active company quizzes,
+        changed by any quiz created, updated or deleted.
+        """
+        versions = func.string_agg(
+            cast(Quiz.updated_at, String),
+            aggregate_order_by(literal(","), Quiz.quiz_id),
+        )
+        query = select(func.count(), func.md5(versions)).where(
+            and_(Quiz.company_id == company_id, Quiz.is_active == True)
+        )
+        result = await self.session.execute(query)
+        return tuple(result.one())
+
+    async def touch_quiz(self, quiz_id: UUID) -> None:
+        """
+        Bump the version of the quiz after a change of its questions.
+        """
+        query = (
+            update(Quiz)
+            .where(Quiz.quiz_id == quiz_id)
+            .values(updated_at=func.now())
+        )
+        await self.session.execute(query)
+
+    async def touch_quiz_by_question_id(self, question_id: UUID) -> None:
+        query = (
+            update(Quiz)
+            .where(
+                and_(
+                    Quiz.quiz_id == Question.quiz_id,
+                    Question.question_id == question_id,
+                )
+            )
+            .values(updated_at=func.now())
+        )
+        await self.session.execute(query)
+
     async def create_quiz(
         self, company_id: UUID, name: str, description: str
     ) -> Quiz:
@@ -56,3 +116,64 @@ class QuizRepository:
         )
         result = await self.session.execute(query)
         return result.scalar()
+
+    async def get_active_quiz_names(
+        self, company_id: UUID, names: Iterable[str]
+    ) -> Sequence[str]:
+        query = select(Quiz.name).where(
+            and_(
+                Quiz.company_id == company_id,
+                Quiz.name.in_(names),
+                Quiz.is_active == True,
+            )
+        )
+        result = await self.session.execute(query)
+        return result.scalars().all()
+
+    async def get_active_quiz_ids(self, company_id: UUID) -> Sequence[UUID]:
+        query = select(Quiz.quiz_id).where(
+            and_(Quiz.company_id == company_id, Quiz.is_active == True)
+        )
+        result = await self.session.execute(query)
+        return result.scalars().all()
+
+    async def copy_quizzes(
+        self,
+        quizzes: Iterable[tuple],
+        questions: Iterable[tuple],
+        answers: Iterable[tuple],
+    ) -> None:
+        """
+        Load nested quizzes rows with COPY in the session transaction.
+
+        Rows are (quiz_id, company_id, name, description, pass_rate,
+        is_active),
+        (question_id, quiz_id, text) and
+        (answer_id, question_id, text, is_correct) tuples.
+        """
+        conn = await self.session.connection()
+        await copy_records(
+            conn,
+            Quiz.__table__,
+            quizzes,
+            columns=(
+                "quiz_id",
+                "company_id",
+                "name",
+                "description",
+                "pass_rate",
+                "is_active",
+            ),
+        )
+        await copy_records(
+            conn,
+            Question.__table__,
+            questions,
+            columns=("question_id", "quiz_id", "text"),
+        )
+        await copy_records(
+            conn,
+            Answer.__table__,
+            answers,
+            columns=("answer_id", "question_id", "text", "is_correct"),
+        )
@@ -0,0 +1,154 @@
+import datetime
+from typing import Iterable, Sequence
+from uuid import UUID
+
+from sqlalchemy import Integer, String, case, delete, func, literal, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import (
+    CompanyScoreHistogram,
+    Quiz,
+    QuizScoreHistogram,
+    UserQuiz,
+)
+
+
+class ScoreHistogramRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @staticmethod
+    def _add_score_query(model, bucket: int, **key):
+        bucket = str(bucket)
+        query = insert(model).values(counts={bucket: 1}, **key)
+        count = func.coalesce(model.counts[bucket].astext.cast(Integer), 0)
+        return query.on_conflict_do_update(
+            index_elements=list(key),
+            set_={
+                "counts": model.counts.op("||")(
+                    func.jsonb_build_object(literal(bucket, String), count + 1)
+                )
+            },
+        )
+
+    async def add_score(
+        self,
+        quiz_id: UUID,
+        company_id: UUID,
+        day: datetime.date,
+        bucket: int,
+    ) -> None:
+        # quiz row first, concurrent attempts lock the rows in one order
+        await self.session.execute(
+            self._add_score_query(
+                QuizScoreHistogram, bucket, quiz_id=quiz_id, day=day
+            )
+        )
+        await self.session.execute(
+            self._add_score_query(
+                CompanyScoreHistogram, bucket, company_id=company_id, day=day
+            )
+        )
+
+    async def get_quiz_histograms(
+        self, quiz_id: UUID, from_day: datetime.date, to_day: datetime.date
+    ) -> Sequence[dict]:
+        query = select(QuizScoreHistogram.counts).where(
+            QuizScoreHistogram.quiz_id == quiz_id,
+            QuizScoreHistogram.day >= from_day,
+            QuizScoreHistogram.day <= to_day,
+        )
+        result = await self.session.execute(query)
+        return result.scalars().all()
+
+    async def get_histograms_for_quizzes(
+        self,
+        quiz_ids: Iterable[UUID],
+        from_day: datetime.date,
+        to_day: datetime.date,
+    ) -> Sequence:
+        query = select(
+            QuizScoreHistogram.quiz_id, QuizScoreHistogram.counts
+        ).where(
+            QuizScoreHistogram.quiz_id.in_(quiz_ids),
+            QuizScoreHistogram.day >= from_day,
+            QuizScoreHistogram.day <= to_day,
+        )
+        result = await self.session.execute(query)
+        return result.fetchall()
+
+    async def get_company_histograms(
+        self,
+        company_id: UUID,
+        from_day: datetime.date,
+        to_day: datetime.date,
+    ) -> Sequence[dict]:
+        query = select(CompanyScoreHistogram.counts).where(
+            CompanyScoreHistogram.company_id == company_id,
+            CompanyScoreHistogram.day >= from_day,
+            CompanyScoreHistogram.day <= to_day,
+        )
+        result = await self.session.execute(query)
+        return result.scalars().all()
+
+    @staticmethod
+    def _rebuild_query(model, key, since: datetime.date | None):
+        day = func.date(func.timezone("UTC", UserQuiz.attempt_time))
+        # as score_bucket, attempts of no questions score 0
+        bucket = case(
+            (
+                UserQuiz.total_questions > 0,
+                func.greatest(
+                    func.least(
+                        UserQuiz.correct_answers_count
+                        * 100
+                        // UserQuiz.total_questions,
+                        100,
+                    ),
+                    0,
+                ),
+            ),
+            else_=0,
+        )
+        scores = (
+            select(
+                key.label("key"),
+                day.label("day"),
+                bucket.label("bucket"),
+                func.count().label("count"),
+            )
+            .select_from(UserQuiz)
+            .join(Quiz, Quiz.quiz_id == UserQuiz.quiz_id)
+            .group_by(key, day, bucket)
+        )
+        if since is not None:
+            start = datetime.datetime.combine(
+                since, datetime.time(), datetime.timezone.utc
+            )
+            scores = scores.where(UserQuiz.attempt_time >= start)
+        scores = scores.subquery()
+        histograms = select(
+            scores.c.key,
+            scores.c.day,
+            func.jsonb_object_agg(scores.c.bucket, scores.c.count),
+        ).group_by(scores.c.key, scores.c.day)
+        # keys are named as the histogram columns
+        return insert(model).from_select(
+            [key.name, "day", "counts"], histograms
+        )
+
+    async def rebuild(self, since: datetime.date | None = None) -> None:
+        """
+        Recount the histograms of the days since the given one from the
+        user quizzes, for attempts loaded bypassing record_user_quiz.
+        """
+        for model, key in (
+            (QuizScoreHistogram, UserQuiz.quiz_id),
+            (CompanyScoreHistogram, Quiz.company_id),
+        ):
+            query = delete(model)
+            if since is not None:
+                query = query.where(model.day >= since)
+            await self.session.execute(query)
+            await self.session.execute(self._rebuild_query(model, key, since))
@@ -0,0 +1,208 @@
+from typing import Iterable, Sequence
+from uuid import UUID
+
+from sqlalchemy import func, select, text, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import (
+    CompanyMember,
+    CompanyUserScoreTotal,
+    Quiz,
+    UserQuiz,
+    UserScoreTotal,
+)
+
+# summed columns of the totals, named as in user_quizzes but attempts
+TOTALS = ("attempts", "correct_answers_count", "total_questions")
+
+
+class ScoreTotalRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @staticmethod
+    def _add_query(
+        model, correct_answers_count: int, total_questions: int, **key
+    ):
+        query = insert(model).values(
+            attempts=1,
+            correct_answers_count=correct_answers_count,
+            total_questions=total_questions,
+            **key,
+        )
+        return query.on_conflict_do_update(
+            index_elements=list(key),
+            set_={
+                column: getattr(model, column) + query.excluded[column]
+                for column in TOTALS
+            },
+        )
+
+    async def add_attempt(
+        self,
+        user_id: UUID,
+        company_id: UUID,
+        correct_answers_count: int,
+        total_questions: int,
+    ) -> None:
+        # user row first, concurrent attempts lock the rows in one order
+        await self.session.execute(
+            self._add_query(
+                UserScoreTotal,
+                correct_answers_count,
+                total_questions,
+                user_id=user_id,
+            )
+        )
+        await self.session.execute(
+            self._add_query(
+                CompanyUserScoreTotal,
+                correct_answers_count,
+                total_questions,
+                company_id=company_id,
+                user_id=user_id,
+            )
+        )
+
+    async def subtract_quiz(
+        self, quiz_id: UUID, company_id: UUID
+    ) -> Sequence[UUID]:
+        """
+        Take attempts of the quiz out of the totals, for a deactivated quiz.
+        Return ids of the users who took the quiz.
+        """
+        sums = (
+            select(
+                UserQuiz.user_id,
+                func.count().label("attempts"),
+                func.sum(UserQuiz.correct_answers_count).label(
+                    "correct_answers_count"
+                ),
+                func.sum(UserQuiz.total_questions).label("total_questions"),
+            )
+            .where(UserQuiz.quiz_id == quiz_id)
+            .group_by(UserQuiz.user_id)
+            .subquery()
+        )
+        user_ids = set()
+        for model, conditions in (
+            (UserScoreTotal, ()),
+            (
+                CompanyUserScoreTotal,
+                (CompanyUserScoreTotal.company_id == company_id,),
+            ),
+        ):
+            query = (
+                update(model)
+                .where(model.user_id == sums.c.user_id, *conditions)
+                .values(
+                    {
+                        column: getattr(model, column) - sums.c[column]
+                        for column in TOTALS
+                    }
+                )
+                .returning(model.user_id)
+            )
+            result = await self.session.execute(query)
+            user_ids.update(result.scalars())
+        return list(user_ids)
+
+    async def get_user_score_total(
+        self, user_id: UUID
+    ) -> UserScoreTotal | None:
+        query = select(UserScoreTotal).where(UserScoreTotal.user_id == user_id)
+        result = await self.session.execute(query)
+        return result.scalar()
+
+    async def get_company_user_score_total(
+        self, company_id: UUID, user_id: UUID
+    ) -> CompanyUserScoreTotal | None:
+        query = select(CompanyUserScoreTotal).where(
+            CompanyUserScoreTotal.company_id == company_id,
+            CompanyUserScoreTotal.user_id == user_id,
+        )
+        result = await self.session.execute(query)
+        return result.scalar()
+
+    async def get_company_member_score_totals(
+        self, member_ids: Iterable[UUID]
+    ) -> Sequence:
+        query = select(
+            CompanyMember.member_id,
+            CompanyUserScoreTotal.correct_answers_count,
+            CompanyUserScoreTotal.total_questions,
+        ).where(
+            CompanyMember.member_id.in_(member_ids),
+            CompanyUserScoreTotal.company_id == CompanyMember.company_id,
+            CompanyUserScoreTotal.user_id == CompanyMember.user_id,
+            CompanyUserScoreTotal.attempts > 0,
+        )
+        result = await self.session.execute(query)
+        return result.fetchall()
+
+    async def count_totals(self, *keys) -> dict[tuple, tuple[int, int, int]]:
+        """
+        Recount the totals grouped by the key columns from user quizzes.
+        """
+        query = (
+            select(
+                *keys,
+                func.count(),
+                func.sum(UserQuiz.correct_answers_count),
+                func.sum(UserQuiz.total_questions),
+            )
+            .where(UserQuiz.quiz_id == Quiz.quiz_id, Quiz.is_active == True)
+            .group_by(*keys)
+        )
+        result = await self.session.execute(query)
+        return {
+            tuple(row[: len(keys)]): tuple(row[len(keys) :]) for row in result
+        }
+
+    async def get_totals(self, model) -> dict[tuple, tuple[int, int, int]]:
+        keys = model.__table__.primary_key.columns
+        query = select(*keys, *(getattr(model, c) for c in TOTALS))
+        result = await self.session.execute(query)
+        return {
+            tuple(row[: len(keys)]): tuple(row[len(keys) :]) for row in result
+        }
+
+    async def repair(self) -> int:
+        """
+        Recount the totals and fix the rows which differ, return their
+        count.
+
+        The totals are locked against writes meanwhile, attempts being
+        recorded wait for the repair transaction.
+        """
+        await self.session.execute(
+            text(
+                "LOCK TABLE user_score_totals, company_user_score_totals "
+                "IN SHARE ROW EXCLUSIVE MODE"
+            )
+        )
+        repaired = 0
+        for model, keys in (
+            (UserScoreTotal, (UserQuiz.user_id,)),
+            (CompanyUserScoreTotal, (Quiz.company_id, UserQuiz.user_id)),
+        ):
+            expected = await self.count_totals(*keys)
+            stored = await self.get_totals(model)
+            zero = (0,) * len(TOTALS)
+            names = [key.name for key in keys]
+            rows = [
+                dict(zip(names, key)) | dict(zip(TOTALS, totals))
+                for key in expected.keys() | stored.keys()
+                if (totals := expected.get(key, zero)) != stored.get(key)
+            ]
+            if not rows:
+                continue
+            query = insert(model)
+            query = query.on_conflict_do_update(
+                index_elements=names,
+                set_={column: query.excluded[column] for column in TOTALS},
+            )
+            await self.session.execute(query, rows)
+            repaired += len(rows)
+        return repaired
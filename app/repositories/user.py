@@ -1,6 +1,7 @@
+from typing import Sequence
 from uuid import UUID
 
-from sqlalchemy import and_, insert, select, update
+from sqlalchemy import RowMapping, and_, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models import User
@@ -38,13 +39,20 @@ class UserRepository:
             return user
         raise UserNotFoundException(**kwargs)
 
+    async def get_user_updated_at(self, user_id: UUID):
+        query = select(User.updated_at).where(
+            and_(User.user_id == user_id, User.is_active == True)
+        )
+        result = await self.session.execute(query)
+        return result.scalar()
+
     async def get_users_list_by_attributes(
         self,
         page: int,
         limit: int,
         is_active=True,
         **kwargs,
-    ) -> list[User]:
+    ) -> Sequence[RowMapping]:
         kwargs.update(is_active=is_active)
         filter_condition = [
             getattr(User, attr) == value for attr, value in kwargs.items()
@@ -54,7 +62,7 @@ class UserRepository:
             session=self.session,
             filter_condition=filter_condition,
         )
-        users = await paginator.paginate(page=page, limit=limit)
+        users = await paginator.paginate_rows(page=page, limit=limit)
         return users
 
     async def create_user(
@@ -1,12 +1,12 @@
 from datetime import datetime, timedelta
-from typing import Sequence
+from typing import Iterable, Sequence
 from uuid import UUID
 
-from sqlalchemy import and_, func, insert, select
+from sqlalchemy import RowMapping, and_, func, insert, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
-from app.db.models import CompanyMember, Quiz, UserQuiz
+from app.db.models import CompanyMember, Quiz, UserQuiz, UserQuizAnswers
 
 
 class UserQuizRepository:
@@ -28,92 +28,67 @@ class UserQuizRepository:
         result = await self.session.execute(query)
         return result.scalar()
 
-    async def get_nested_user_quizzes_by_user_id(
-        self, user_id: UUID
-    ) -> Sequence[UserQuiz]:
+    async def _get_user_quiz_rows(self, *conditions) -> Sequence[RowMapping]:
+        """
+        Select user quizzes joined with their answers as plain columns,
+        one row per answer, ordered by user_quiz_id.
+        """
         query = (
-            select(UserQuiz)
-            .options(joinedload(UserQuiz.answers))
-            .where(
+            select(
+                *UserQuiz.__table__.c,
+                UserQuizAnswers.user_answer_id,
+                UserQuizAnswers.question_id,
+                UserQuizAnswers.answer_id,
+            )
+            .outerjoin(
+                UserQuizAnswers,
                 and_(
-                    UserQuiz.user_id == user_id,
-                    UserQuiz.quiz_id == Quiz.quiz_id,
-                    Quiz.is_active == True,
-                )
+                    UserQuizAnswers.user_quiz_id == UserQuiz.user_quiz_id,
+                    UserQuizAnswers.attempt_time == UserQuiz.attempt_time,
+                ),
             )
+            .where(and_(*conditions))
+            .order_by(UserQuiz.user_quiz_id)
         )
         result = await self.session.execute(query)
-        return result.unique().scalars().all()
+        return result.mappings().all()
 
-    async def get_nested_user_quizzes_by_member_id(
+    async def get_user_quiz_rows_by_user_id(
+        self, user_id: UUID
+    ) -> Sequence[RowMapping]:
+        return await self._get_user_quiz_rows(
+            UserQuiz.user_id == user_id,
+            UserQuiz.quiz_id == Quiz.quiz_id,
+            Quiz.is_active == True,
+        )
+
+    async def get_user_quiz_rows_by_member_id(
         self, member_id: UUID
-    ) -> Sequence[UserQuiz]:
-        query = (
-            select(UserQuiz)
-            .options(joinedload(UserQuiz.answers))
-            .where(
-                and_(
-                    CompanyMember.member_id == member_id,
-                    CompanyMember.user_id == UserQuiz.user_id,
-                    UserQuiz.quiz_id == Quiz.quiz_id,
-                    Quiz.is_active == True,
-                )
-            )
+    ) -> Sequence[RowMapping]:
+        return await self._get_user_quiz_rows(
+            CompanyMember.member_id == member_id,
+            CompanyMember.user_id == UserQuiz.user_id,
+            UserQuiz.quiz_id == Quiz.quiz_id,
+            Quiz.is_active == True,
         )
-        result = await self.session.execute(query)
-        return result.unique().scalars().all()
 
-    async def get_nested_quizzes_by_company_id(
+    async def get_user_quiz_rows_by_company_id(
         self, company_id: UUID
-    ) -> Sequence[UserQuiz]:
-        query = (
-            select(UserQuiz)
-            .options(joinedload(UserQuiz.answers))
-            .where(
-                and_(
-                    UserQuiz.quiz_id == Quiz.quiz_id,
-                    Quiz.company_id == company_id,
-                    Quiz.is_active == True,
-                )
-            )
+    ) -> Sequence[RowMapping]:
+        return await self._get_user_quiz_rows(
+            UserQuiz.quiz_id == Quiz.quiz_id,
+            Quiz.company_id == company_id,
+            Quiz.is_active == True,
         )
-        result = await self.session.execute(query)
-        return result.unique().scalars().all()
 
-    async def get_nested_quizzes_by_quiz_id(
+    async def get_user_quiz_rows_by_quiz_id(
         self, quiz_id: UUID
-    ) -> Sequence[UserQuiz]:
-        query = (
-            select(UserQuiz)
-            .options(joinedload(UserQuiz.answers))
-            .where(
-                and_(
-                    UserQuiz.quiz_id == Quiz.quiz_id,
-                    Quiz.quiz_id == quiz_id,
-                    Quiz.is_active == True,
-                )
-            )
-        )
-        result = await self.session.execute(query)
-        return result.unique().scalars().all()
-
-    async def get_sum_correct_answers_count_by_user(
-        self, user_id: UUID, company_id: UUID = None
-    ) -> int:
-        query = select(func.sum(UserQuiz.correct_answers_count)).where(
-            and_(
-                UserQuiz.user_id == user_id,
-                Quiz.quiz_id == UserQuiz.quiz_id,
-                Quiz.is_active == True,
-            )
+    ) -> Sequence[RowMapping]:
+        return await self._get_user_quiz_rows(
+            UserQuiz.quiz_id == Quiz.quiz_id,
+            Quiz.quiz_id == quiz_id,
+            Quiz.is_active == True,
         )
-        if company_id is not None:
-            query = query.where(
-                Quiz.company_id == company_id,
-            )
-        result = await self.session.execute(query)
-        result = result.scalar()
-        return result
 
     async def get_sum_correct_answers_count_for_all(self) -> int:
         query = select(func.sum(UserQuiz.correct_answers_count))
@@ -121,24 +96,6 @@ class UserQuizRepository:
         result = result.scalar()
         return result
 
-    async def get_sum_total_questions_by_user(
-        self, user_id: UUID, company_id: UUID = None
-    ) -> int:
-        query = select(func.sum(UserQuiz.total_questions)).where(
-            and_(
-                UserQuiz.user_id == user_id,
-                Quiz.quiz_id == UserQuiz.quiz_id,
-                Quiz.is_active == True,
-            )
-        )
-        if company_id is not None:
-            query = query.where(
-                Quiz.company_id == company_id,
-            )
-        result = await self.session.execute(query)
-        result = result.scalar()
-        return result
-
     async def get_sum_total_questions_for_all(self) -> int:
         query = select(func.sum(UserQuiz.total_questions))
         result = await self.session.execute(query)
@@ -168,10 +125,9 @@ class UserQuizRepository:
         return average_scores
 
     async def get_last_passing_for_each_quiz(self) -> Sequence:
-        query = select(
-            UserQuiz.quiz_id,
-            func.max(UserQuiz.attempt_time),
-        ).group_by(UserQuiz.quiz_id)
+        query = select(Quiz.quiz_id, Quiz.last_attempt_at).where(
+            Quiz.last_attempt_at.is_not(None)
+        )
         result = await self.session.execute(query)
         last_passing = result.fetchall()
         return last_passing
@@ -202,6 +158,34 @@ class UserQuizRepository:
         average_scores = result.fetchall()
         return average_scores
 
+    async def get_statistic_for_each_member_and_quiz_by_company_id(
+        self, company_id: UUID, from_date: datetime, to_date: datetime
+    ) -> Sequence:
+        to_date += timedelta(days=1)
+        query = (
+            select(
+                CompanyMember.member_id,
+                UserQuiz.quiz_id,
+                func.sum(UserQuiz.total_questions),
+                func.sum(UserQuiz.correct_answers_count),
+            )
+            .where(
+                and_(
+                    CompanyMember.company_id == company_id,
+                    CompanyMember.is_active == True,
+                    CompanyMember.user_id == UserQuiz.user_id,
+                    Quiz.company_id == company_id,
+                    Quiz.is_active == True,
+                    Quiz.quiz_id == UserQuiz.quiz_id,
+                    UserQuiz.attempt_time >= from_date,
+                    UserQuiz.attempt_time < to_date,
+                )
+            )
+            .group_by(CompanyMember.member_id, UserQuiz.quiz_id)
+        )
+        result = await self.session.execute(query)
+        return result.fetchall()
+
     async def get_statistic_for_each_quiz_for_company_member(
         self, member_id: UUID, from_date: datetime, to_date: datetime
     ) -> Sequence:
@@ -228,24 +212,179 @@ class UserQuizRepository:
         average_scores = result.fetchall()
         return average_scores
 
-    async def get_last_passing_for_each_member_quiz_by_company_id(
-        self, company_id: UUID
+    async def get_statistic_for_each_quiz_for_company_members(
+        self,
+        member_ids: Iterable[UUID],
+        from_date: datetime,
+        to_date: datetime,
     ) -> Sequence:
+        to_date += timedelta(days=1)
         query = (
             select(
                 CompanyMember.member_id,
-                func.max(UserQuiz.attempt_time),
+                UserQuiz.quiz_id,
+                func.sum(UserQuiz.total_questions),
+                func.sum(UserQuiz.correct_answers_count),
             )
             .where(
                 and_(
-                    CompanyMember.company_id == company_id,
+                    CompanyMember.member_id.in_(member_ids),
                     CompanyMember.user_id == UserQuiz.user_id,
-                    Quiz.company_id == company_id,
+                    Quiz.company_id == CompanyMember.company_id,
                     Quiz.quiz_id == UserQuiz.quiz_id,
+                    UserQuiz.attempt_time >= from_date,
+                    UserQuiz.attempt_time < to_date,
                 )
             )
-            .group_by(CompanyMember.member_id)
+            .group_by(CompanyMember.member_id, UserQuiz.quiz_id)
+        )
+        result = await self.session.execute(query)
+        average_scores = result.fetchall()
+        return average_scores
+
+    async def get_last_passing_for_each_member_quiz_by_company_id(
+        self, company_id: UUID
+    ) -> Sequence:
+        query = select(
+            CompanyMember.member_id, CompanyMember.last_attempt_at
+        ).where(
+            CompanyMember.company_id == company_id,
+            CompanyMember.last_attempt_at.is_not(None),
         )
         result = await self.session.execute(query)
         last_passing = result.fetchall()
         return last_passing
+
+    async def set_last_attempt(
+        self,
+        quiz_id: UUID,
+        company_id: UUID,
+        user_id: UUID,
+        attempt_time: datetime,
+    ) -> None:
+        """
+        Move last_attempt_at of the quiz and of the company member forward.
+        """
+        for model, conditions in (
+            (Quiz, (Quiz.quiz_id == quiz_id,)),
+            (
+                CompanyMember,
+                (
+                    CompanyMember.company_id == company_id,
+                    CompanyMember.user_id == user_id,
+                ),
+            ),
+        ):
+            query = (
+                update(model)
+                .where(
+                    *conditions,
+                    or_(
+                        model.last_attempt_at.is_(None),
+                        model.last_attempt_at < attempt_time,
+                    ),
+                )
+                .values(
+                    last_attempt_at=attempt_time,
+                    **self._kept_updated_at(model),
+                )
+            )
+            await self.session.execute(query)
+
+    @staticmethod
+    def _kept_updated_at(model) -> dict:
+        # attempts do not change the quiz itself, its version is kept
+        if model is Quiz:
+            return {"updated_at": Quiz.updated_at}
+        return {}
+
+    async def backfill_last_attempts(self) -> int:
+        """
+        Set last_attempt_at of quizzes and company members from the user
+        quizzes, return the count of the changed rows.
+        """
+        quizzes = (
+            select(
+                UserQuiz.quiz_id.label("key"),
+                func.max(UserQuiz.attempt_time).label("last_attempt_at"),
+            )
+            .group_by(UserQuiz.quiz_id)
+            .subquery()
+        )
+        members = (
+            select(
+                CompanyMember.member_id.label("key"),
+                func.max(UserQuiz.attempt_time).label("last_attempt_at"),
+            )
+            .where(
+                CompanyMember.user_id == UserQuiz.user_id,
+                Quiz.company_id == CompanyMember.company_id,
+                Quiz.quiz_id == UserQuiz.quiz_id,
+            )
+            .group_by(CompanyMember.member_id)
+            .subquery()
+        )
+        changed = 0
+        for model, key, last in (
+            (Quiz, Quiz.quiz_id, quizzes),
+            (CompanyMember, CompanyMember.member_id, members),
+        ):
+            query = (
+                update(model)
+                .where(
+                    key == last.c.key,
+                    model.last_attempt_at.is_distinct_from(
+                        last.c.last_attempt_at
+                    ),
+                )
+                .values(
+                    last_attempt_at=last.c.last_attempt_at,
+                    **self._kept_updated_at(model),
+                )
+            )
+            result = await self.session.execute(query)
+            changed += result.rowcount
+        return changed
+
+    async def get_score_sums_for_each_company_user(
+        self, company_id: UUID | None = None
+    ) -> Sequence:
+        query = (
+            select(
+                Quiz.company_id,
+                UserQuiz.user_id,
+                func.sum(UserQuiz.correct_answers_count),
+                func.sum(UserQuiz.total_questions),
+            )
+            .where(
+                Quiz.quiz_id == UserQuiz.quiz_id,
+                Quiz.is_active == True,
+                # ranked as the member averages, active members only
+                CompanyMember.company_id == Quiz.company_id,
+                CompanyMember.user_id == UserQuiz.user_id,
+                CompanyMember.is_active == True,
+            )
+            .group_by(Quiz.company_id, UserQuiz.user_id)
+        )
+        if company_id is not None:
+            query = query.where(Quiz.company_id == company_id)
+        result = await self.session.execute(query)
+        return result.fetchall()
+
+    async def get_score_sums_for_each_quiz_user(
+        self, quiz_id: UUID | None = None
+    ) -> Sequence:
+        query = (
+            select(
+                UserQuiz.quiz_id,
+                UserQuiz.user_id,
+                func.sum(UserQuiz.correct_answers_count),
+                func.sum(UserQuiz.total_questions),
+            )
+            .where(Quiz.quiz_id == UserQuiz.quiz_id, Quiz.is_active == True)
+            .group_by(UserQuiz.quiz_id, UserQuiz.user_id)
+        )
+        if quiz_id is not None:
+            query = query.where(UserQuiz.quiz_id == quiz_id)
+        result = await self.session.execute(query)
+        return result.fetchall()
@@ -1,3 +1,4 @@
+from datetime import datetime
 from uuid import UUID
 
 from sqlalchemy import insert
@@ -11,12 +12,17 @@ class UserQuizAnswersRepository:
         self.session = session
 
     async def create_user_quiz_answer(
-        self, user_quiz_id: UUID, question_id: UUID, answer_id: UUID
+        self,
+        user_quiz_id: UUID,
+        attempt_time: datetime,
+        question_id: UUID,
+        answer_id: UUID,
     ) -> UserQuizAnswers:
         query = (
             insert(UserQuizAnswers)
             .values(
                 user_quiz_id=user_quiz_id,
+                attempt_time=attempt_time,
                 question_id=question_id,
                 answer_id=answer_id,
             )
@@ -1,10 +1,11 @@
+from typing import Sequence
 from uuid import UUID
 
-from sqlalchemy import and_, insert, update
+from sqlalchemy import RowMapping, and_, exists, insert, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
-from app.db.models import UserRequest
+from app.db.models import CompanyMember, User, UserRequest
 from app.schemas.user_request import UserRequestCreateScheme
 from app.utils.exceptions.user import UserRequestNotFoundException
 
@@ -37,10 +38,10 @@ class UserRequestRepository:
         limit: int,
         is_active: bool = True,
         **kwargs,
-    ) -> list[UserRequest]:
+    ) -> Sequence[RowMapping]:
         kwargs.update(is_active=is_active)
 
-        query = select(UserRequest).where(
+        query = select(*UserRequest.__table__.c).where(
             and_(
                 *(
                     getattr(UserRequest, attr) == value
@@ -52,7 +53,7 @@ class UserRequestRepository:
             page - 1 if page == 1 else (page - 1) * limit
         )
         res = await self.session.execute(query)
-        return res.scalars().all()
+        return res.mappings().all()
 
     async def create_user_request(
         self,
@@ -112,3 +113,52 @@ class UserRequestRepository:
         raise UserRequestNotFoundException(
             request_id=request_id, is_active=True
         )
+
+    async def get_company_user_requests(
+        self, company_id: UUID, request_ids: Sequence[UUID]
+    ) -> Sequence[RowMapping]:
+        """
+        Active requests of active users to the company among request_ids,
+        flagged when the user is already a company member.
+        """
+        is_member = exists().where(
+            CompanyMember.company_id == company_id,
+            CompanyMember.user_id == UserRequest.user_id,
+            CompanyMember.is_active == True,
+        )
+        query = (
+            select(
+                UserRequest.request_id,
+                UserRequest.user_id,
+                UserRequest.status,
+                is_member.label("is_member"),
+            )
+            .join(User, User.user_id == UserRequest.user_id)
+            .where(
+                and_(
+                    UserRequest.request_id.in_(request_ids),
+                    UserRequest.company_id == company_id,
+                    UserRequest.is_active == True,
+                    User.is_active == True,
+                )
+            )
+        )
+        result = await self.session.execute(query)
+        return result.mappings().all()
+
+    async def update_user_requests_status(
+        self, request_ids: Sequence[UUID], status: str
+    ) -> None:
+        if not request_ids:
+            return
+        query = (
+            update(UserRequest)
+            .where(
+                and_(
+                    UserRequest.request_id.in_(request_ids),
+                    UserRequest.is_active == True,
+                )
+            )
+            .values(status=status)
+        )
+        await self.session.execute(query)
@@ -2,11 +2,14 @@ from fastapi import APIRouter
 
 import app.routers.company_action
 import app.routers.user_action
+from app.core.settings import app_settings
 from app.routers import (
+    admin,
     analytics,
     company,
     company_action,
     health_check,
+    metrics,
     notification,
     quiz,
     user,
@@ -21,6 +24,14 @@ main_router = APIRouter()
 
 main_router.include_router(health_check.router)
 
+if app_settings.METRICS_ENABLED:
+    main_router.include_router(metrics.router, tags=["metrics"])
+
+if app_settings.PROFILING_ENABLED:
+    main_router.include_router(
+        admin.admin_router, prefix="/admin", tags=["admin"]
+    )
+
 # user routers
 user.user_router.include_router(
     user_action.user_action_router, prefix="/action"
@@ -0,0 +1,35 @@
+from typing import Annotated, Literal
+
+from fastapi import Depends, HTTPException
+from fastapi.responses import FileResponse
+from fastapi.routing import APIRouter
+
+from app.schemas.profiling import ListProfileSummaryScheme
+from app.services.auth import AdminAuthService
+from app.services.profiling import ProfilingService
+from app.utils.responses import FastJSONRoute
+from app.utils.services import get_profiling_service
+
+admin_router = APIRouter(
+    route_class=FastJSONRoute,
+    dependencies=[Depends(AdminAuthService.verify_admin_token)],
+)
+
+
+@admin_router.get("/profiles")
+async def get_profiles(
+    service: Annotated[ProfilingService, Depends(get_profiling_service)],
+) -> ListProfileSummaryScheme:
+    return ListProfileSummaryScheme(profiles=service.list_profiles())
+
+
+@admin_router.get("/profiles/{name}/{kind}")
+async def get_profile_file(
+    service: Annotated[ProfilingService, Depends(get_profiling_service)],
+    name: str,
+    kind: Literal["json", "prof", "folded"],
+) -> FileResponse:
+    path = service.get_profile_file(name=name, suffix=f".{kind}")
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, filename=path.name)
@@ -1,21 +1,35 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 
+from app.core.constants import (
+    LEADERBOARD_PAGE_LIMIT,
+    LEADERBOARD_PAGE_MAX_LIMIT,
+)
 from app.db.models import User
 from app.schemas.analytics import (
+    AnalyticsBatchMembersRequestScheme,
+    AnalyticsBatchQuizzesRequestScheme,
     AverageScoreScheme,
+    CompanyScoreDistributionScheme,
+    LeaderboardRankScheme,
+    LeaderboardScheme,
+    ListCompanyMemberQuizAverageScoresScheme,
     ListCompanyMemberUserQuizAverageScoreScheme,
+    ListQuizScoreDistributionScheme,
     ListUserQuizAverageScoreScheme,
     ListUserQuizLastPassingScheme,
+    QuizScoreDistributionScheme,
+    ScoreMatrixScheme,
 )
 from app.services.auth import GenericAuthService
 from app.services.user_quiz import UserQuizService
 from app.utils.generics import FromDate, ToDate
+from app.utils.responses import FastJSONRoute
 from app.utils.services import get_user_quiz_service
 
-quiz_analytics_router = APIRouter()
+quiz_analytics_router = APIRouter(route_class=FastJSONRoute)
 
 
 @quiz_analytics_router.get("/global_average_score")
@@ -88,3 +102,145 @@ async def get_company_members_with_last_pass_quiz_time(
         company_id=company_id, user=user
     )
     return members
+
+
+@quiz_analytics_router.get("/company/{company_id}/score_matrix")
+async def get_company_score_matrix(
+    service: Annotated[UserQuizService, Depends(get_user_quiz_service)],
+    user: Annotated[User, Depends(GenericAuthService.get_user_from_any_token)],
+    company_id: UUID,
+    from_date: FromDate,
+    to_date: ToDate,
+) -> ScoreMatrixScheme:
+    matrix = await service.get_company_score_matrix(
+        company_id=company_id, from_date=from_date, to_date=to_date, user=user
+    )
+    return matrix
+
+
+@quiz_analytics_router.get("/score_distribution_for_quiz/{quiz_id}")
+async def get_quiz_score_distribution(
+    service: Annotated[UserQuizService, Depends(get_user_quiz_service)],
+    user: Annotated[User, Depends(GenericAuthService.get_user_from_any_token)],
+    quiz_id: UUID,
+    from_date: FromDate,
+    to_date: ToDate,
+) -> QuizScoreDistributionScheme:
+    distribution = await service.get_quiz_score_distribution(
+        quiz_id=quiz_id, from_date=from_date, to_date=to_date, user=user
+    )
+    return distribution
+
+
+@quiz_analytics_router.get("/score_distribution_for_company/{company_id}")
+async def get_company_score_distribution(
+    service: Annotated[UserQuizService, Depends(get_user_quiz_service)],
+    user: Annotated[User, Depends(GenericAuthService.get_user_from_any_token)],
+    company_id: UUID,
+    from_date: FromDate,
+    to_date: ToDate,
+) -> CompanyScoreDistributionScheme:
+    distribution = await service.get_company_score_distribution(
+        company_id=company_id, from_date=from_date, to_date=to_date, user=user
+    )
+    return distribution
+
+
+@quiz_analytics_router.get("/leaderboard_for_company/{company_id}")
+async def get_company_leaderboard(
+    service: Annotated[UserQuizService, Depends(get_user_quiz_service)],
+    user: Annotated[User, Depends(GenericAuthService.get_user_from_any_token)],
+    company_id: UUID,
+    page: Annotated[int, Query(ge=1)] = 1,
+    limit: Annotated[
+        int, Query(ge=1, le=LEADERBOARD_PAGE_MAX_LIMIT)
+    ] = LEADERBOARD_PAGE_LIMIT,
+) -> LeaderboardScheme:
+    leaderboard = await service.get_company_leaderboard(
+        company_id=company_id, page=page, limit=limit, user=user
+    )
+    return leaderboard
+
+
+@quiz_analytics_router.get("/leaderboard_for_company/{company_id}/my_rank")
+async def get_my_company_leaderboard_rank(
+    service: Annotated[UserQuizService, Depends(get_user_quiz_service)],
+    user: Annotated[User, Depends(GenericAuthService.get_user_from_any_token)],
+    company_id: UUID,
+) -> LeaderboardRankScheme:
+    rank = await service.get_company_leaderboard_rank(
+        company_id=company_id, user=user
+    )
+    return rank
+
+
+@quiz_analytics_router.get("/leaderboard_for_quiz/{quiz_id}")
+async def get_quiz_leaderboard(
+    service: Annotated[UserQuizService, Depends(get_user_quiz_service)],
+    user: Annotated[User, Depends(GenericAuthService.get_user_from_any_token)],
+    quiz_id: UUID,
+    page: Annotated[int, Query(ge=1)] = 1,
+    limit: Annotated[
+        int, Query(ge=1, le=LEADERBOARD_PAGE_MAX_LIMIT)
+    ] = LEADERBOARD_PAGE_LIMIT,
+) -> LeaderboardScheme:
+    leaderboard = await service.get_quiz_leaderboard(
+        quiz_id=quiz_id, page=page, limit=limit, user=user
+    )
+    return leaderboard
+
+
+@quiz_analytics_router.get("/leaderboard_for_quiz/{quiz_id}/my_rank")
+async def get_my_quiz_leaderboard_rank(
+    service: Annotated[UserQuizService, Depends(get_user_quiz_service)],
+    user: Annotated[User, Depends(GenericAuthService.get_user_from_any_token)],
+    quiz_id: UUID,
+) -> LeaderboardRankScheme:
+    rank = await service.get_quiz_leaderboard_rank(quiz_id=quiz_id, user=user)
+    return rank
+
+
+@quiz_analytics_router.post("/batch/average_score_for_each_member_quiz")
+async def get_average_score_for_each_quiz_by_company_members(
+    service: Annotated[UserQuizService, Depends(get_user_quiz_service)],
+    user: Annotated[User, Depends(GenericAuthService.get_user_from_any_token)],
+    scheme: AnalyticsBatchMembersRequestScheme,
+    from_date: FromDate,
+    to_date: ToDate,
+) -> ListCompanyMemberQuizAverageScoresScheme:
+    members = await service.get_average_score_for_each_quiz_by_company_members(
+        member_ids=scheme.member_ids,
+        from_date=from_date,
+        to_date=to_date,
+        user=user,
+    )
+    return members
+
+
+@quiz_analytics_router.post("/batch/member_average_score")
+async def get_company_members_average_score(
+    service: Annotated[UserQuizService, Depends(get_user_quiz_service)],
+    user: Annotated[User, Depends(GenericAuthService.get_user_from_any_token)],
+    scheme: AnalyticsBatchMembersRequestScheme,
+) -> ListCompanyMemberUserQuizAverageScoreScheme:
+    members = await service.average_company_members_score(
+        member_ids=scheme.member_ids, user=user
+    )
+    return members
+
+
+@quiz_analytics_router.post("/batch/score_distribution_for_quiz")
+async def get_score_distribution_for_quizzes(
+    service: Annotated[UserQuizService, Depends(get_user_quiz_service)],
+    user: Annotated[User, Depends(GenericAuthService.get_user_from_any_token)],
+    scheme: AnalyticsBatchQuizzesRequestScheme,
+    from_date: FromDate,
+    to_date: ToDate,
+) -> ListQuizScoreDistributionScheme:
+    quizzes = await service.get_score_distribution_for_quizzes(
+        quiz_ids=scheme.quiz_ids,
+        from_date=from_date,
+        to_date=to_date,
+        user=user,
+    )
+    return quizzes
@@ -1,7 +1,7 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 
 from app.core.constants import COMPANIES_PAGE_LIMIT
 from app.db.models import User
@@ -13,9 +13,15 @@ from app.schemas.company import (
 )
 from app.services.auth import GenericAuthService
 from app.services.company import CompanyService
+from app.utils.conditional import (
+    PUBLIC_CACHE_CONTROL,
+    not_modified,
+    version_headers,
+)
+from app.utils.responses import FastJSONRoute, ModelJSONResponse
 from app.utils.services import get_company_service
 
-company_router = APIRouter()
+company_router = APIRouter(route_class=FastJSONRoute)
 
 
 @company_router.post("/", status_code=201)
@@ -37,7 +43,9 @@ async def list_companies(
     limit: int = COMPANIES_PAGE_LIMIT,
 ) -> CompanyListResponseScheme:
     companies = await service.get_all_companies(page=page, limit=limit)
-    return companies
+    return ModelJSONResponse(
+        companies, headers=version_headers(None, PUBLIC_CACHE_CONTROL)
+    )
 
 
 @company_router.get("/my_all")
@@ -71,11 +79,17 @@ async def change_visibility(
 
 @company_router.get("/{company_id}")
 async def get_company(
+    request: Request,
     company_id: UUID,
     service: Annotated[CompanyService, Depends(get_company_service)],
 ) -> CompanyDetailResponseScheme:
+    version = await service.get_company_version(company_id=company_id)
+    if response := not_modified(request, version, PUBLIC_CACHE_CONTROL):
+        return response
     company = await service.get_company_by_id(company_id=company_id)
-    return company
+    return ModelJSONResponse(
+        company, headers=version_headers(version, PUBLIC_CACHE_CONTROL)
+    )
 
 
 @company_router.patch("/{company_id}")
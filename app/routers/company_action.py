@@ -9,6 +9,9 @@ from app.core.constants import (
 )
 from app.db.models import CompanyRequestStatus, CompanyRole, User
 from app.schemas.company_member import (
+    CompanyBulkActionResultScheme,
+    CompanyBulkUserRequestsRequestScheme,
+    CompanyBulkUsersRequestScheme,
     CompanyMemberDetailResponseScheme,
     ListNestedCompanyMemberDetailResponseScheme,
 )
@@ -19,9 +22,10 @@ from app.schemas.company_request import (
 from app.schemas.user_request import UserRequestDetailResponseScheme
 from app.services.auth import GenericAuthService
 from app.services.company_action import CompanyActionService
+from app.utils.responses import FastJSONRoute
 from app.utils.services import get_company_action_service
 
-company_action_router = APIRouter()
+company_action_router = APIRouter(route_class=FastJSONRoute)
 
 
 @company_action_router.post("/{company_id}/invite/{user_id}")
@@ -165,3 +169,54 @@ async def appoint_administrator(
         owner=owner,
     )
     return member
+
+
+@company_action_router.post("/{company_id}/bulk/invite")
+async def company_users_invite(
+    service: Annotated[
+        CompanyActionService, Depends(get_company_action_service)
+    ],
+    owner: Annotated[
+        User, Depends(GenericAuthService.get_user_from_any_token)
+    ],
+    company_id: UUID,
+    scheme: CompanyBulkUsersRequestScheme,
+) -> CompanyBulkActionResultScheme:
+    result = await service.create_company_requests(
+        user_ids=scheme.user_ids, company_id=company_id, owner=owner
+    )
+    return result
+
+
+@company_action_router.post("/{company_id}/bulk/confirm_user_requests")
+async def confirm_user_requests(
+    service: Annotated[
+        CompanyActionService, Depends(get_company_action_service)
+    ],
+    owner: Annotated[
+        User, Depends(GenericAuthService.get_user_from_any_token)
+    ],
+    company_id: UUID,
+    scheme: CompanyBulkUserRequestsRequestScheme,
+) -> CompanyBulkActionResultScheme:
+    result = await service.confirm_user_requests(
+        request_ids=scheme.request_ids, company_id=company_id, owner=owner
+    )
+    return result
+
+
+@company_action_router.post("/{company_id}/bulk/remove")
+async def company_remove_users(
+    service: Annotated[
+        CompanyActionService, Depends(get_company_action_service)
+    ],
+    owner: Annotated[
+        User, Depends(GenericAuthService.get_user_from_any_token)
+    ],
+    company_id: UUID,
+    scheme: CompanyBulkUsersRequestScheme,
+) -> CompanyBulkActionResultScheme:
+    result = await service.remove_users_from_company(
+        user_ids=scheme.user_ids, company_id=company_id, owner=owner
+    )
+    return result
@@ -1,8 +1,36 @@
+from typing import Annotated
+
+from fastapi import Depends, Request
 from fastapi.routing import APIRouter
 
-router = APIRouter()
+from app.schemas.health import LivenessScheme, ReadinessScheme
+from app.services.health import HealthService
+from app.utils.responses import FastJSONRoute, ModelJSONResponse
+from app.utils.services import get_health_service
+
+router = APIRouter(route_class=FastJSONRoute)
 
 
 @router.get("/")
 def health_check():
     return {"status_code": 200, "detail": "ok", "result": "working"}
+
+
+@router.get("/health/live")
+async def liveness(
+    service: Annotated[HealthService, Depends(get_health_service)],
+) -> LivenessScheme:
+    return service.get_liveness()
+
+
+@router.get("/health/ready", responses={503: {"model": ReadinessScheme}})
+async def readiness(
+    request: Request,
+    service: Annotated[HealthService, Depends(get_health_service)],
+) -> ReadinessScheme:
+    readiness = await service.get_readiness(
+        started=getattr(request.app.state, "ready", False)
+    )
+    if not readiness.ready:
+        return ModelJSONResponse(readiness, status_code=503)
+    return readiness
@@ -0,0 +1,17 @@
+from fastapi.responses import PlainTextResponse
+from fastapi.routing import APIRouter
+
+from app.db.postgres import get_engine
+from app.utils.metrics import DB_POOL_CHECKED_OUT, get_metrics_exporter, render
+from app.utils.responses import FastJSONRoute
+
+router = APIRouter(route_class=FastJSONRoute)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    DB_POOL_CHECKED_OUT.set(get_engine().pool.checkedout())
+    return PlainTextResponse(
+        render(get_metrics_exporter().collect()),
+        media_type="text/plain; version=0.0.4",
+    )
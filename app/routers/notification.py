@@ -1,18 +1,31 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 
+from app.core.constants import (
+    NOTIFICATIONS_PAGE_LIMIT,
+    NOTIFICATIONS_PAGE_MAX_LIMIT,
+)
 from app.db.models import User
 from app.schemas.notification import (
     ListNotificationsDetailScheme,
     NotificationDetailScheme,
+    NotificationFeedScheme,
+    NotificationsMarkedAsReadScheme,
+    NotificationUnreadCountScheme,
 )
 from app.services.auth import GenericAuthService
 from app.services.notification import NotificationSrvice
+from app.services.notification_stream import (
+    NotificationBroker,
+    get_notification_broker,
+)
+from app.utils.responses import FastJSONRoute
 from app.utils.services import get_notification_service
 
-notification_router = APIRouter()
+notification_router = APIRouter(route_class=FastJSONRoute)
 
 
 @notification_router.get("/my_notifications")
@@ -34,3 +47,56 @@ async def mark_as_read(
         notification_id=notification_id, user=user
     )
     return notification
+
+
+@notification_router.get("/feed")
+async def get_my_notifications_feed(
+    service: Annotated[NotificationSrvice, Depends(get_notification_service)],
+    user: Annotated[User, Depends(GenericAuthService.get_user_from_any_token)],
+    cursor: str | None = None,
+    unread: bool = False,
+    limit: Annotated[
+        int, Query(ge=1, le=NOTIFICATIONS_PAGE_MAX_LIMIT)
+    ] = NOTIFICATIONS_PAGE_LIMIT,
+) -> NotificationFeedScheme:
+    feed = await service.get_user_notifications_feed(
+        user=user, limit=limit, cursor=cursor, unread=unread
+    )
+    return feed
+
+
+@notification_router.get("/unread_count")
+async def get_my_unread_count(
+    service: Annotated[NotificationSrvice, Depends(get_notification_service)],
+    user: Annotated[User, Depends(GenericAuthService.get_user_from_any_token)],
+) -> NotificationUnreadCountScheme:
+    count = await service.get_unread_notifications_count(user=user)
+    return count
+
+
+@notification_router.post("/mark_all_as_read")
+async def mark_all_as_read(
+    service: Annotated[NotificationSrvice, Depends(get_notification_service)],
+    user: Annotated[User, Depends(GenericAuthService.get_user_from_any_token)],
+) -> NotificationsMarkedAsReadScheme:
+    marked = await service.mark_all_notifications_as_read(user=user)
+    return marked
+
+
+@notification_router.get(
+    "/stream",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}}},
+)
+async def stream_my_notifications(
+    broker: Annotated[NotificationBroker, Depends(get_notification_broker)],
+    user: Annotated[User, Depends(GenericAuthService.get_user_from_any_token)],
+) -> StreamingResponse:
+    """
+    Push new notifications as server-sent events, instead of polling.
+    """
+    return StreamingResponse(
+        broker.stream(user_id=user.user_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
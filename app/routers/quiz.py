@@ -1,7 +1,7 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from starlette.responses import Response, StreamingResponse
 
 from app.core.constants import QUIZ_PAGE_LIMIT
@@ -13,6 +13,7 @@ from app.schemas.quiz import (
     ListQuizDetailScheme,
     QuestionCreateScheme,
     QuestionDetailScheme,
+    QuizBulkCreateResultScheme,
     QuizCreateRequestScheme,
     QuizDetailScheme,
 )
@@ -23,11 +24,14 @@ from app.schemas.user_quiz import (
 from app.services.auth import GenericAuthService
 from app.services.quiz import QuizService
 from app.services.user_quiz import UserQuizService
+from app.utils.conditional import Version, not_modified, version_headers
 from app.utils.generics import ResponseFileType
+from app.utils.responses import FastJSONRoute, ModelJSONResponse
 from app.utils.services import get_quiz_service, get_user_quiz_service
+from app.utils.streaming import NDJSON_MEDIA_TYPES, iter_validated
 
-quiz_router = APIRouter()
-user_quiz_router = APIRouter()
+quiz_router = APIRouter(route_class=FastJSONRoute)
+user_quiz_router = APIRouter(route_class=FastJSONRoute)
 
 
 @quiz_router.post("/{company_id}")
@@ -45,27 +49,80 @@ async def create_quiz(
     return quiz
 
 
+_quizzes_body_schema = {
+    "type": "array",
+    "items": {"$ref": "#/components/schemas/QuizCreateRequestScheme"},
+}
+
+
+@quiz_router.post(
+    "/{company_id}/bulk",
+    status_code=201,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": _quizzes_body_schema},
+                NDJSON_MEDIA_TYPES[0]: {
+                    "schema": {
+                        "$ref": "#/components/schemas/QuizCreateRequestScheme"
+                    }
+                },
+            },
+        }
+    },
+)
+async def bulk_create_quizzes(
+    service: Annotated[QuizService, Depends(get_quiz_service)],
+    request: Request,
+    company_id: UUID,
+    user: Annotated[User, Depends(GenericAuthService.get_user_from_any_token)],
+) -> QuizBulkCreateResultScheme:
+    """
+    Import a JSON array or NDJSON stream of quizzes in one transaction.
+    """
+    schemes = iter_validated(
+        request.stream(),
+        QuizCreateRequestScheme,
+        media_type=request.headers.get("content-type", ""),
+    )
+    result = await service.bulk_create_quizzes(
+        schemes=schemes, company_id=company_id, user=user
+    )
+    return result
+
+
 @quiz_router.get("/all/{company_id}")
 async def get_all_company_quizzes(
     service: Annotated[QuizService, Depends(get_quiz_service)],
+    request: Request,
     company_id: UUID,
     page: int = 1,
     limit: int = QUIZ_PAGE_LIMIT,
 ) -> ListQuizDetailScheme:
+    version = await service.get_all_company_quizzes_version(
+        company_id=company_id, page=page, limit=limit
+    )
+    if response := not_modified(request, version):
+        return response
     quiz = await service.get_all_company_quizzes(
         company_id=company_id, page=page, limit=limit
     )
-    return quiz
+    return ModelJSONResponse(quiz, headers=version_headers(version))
 
 
 @quiz_router.get("/{quiz_id}")
 async def get_quiz(
     service: Annotated[QuizService, Depends(get_quiz_service)],
+    request: Request,
     quiz_id: UUID,
     user: Annotated[User, Depends(GenericAuthService.get_user_from_any_token)],
 ) -> QuizDetailScheme:
+    version = await service.get_quiz_version(quiz_id=quiz_id, user=user)
+    if response := not_modified(request, version):
+        return response
     quiz = await service.get_quiz(quiz_id=quiz_id, user=user)
-    return quiz
+    return ModelJSONResponse(quiz, headers=version_headers(version))
 
 
 @quiz_router.delete("/{quiz_id}")
@@ -175,14 +232,23 @@ async def average_user_score(
 async def get_all_user_quizzes(
     service: Annotated[UserQuizService, Depends(get_user_quiz_service)],
     user: Annotated[User, Depends(GenericAuthService.get_user_from_any_token)],
+    request: Request,
     response_file_type: ResponseFileType,
 ) -> Response:
-    quizzes = await service.get_all_user_quizzes(user=user)
+    token = await service.get_user_answers_version(user=user)
+    version = Version(token, response_file_type)
+    if response := not_modified(request, version):
+        return response
+    quizzes = await service.get_all_user_quizzes(user=user, version=token)
     content = service.export_user_quizzes(
         scheme=quizzes, file_type=response_file_type
     )
     media_type = service.get_media_type(file_type=response_file_type)
-    return StreamingResponse(content=content, media_type=media_type)
+    return StreamingResponse(
+        content=service.stream_export(content),
+        media_type=media_type,
+        headers=version_headers(version),
+    )
 
 
 @user_quiz_router.get("/member/{company_member_id}")
@@ -190,16 +256,27 @@ async def get_company_member_quizzes(
     service: Annotated[UserQuizService, Depends(get_user_quiz_service)],
     user: Annotated[User, Depends(GenericAuthService.get_user_from_any_token)],
     member_id: UUID,
+    request: Request,
     response_file_type: ResponseFileType,
 ) -> Response:
-    quizzes = await service.get_company_member_quizzes(
+    token = await service.get_company_member_answers_version(
         member_id=member_id, user=user
     )
+    version = Version(token, response_file_type)
+    if response := not_modified(request, version):
+        return response
+    quizzes = await service.get_company_member_quizzes(
+        member_id=member_id, user=user, version=token
+    )
     content = service.export_user_quizzes(
         scheme=quizzes, file_type=response_file_type
     )
     media_type = service.get_media_type(file_type=response_file_type)
-    return StreamingResponse(content=content, media_type=media_type)
+    return StreamingResponse(
+        content=service.stream_export(content),
+        media_type=media_type,
+        headers=version_headers(version),
+    )
 
 
 @user_quiz_router.get("/member_all/{company_id}")
@@ -207,16 +284,27 @@ async def get_all_company_members_quizzes(
     service: Annotated[UserQuizService, Depends(get_user_quiz_service)],
     user: Annotated[User, Depends(GenericAuthService.get_user_from_any_token)],
     company_id: UUID,
+    request: Request,
     response_file_type: ResponseFileType,
 ) -> Response:
-    quizzes = await service.get_all_company_members_quizzes(
+    token = await service.get_company_members_answers_version(
         company_id=company_id, user=user
     )
+    version = Version(token, response_file_type)
+    if response := not_modified(request, version):
+        return response
+    quizzes = await service.get_all_company_members_quizzes(
+        company_id=company_id, user=user, version=token
+    )
     content: str = service.export_user_quizzes(
         scheme=quizzes, file_type=response_file_type
     )
     media_type = service.get_media_type(file_type=response_file_type)
-    return StreamingResponse(content=content, media_type=media_type)
+    return StreamingResponse(
+        content=service.stream_export(content),
+        media_type=media_type,
+        headers=version_headers(version),
+    )
 
 
 @user_quiz_router.get("/quiz_all/{quiz_id}")
@@ -224,11 +312,22 @@ async def get_all_quiz_answers(
     service: Annotated[UserQuizService, Depends(get_user_quiz_service)],
     user: Annotated[User, Depends(GenericAuthService.get_user_from_any_token)],
     quiz_id: UUID,
+    request: Request,
     response_file_type: ResponseFileType,
 ) -> Response:
-    quizzes = await service.get_all_quiz_answers(quiz_id=quiz_id, user=user)
+    token = await service.get_quiz_answers_version(quiz_id=quiz_id, user=user)
+    version = Version(token, response_file_type)
+    if response := not_modified(request, version):
+        return response
+    quizzes = await service.get_all_quiz_answers(
+        quiz_id=quiz_id, user=user, version=token
+    )
     content = service.export_user_quizzes(
         scheme=quizzes, file_type=response_file_type
     )
     media_type = service.get_media_type(file_type=response_file_type)
-    return StreamingResponse(content=content, media_type=media_type)
+    return StreamingResponse(
+        content=service.stream_export(content),
+        media_type=media_type,
+        headers=version_headers(version),
+    )
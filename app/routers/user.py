@@ -1,7 +1,7 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 
 from app.core.constants import USERS_PAGE_LIMIT
 from app.db.models import User
@@ -16,9 +16,11 @@ from app.services.auth import GenericAuthService, JWTService
 from app.services.user import (
     UserService,
 )
+from app.utils.conditional import not_modified, version_headers
+from app.utils.responses import FastJSONRoute, ModelJSONResponse
 from app.utils.services import get_user_service
 
-user_router = APIRouter()
+user_router = APIRouter(route_class=FastJSONRoute)
 
 
 @user_router.get("/token")
@@ -47,10 +49,18 @@ async def get_user_me(
 
 @user_router.get("/{user_id}")
 async def get_user(
-    user_id: UUID, service: Annotated[UserService, Depends(get_user_service)]
+    request: Request,
+    user_id: UUID,
+    service: Annotated[UserService, Depends(get_user_service)],
 ) -> UserSchemeDetailResponseScheme:
+    version = await service.get_user_version(user_id=user_id)
+    if response := not_modified(request, version):
+        return response
     user = await service.get_user_by_id(user_id=user_id)
-    return UserSchemeDetailResponseScheme.from_orm(user)
+    return ModelJSONResponse(
+        UserSchemeDetailResponseScheme.from_orm(user),
+        headers=version_headers(version),
+    )
 
 
 @user_router.patch("/")
@@ -16,9 +16,10 @@ from app.schemas.user_request import (
 )
 from app.services.auth import GenericAuthService
 from app.services.user_action import UserActionService
+from app.utils.responses import FastJSONRoute
 from app.utils.services import get_user_action_service
 
-user_action_router = APIRouter()
+user_action_router = APIRouter(route_class=FastJSONRoute)
 
 
 @user_action_router.post("/requests/{company_id}")
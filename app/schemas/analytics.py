@@ -2,7 +2,9 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, Field, field_validator
+
+from app.core.constants import ANALYTICS_BATCH_LIMIT
 
 
 class AverageScoreScheme(BaseModel):
@@ -51,3 +53,76 @@ class CompanyMemberLastPassingQuizScheme(BaseModel):
 
 class ListCompanyMemberLastPassingQuizScheme(BaseModel):
     members: list[CompanyMemberLastPassingQuizScheme]
+
+
+class ScoreBucketScheme(BaseModel):
+    score: int
+    count: int
+
+
+class ScoreDistributionScheme(BaseModel):
+    attempts: int
+    median: Optional[float]
+    percentiles: dict[str, Optional[float]]
+    histogram: list[ScoreBucketScheme]
+
+
+class QuizScoreDistributionScheme(ScoreDistributionScheme):
+    quiz_id: UUID
+
+
+class CompanyScoreDistributionScheme(ScoreDistributionScheme):
+    company_id: UUID
+
+
+class LeaderboardEntryScheme(BaseModel):
+    rank: int
+    user_id: UUID
+    average_score: float
+
+
+class LeaderboardScheme(BaseModel):
+    total: int
+    entries: list[LeaderboardEntryScheme]
+
+
+class LeaderboardRankScheme(BaseModel):
+    total: int
+    entry: Optional[LeaderboardEntryScheme]
+
+
+class ScoreMatrixScheme(BaseModel):
+    """
+    Average scores of the members (rows) by quizzes (columns), null for
+    the quizzes not taken.
+    """
+
+    company_id: UUID
+    member_ids: list[UUID]
+    quiz_ids: list[UUID]
+    scores: list[list[Optional[float]]]
+
+
+class AnalyticsBatchMembersRequestScheme(BaseModel):
+    member_ids: list[UUID] = Field(
+        min_length=1, max_length=ANALYTICS_BATCH_LIMIT
+    )
+
+
+class AnalyticsBatchQuizzesRequestScheme(BaseModel):
+    quiz_ids: list[UUID] = Field(
+        min_length=1, max_length=ANALYTICS_BATCH_LIMIT
+    )
+
+
+class CompanyMemberQuizAverageScoresScheme(BaseModel):
+    member_id: UUID
+    quizzes: list[UserQuizAverageScoreScheme]
+
+
+class ListCompanyMemberQuizAverageScoresScheme(BaseModel):
+    members: list[CompanyMemberQuizAverageScoresScheme]
+
+
+class ListQuizScoreDistributionScheme(BaseModel):
+    quizzes: list[QuizScoreDistributionScheme]
@@ -1,7 +1,10 @@
+import enum
+from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
+from app.core.constants import COMPANY_BULK_ACTION_LIMIT
 from app.schemas.company import (
     CompanyDetailResponseScheme,
 )
@@ -37,3 +40,36 @@ class NestedCompanyMemberDetailResponseScheme(
 
 class ListNestedCompanyMemberDetailResponseScheme(BaseModel):
     members: list[NestedCompanyMemberDetailResponseScheme]
+
+
+class CompanyBulkUsersRequestScheme(BaseModel):
+    user_ids: list[UUID] = Field(
+        min_length=1, max_length=COMPANY_BULK_ACTION_LIMIT
+    )
+
+
+class CompanyBulkUserRequestsRequestScheme(BaseModel):
+    request_ids: list[UUID] = Field(
+        min_length=1, max_length=COMPANY_BULK_ACTION_LIMIT
+    )
+
+
+class CompanyBulkActionStatusEnum(str, enum.Enum):
+    invited = "invited"
+    accepted = "accepted"
+    removed = "removed"
+    not_found = "not_found"
+    not_pending = "not_pending"
+    already_invited = "already_invited"
+    already_member = "already_member"
+    not_member = "not_member"
+
+
+class CompanyBulkActionItemScheme(BaseModel):
+    user_id: Optional[UUID] = None
+    request_id: Optional[UUID] = None
+    status: CompanyBulkActionStatusEnum
+
+
+class CompanyBulkActionResultScheme(BaseModel):
+    results: list[CompanyBulkActionItemScheme]
@@ -0,0 +1,31 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class LivenessScheme(BaseModel):
+    status: str = "alive"
+    event_loop_lag_ms: float
+
+
+class ProbeScheme(BaseModel):
+    name: str
+    ok: bool
+    latency_ms: Optional[float] = None
+    error: Optional[str] = None
+
+
+class PoolScheme(BaseModel):
+    size: int
+    max_overflow: int
+    checked_out: int
+    overflow: int
+    saturation: float
+
+
+class ReadinessScheme(BaseModel):
+    ready: bool
+    probes: list[ProbeScheme]
+    pool: Optional[PoolScheme] = None
+    event_loop_lag_ms: float
+    checked_at: float
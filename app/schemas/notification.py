@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Optional
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict
@@ -23,3 +24,16 @@ class ListNotificationsDetailScheme(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
     notifications: list[NotificationDetailScheme]
+
+
+class NotificationFeedScheme(BaseModel):
+    notifications: list[NotificationDetailScheme]
+    next_cursor: Optional[str] = None
+
+
+class NotificationUnreadCountScheme(BaseModel):
+    unread: int
+
+
+class NotificationsMarkedAsReadScheme(BaseModel):
+    marked: int
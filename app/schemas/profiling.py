@@ -0,0 +1,28 @@
+from typing import Any, Optional
+
+from pydantic import BaseModel
+
+
+class TimeBreakdownScheme(BaseModel):
+    total_ms: float
+    db_ms: float
+    redis_ms: float
+    serialization_ms: float
+    python_ms: float
+
+
+class ProfileSummaryScheme(BaseModel):
+    name: Optional[str] = None
+    method: str
+    route: str
+    path: str
+    status: int
+    reason: str
+    queries: int
+    time: TimeBreakdownScheme
+    truncated: bool = False
+    top_functions: list[dict[str, Any]] = []
+
+
+class ListProfileSummaryScheme(BaseModel):
+    profiles: list[ProfileSummaryScheme]
@@ -69,3 +69,10 @@ class ListQuizDetailScheme(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
     quizzes: List[QuizDetailScheme]
+
+
+class QuizBulkCreateResultScheme(BaseModel):
+    quizzes: int
+    questions: int
+    answers: int
+    quiz_ids: List[UUID]
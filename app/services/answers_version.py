@@ -0,0 +1,36 @@
+"""
+Version tokens of the user quiz answers of a user, a quiz and a company.
+
+Exports of the answers are cached and conditionally requested by the
+token. Tokens are dropped once a change of the answers is committed, the
+next read sets a new one.
+"""
+
+from typing import Iterable
+from uuid import UUID
+
+from app.core.constants import USER_QUIZ_ANSWERS_EXPIRE_TIME
+from app.services.redis import RedisService
+
+
+def user_answers_version_key(user_id: UUID | str) -> str:
+    return f"answers_version:user:{user_id}"
+
+
+def quiz_answers_version_key(quiz_id: UUID | str) -> str:
+    return f"answers_version:quiz:{quiz_id}"
+
+
+def company_answers_version_key(company_id: UUID | str) -> str:
+    return f"answers_version:company:{company_id}"
+
+
+async def get_answers_version(key: str) -> str:
+    # exports cached by the token expire with it
+    return await RedisService().get_version(
+        key, expire=USER_QUIZ_ANSWERS_EXPIRE_TIME
+    )
+
+
+async def drop_answers_versions(keys: Iterable[str]) -> None:
+    await RedisService().delete_values(list(keys))
@@ -1,11 +1,20 @@
 import datetime
+import secrets
 
-from fastapi import Depends
-from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from fastapi import Depends, HTTPException, Security
+from fastapi.security import (
+    APIKeyHeader,
+    HTTPAuthorizationCredentials,
+    HTTPBearer,
+)
 from jose import JWTError, jwt
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.settings import app_settings, auth0_config, gwt_config
+from app.core.settings import (
+    get_app_settings,
+    get_auth0_config,
+    get_gwt_config,
+)
 from app.db.models import User
 from app.db.postgres import get_async_session
 from app.repositories.user import UserRepository
@@ -25,7 +34,7 @@ class JWTService:
     @staticmethod
     def get_expires_delta() -> datetime.timedelta:
         return datetime.timedelta(
-            minutes=gwt_config.GWT_ACCESS_TOKEN_EXPIRE_MINUTES
+            minutes=get_gwt_config().GWT_ACCESS_TOKEN_EXPIRE_MINUTES
         )
 
     @classmethod
@@ -40,13 +49,13 @@ class JWTService:
             expire = datetime.datetime.now(
                 datetime.timezone.utc
             ) + datetime.timedelta(
-                minutes=gwt_config.GWT_ACCESS_TOKEN_EXPIRE_MINUTES
+                minutes=get_gwt_config().GWT_ACCESS_TOKEN_EXPIRE_MINUTES
             )
         to_encode.update({"exp": expire})
         encoded_jwt = jwt.encode(
             to_encode,
-            app_settings.SECRET_KEY,
-            algorithm=gwt_config.GWT_ALGORITHMS,
+            get_app_settings().SECRET_KEY,
+            algorithm=get_gwt_config().GWT_ALGORITHMS,
         )
         return encoded_jwt
 
@@ -58,8 +67,8 @@ class JWTService:
         try:
             payload = jwt.decode(
                 token,
-                app_settings.SECRET_KEY,
-                algorithms=[gwt_config.GWT_ALGORITHMS],
+                get_app_settings().SECRET_KEY,
+                algorithms=[get_gwt_config().GWT_ALGORITHMS],
             )
         except JWTError:
             pass
@@ -77,9 +86,9 @@ class Auth0Service:
         try:
             payload = jwt.decode(
                 token,
-                auth0_config.AUTH0_API_SECRET,
-                algorithms=[auth0_config.AUTH0_ALGORITHMS],
-                audience=auth0_config.AUTH0_API_AUDIENCE,
+                get_auth0_config().AUTH0_API_SECRET,
+                algorithms=[get_auth0_config().AUTH0_ALGORITHMS],
+                audience=get_auth0_config().AUTH0_API_AUDIENCE,
             )
         except JWTError:
             pass
@@ -124,3 +133,20 @@ class GenericAuthService:
         #     else:
         #         raise DecodeUserTokenError()
         #     return user
+
+
+class AdminAuthService:
+    @classmethod
+    def verify_admin_token(
+        cls,
+        token: str | None = Security(
+            APIKeyHeader(name="X-Admin-Token", auto_error=False)
+        ),
+    ) -> None:
+        admin_token = get_app_settings().ADMIN_TOKEN
+        if (
+            not admin_token
+            or token is None
+            or not secrets.compare_digest(token, admin_token)
+        ):
+            raise HTTPException(status_code=403, detail="Not authorized")
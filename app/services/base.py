@@ -3,6 +3,7 @@ from logging import getLogger
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db.postgres import discard_after_commit, run_after_commit
 from app.utils.validators import BaseValidator
 
 logger = getLogger(__name__)
@@ -30,11 +31,13 @@ class Service(ABC):
                 for query in self.queries:
                     await self.session.execute(query)
             await self.session.commit()
+            await run_after_commit(self.session)
         else:
             await self.session.rollback()
+            discard_after_commit(self.session)
             logger.error(f"Error occurred {exc_type}, {exc_val}, {exc_tb}")
-            raise exc_type
-        return False  # mb True?
+        # the original exception propagates, with its arguments
+        return False
 
     async def _add_query(self, query):
         self._queries.append(query)
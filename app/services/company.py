@@ -12,6 +12,8 @@ from app.schemas.company import (
     CompanyUpdateRequestScheme,
 )
 from app.services.base import Service
+from app.utils.conditional import Version
+from app.utils.schemas import list_adapter
 
 
 class CompanyService(Service):
@@ -56,10 +58,9 @@ class CompanyService(Service):
                 page=page, limit=limit
             )
         )
-        companies = [
-            CompanyDetailResponseScheme.from_orm(company)
-            for company in raw_companies
-        ]
+        companies = list_adapter(CompanyDetailResponseScheme).validate_python(
+            raw_companies
+        )
         return CompanyListResponseScheme(companies=companies)
 
     async def get_user_self_companies(
@@ -70,10 +71,9 @@ class CompanyService(Service):
                 page=page, limit=limit, owner_id=user.user_id, visibility=None
             )
         )
-        companies = [
-            CompanyDetailResponseScheme.from_orm(company)
-            for company in raw_companies
-        ]
+        companies = list_adapter(CompanyDetailResponseScheme).validate_python(
+            raw_companies
+        )
         return CompanyListResponseScheme(companies=companies)
 
     async def change_user_self_company_visibility(
@@ -85,6 +85,14 @@ class CompanyService(Service):
         )
         return CompanyDetailResponseScheme.from_orm(company)
 
+    async def get_company_version(self, company_id: UUID) -> Version | None:
+        updated_at = await self.company_repository.get_company_updated_at(
+            company_id=company_id
+        )
+        if updated_at is None:
+            return None
+        return Version(company_id, updated_at, last_modified=updated_at)
+
     async def get_company_by_id(
         self, company_id: UUID
     ) -> CompanyDetailResponseScheme:
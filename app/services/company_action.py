@@ -1,3 +1,4 @@
+from typing import Sequence
 from uuid import UUID
 
 from app.db.models import (
@@ -10,6 +11,9 @@ from app.repositories.company_member import CompanyMemberRepository
 from app.repositories.company_request import CompanyRequestRepository
 from app.repositories.user_request import UserRequestRepository
 from app.schemas.company_member import (
+    CompanyBulkActionItemScheme,
+    CompanyBulkActionResultScheme,
+    CompanyBulkActionStatusEnum,
     CompanyMemberDetailResponseScheme,
     ListNestedCompanyMemberDetailResponseScheme,
     NestedCompanyMemberDetailResponseScheme,
@@ -21,6 +25,7 @@ from app.schemas.company_request import (
 )
 from app.schemas.user_request import UserRequestDetailResponseScheme
 from app.services.base import Service
+from app.utils.schemas import list_adapter
 from app.utils.validators.company import CompanyValidator
 
 
@@ -99,10 +104,9 @@ class CompanyActionService(Service):
         raw_user_requests = await self.user_request_repository.get_user_requests_list_by_attributes(
             page=page, limit=limit, status=status, company_id=company_id
         )
-        requests = [
-            CompanyRequestDetailResponseScheme.from_orm(request)
-            for request in raw_user_requests
-        ]
+        requests = list_adapter(
+            CompanyRequestDetailResponseScheme
+        ).validate_python(raw_user_requests)
         return CompanyRequestListDetailResponseScheme(requests=requests)
 
     @validator.validate_user_request_by_request_id
@@ -145,3 +149,111 @@ class CompanyActionService(Service):
             company_id=company_id, user_id=user_id, role=admin_role
         )
         return CompanyMemberDetailResponseScheme.from_orm(raw_member)
+
+    @validator.validate_company_id_by_owner
+    async def create_company_requests(
+        self, user_ids: Sequence[UUID], company_id: UUID, owner: User
+    ) -> CompanyBulkActionResultScheme:
+        user_ids = list(dict.fromkeys(user_ids))
+        rows = await self.company_request_repository.get_invite_candidates(
+            company_id=company_id, user_ids=user_ids
+        )
+        candidates = {row["user_id"]: row for row in rows}
+        statuses = {}
+        for user_id in user_ids:
+            candidate = candidates.get(user_id)
+            if candidate is None:
+                status = CompanyBulkActionStatusEnum.not_found
+            elif candidate["is_member"] or user_id == owner.user_id:
+                status = CompanyBulkActionStatusEnum.already_member
+            elif candidate["is_invited"]:
+                status = CompanyBulkActionStatusEnum.already_invited
+            else:
+                status = CompanyBulkActionStatusEnum.invited
+            statuses[user_id] = status
+
+        company_requests = (
+            await self.company_request_repository.create_company_requests(
+                company_id=company_id,
+                user_ids=[
+                    user_id
+                    for user_id, status in statuses.items()
+                    if status == CompanyBulkActionStatusEnum.invited
+                ],
+            )
+        )
+        request_ids = {r.user_id: r.request_id for r in company_requests}
+        results = [
+            CompanyBulkActionItemScheme(
+                user_id=user_id,
+                request_id=request_ids.get(user_id),
+                status=status,
+            )
+            for user_id, status in statuses.items()
+        ]
+        return CompanyBulkActionResultScheme(results=results)
+
+    @validator.validate_company_id_by_owner
+    async def confirm_user_requests(
+        self, request_ids: Sequence[UUID], company_id: UUID, owner: User
+    ) -> CompanyBulkActionResultScheme:
+        request_ids = list(dict.fromkeys(request_ids))
+        rows = await self.user_request_repository.get_company_user_requests(
+            company_id=company_id, request_ids=request_ids
+        )
+        user_requests = {row["request_id"]: row for row in rows}
+        results = []
+        accepted_users = set()
+        for request_id in request_ids:
+            user_request = user_requests.get(request_id)
+            user_id = user_request and user_request["user_id"]
+            if user_request is None or user_id == owner.user_id:
+                status = CompanyBulkActionStatusEnum.not_found
+            elif user_request["status"] != UserRequestStatus.pending:
+                status = CompanyBulkActionStatusEnum.not_pending
+            elif user_request["is_member"] or user_id in accepted_users:
+                status = CompanyBulkActionStatusEnum.already_member
+            else:
+                status = CompanyBulkActionStatusEnum.accepted
+                accepted_users.add(user_id)
+            results.append(
+                CompanyBulkActionItemScheme(
+                    user_id=user_id, request_id=request_id, status=status
+                )
+            )
+
+        await self.user_request_repository.update_user_requests_status(
+            request_ids=[
+                r.request_id
+                for r in results
+                if r.status == CompanyBulkActionStatusEnum.accepted
+            ],
+            status=UserRequestStatus.accepted.value,
+        )
+        await self.company_member_repository.add_users_to_company(
+            company_id=company_id, user_ids=list(accepted_users)
+        )
+        return CompanyBulkActionResultScheme(results=results)
+
+    @validator.validate_company_id_by_owner
+    async def remove_users_from_company(
+        self, user_ids: Sequence[UUID], company_id: UUID, owner: User
+    ) -> CompanyBulkActionResultScheme:
+        user_ids = list(dict.fromkeys(user_ids))
+        removed = set(
+            await self.company_member_repository.remove_users_from_company(
+                company_id=company_id, user_ids=user_ids
+            )
+        )
+        results = [
+            CompanyBulkActionItemScheme(
+                user_id=user_id,
+                status=(
+                    CompanyBulkActionStatusEnum.removed
+                    if user_id in removed
+                    else CompanyBulkActionStatusEnum.not_member
+                ),
+            )
+            for user_id in user_ids
+        ]
+        return CompanyBulkActionResultScheme(results=results)
@@ -0,0 +1,188 @@
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+from redis.asyncio import Redis
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.constants import (
+    EVENT_LOOP_MONITOR_INTERVAL,
+    HEALTH_CACHE_TTL,
+    HEALTH_MAX_EVENT_LOOP_LAG,
+    HEALTH_MAX_POOL_SATURATION,
+    HEALTH_PROBE_TIMEOUT,
+)
+from app.schemas.health import (
+    LivenessScheme,
+    PoolScheme,
+    ProbeScheme,
+    ReadinessScheme,
+)
+
+
+class EventLoopLagMonitor:
+    """
+    Measures how late the event loop wakes up a periodic sleeper.
+    """
+
+    def __init__(self, interval: float = EVENT_LOOP_MONITOR_INTERVAL):
+        self._interval = interval
+        self._task: asyncio.Task | None = None
+        self.lag: float = 0.0
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self._interval)
+            self.lag = max(0.0, loop.time() - start - self._interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+class HealthService:
+    """
+    Liveness and readiness checks of the worker.
+
+    Readiness results are cached for HEALTH_CACHE_TTL and concurrent
+    callers share one probe round, so frequent polling adds no load.
+    """
+
+    _instance = None
+    _engine: AsyncEngine = None
+    _redis: Redis = None
+    _max_pool_size: int = 0
+    _lag_monitor: EventLoopLagMonitor = None
+    _readiness: ReadinessScheme = None
+    _lock: asyncio.Lock = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def _init_health(
+        self, engine: AsyncEngine, redis: Redis, max_pool_size: int
+    ):
+        self._engine = engine
+        self._redis = redis
+        self._max_pool_size = max_pool_size
+        self._readiness = None
+        self._lock = asyncio.Lock()
+        self._lag_monitor = EventLoopLagMonitor()
+        self._lag_monitor.start()
+
+    async def _close_health(self):
+        if self._lag_monitor is not None:
+            await self._lag_monitor.stop()
+        self._engine = self._redis = self._lag_monitor = None
+        self._readiness = None
+
+    @property
+    def _lag(self) -> float:
+        return self._lag_monitor.lag if self._lag_monitor else 0.0
+
+    def get_liveness(self) -> LivenessScheme:
+        return LivenessScheme(event_loop_lag_ms=round(self._lag * 1000, 3))
+
+    async def get_readiness(self, started: bool) -> ReadinessScheme:
+        if not started or self._engine is None:
+            return self._build_readiness(started=False, probes=[])
+        if self._is_fresh():
+            return self._readiness
+        async with self._lock:
+            # other request could refresh it while we were waiting
+            if not self._is_fresh():
+                self._readiness = await self._check_readiness()
+        return self._readiness
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._readiness is not None
+            and time.monotonic() - self._readiness.checked_at
+            < HEALTH_CACHE_TTL
+        )
+
+    async def _check_readiness(self) -> ReadinessScheme:
+        pool = self._get_pool_status()
+        if pool.saturation >= HEALTH_MAX_POOL_SATURATION:
+            # probing would wait for a connection and add to the queue
+            postgres = ProbeScheme(
+                name="postgres", ok=False, error="pool exhausted"
+            )
+            redis = await self._probe("redis", self._redis.ping)
+            probes = [postgres, redis]
+        else:
+            probes = list(
+                await asyncio.gather(
+                    self._probe("postgres", self._ping_postgres),
+                    self._probe("redis", self._redis.ping),
+                )
+            )
+        return self._build_readiness(started=True, probes=probes, pool=pool)
+
+    def _build_readiness(
+        self,
+        started: bool,
+        probes: list[ProbeScheme],
+        pool: PoolScheme | None = None,
+    ) -> ReadinessScheme:
+        lag = self._lag
+        ready = (
+            started
+            and all(probe.ok for probe in probes)
+            and lag < HEALTH_MAX_EVENT_LOOP_LAG
+        )
+        return ReadinessScheme(
+            ready=ready,
+            probes=probes,
+            pool=pool,
+            event_loop_lag_ms=round(lag * 1000, 3),
+            checked_at=time.monotonic(),
+        )
+
+    def _get_pool_status(self) -> PoolScheme:
+        pool = self._engine.pool
+        size = pool.size()
+        checked_out = pool.checkedout()
+        return PoolScheme(
+            size=size,
+            max_overflow=self._max_pool_size - size,
+            checked_out=checked_out,
+            overflow=max(pool.overflow(), 0),
+            saturation=round(checked_out / self._max_pool_size, 3),
+        )
+
+    async def _ping_postgres(self):
+        async with self._engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    @staticmethod
+    async def _probe(name: str, probe: Callable[[], Awaitable]) -> ProbeScheme:
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(probe(), timeout=HEALTH_PROBE_TIMEOUT)
+        except TimeoutError:
+            error = f"timeout after {HEALTH_PROBE_TIMEOUT}s"
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        else:
+            error = None
+        return ProbeScheme(
+            name=name,
+            ok=error is None,
+            latency_ms=round((time.perf_counter() - start) * 1000, 3),
+            error=error,
+        )
@@ -0,0 +1,67 @@
+from collections import defaultdict
+from typing import Iterable
+from uuid import UUID
+
+from app.core.constants import LEADERBOARD_EXPIRE_TIME
+from app.services.redis import RedisService
+
+
+def company_leaderboard_key(company_id: UUID | str) -> str:
+    return f"leaderboard:company:{company_id}"
+
+
+def quiz_leaderboard_key(quiz_id: UUID | str) -> str:
+    return f"leaderboard:quiz:{quiz_id}"
+
+
+async def add_attempt_to_leaderboards(
+    company_id: UUID | None,
+    quiz_id: UUID,
+    user_id: UUID,
+    correct_answers_count: int,
+    total_questions: int,
+) -> None:
+    """
+    Add the attempt to the quiz leaderboard and to the company one, which
+    ranks active members only and is left out with company_id None.
+    """
+    keys = [quiz_leaderboard_key(quiz_id)]
+    if company_id is not None:
+        keys.append(company_leaderboard_key(company_id))
+    member = str(user_id)
+    await RedisService().add_to_rankings(
+        [(key, member, correct_answers_count, total_questions) for key in keys]
+    )
+
+
+async def fill_leaderboard(
+    key: str, sums: Iterable[tuple[UUID, int, int]], replace: bool = False
+) -> None:
+    """
+    Fill the leaderboard with (user_id, correct, total) score sums, one
+    filled meanwhile is kept unless replace is set.
+    """
+    await RedisService().fill_ranking(
+        key,
+        {str(user_id): (correct, total) for user_id, correct, total in sums},
+        expire=LEADERBOARD_EXPIRE_TIME,
+        replace=replace,
+    )
+
+
+async def fill_leaderboards(
+    key_for, sums: Iterable[tuple[UUID, UUID, int, int]]
+) -> int:
+    """
+    Replace leaderboards with (id, user_id, correct, total) score sums
+    grouped by the id, key_for gives the leaderboard key of the id.
+    Return the leaderboards count.
+    """
+    leaderboards = defaultdict(list)
+    for leaderboard_id, user_id, correct, total in sums:
+        leaderboards[leaderboard_id].append((user_id, correct, total))
+    for leaderboard_id, leaderboard_sums in leaderboards.items():
+        await fill_leaderboard(
+            key_for(leaderboard_id), leaderboard_sums, replace=True
+        )
+    return len(leaderboards)
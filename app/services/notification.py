@@ -1,21 +1,65 @@
+from functools import partial
+from typing import Sequence
 from uuid import UUID
 
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.constants import NOTIFICATIONS_UNREAD_COUNT_EXPIRE_TIME
 from app.db.models import User
+from app.db.postgres import on_commit
 from app.repositories.notification import NotificationRepository
 from app.repositories.user_quiz import UserQuizRepository
 from app.schemas.notification import (
     ListNotificationsDetailScheme,
+    NotificationCreateScheme,
     NotificationDetailScheme,
+    NotificationFeedScheme,
+    NotificationsMarkedAsReadScheme,
+    NotificationUnreadCountScheme,
 )
 from app.services.base import Service
+from app.services.notification_counter import (
+    drop_unread_count,
+    incr_unread_counts,
+    unread_count_key,
+)
+from app.services.notification_stream import publish_notifications
+from app.services.redis import RedisService
+from app.utils.paginator import TimeCursor
+from app.utils.schemas import list_adapter
+
+
+def publish_on_commit(session: AsyncSession, rows: Sequence) -> None:
+    """
+    Push new notifications to the user channels and count them as unread
+    once they are stored.
+    """
+    notifications = list_adapter(NotificationDetailScheme).validate_python(
+        rows, from_attributes=True
+    )
+    on_commit(session, partial(publish_notifications, notifications))
+    on_commit(
+        session,
+        partial(incr_unread_counts, [n.user_id for n in notifications]),
+    )
 
 
 class NotificationSrvice(Service):
     def __init__(self, session):
         self.notification_repo = NotificationRepository(session)
         self.user_quiz_repo = UserQuizRepository(session)
+        self.redis = RedisService()
         super().__init__(session)
 
+    async def create_notification(
+        self, scheme: NotificationCreateScheme
+    ) -> NotificationDetailScheme:
+        raw_notification = await self.notification_repo.create_notification(
+            scheme=scheme
+        )
+        publish_on_commit(self.session, [raw_notification])
+        return NotificationDetailScheme.from_orm(raw_notification)
+
     async def get_user_notifications(
         self, user: User
     ) -> ListNotificationsDetailScheme:
@@ -24,9 +68,9 @@ class NotificationSrvice(Service):
                 user_id=user.user_id
             )
         )
-        list_notifications = [
-            NotificationDetailScheme.from_orm(n) for n in raw_notifications
-        ]
+        list_notifications = list_adapter(
+            NotificationDetailScheme
+        ).validate_python(raw_notifications)
         return ListNotificationsDetailScheme(notifications=list_notifications)
 
     async def mark_self_notification_as_read(
@@ -39,4 +83,68 @@ class NotificationSrvice(Service):
                 status=False,
             )
         )
+        on_commit(self.session, partial(drop_unread_count, user.user_id))
         return NotificationDetailScheme.from_orm(raw_notification)
+
+    async def get_user_notifications_feed(
+        self,
+        user: User,
+        limit: int,
+        cursor: str | None = None,
+        unread: bool = False,
+    ) -> NotificationFeedScheme:
+        raw_notifications = (
+            await self.notification_repo.get_user_notifications_page(
+                user_id=user.user_id,
+                # one more row tells whether a next page exists
+                limit=limit + 1,
+                cursor=TimeCursor.decode(cursor) if cursor else None,
+                unread=unread,
+            )
+        )
+        notifications = list_adapter(NotificationDetailScheme).validate_python(
+            raw_notifications[:limit]
+        )
+        next_cursor = None
+        if len(raw_notifications) > limit:
+            last = notifications[-1]
+            next_cursor = TimeCursor(
+                time=last.time, id=last.notification_id
+            ).encode()
+        return NotificationFeedScheme(
+            notifications=notifications, next_cursor=next_cursor
+        )
+
+    async def get_unread_notifications_count(
+        self, user: User
+    ) -> NotificationUnreadCountScheme:
+        """
+        Unread count kept in Redis, counted in the database on a miss.
+
+        The count is stored only if no notification was counted or read
+        meanwhile, the next read counts again otherwise.
+        """
+        key = unread_count_key(user.user_id)
+        if (unread := await self.redis.get_value(key)) is None:
+            generation = await self.redis.get_counter_generation(key)
+            unread = (
+                await self.notification_repo.count_user_unread_notifications(
+                    user_id=user.user_id
+                )
+            )
+            await self.redis.fill_counter(
+                key,
+                unread,
+                generation,
+                expire=NOTIFICATIONS_UNREAD_COUNT_EXPIRE_TIME,
+            )
+        return NotificationUnreadCountScheme(unread=int(unread))
+
+    async def mark_all_notifications_as_read(
+        self, user: User
+    ) -> NotificationsMarkedAsReadScheme:
+        marked = await self.notification_repo.mark_user_notifications_as_read(
+            user_id=user.user_id
+        )
+        on_commit(self.session, partial(drop_unread_count, user.user_id))
+        return NotificationsMarkedAsReadScheme(marked=marked)
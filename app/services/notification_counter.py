@@ -0,0 +1,27 @@
+from collections import Counter
+from typing import Sequence
+from uuid import UUID
+
+from app.core.constants import NOTIFICATIONS_UNREAD_COUNT_EXPIRE_TIME
+from app.services.redis import RedisService
+
+
+def unread_count_key(user_id: UUID | str) -> str:
+    return f"notifications_unread:{user_id}"
+
+
+async def incr_unread_counts(user_ids: Sequence[UUID]) -> None:
+    await RedisService().incr_counters(
+        Counter(unread_count_key(user_id) for user_id in user_ids),
+        expire=NOTIFICATIONS_UNREAD_COUNT_EXPIRE_TIME,
+    )
+
+
+async def drop_unread_count(user_id: UUID) -> None:
+    """
+    Forget the counter, the next read counts unread rows again.
+    """
+    await RedisService().drop_counter(
+        unread_count_key(user_id),
+        expire=NOTIFICATIONS_UNREAD_COUNT_EXPIRE_TIME,
+    )
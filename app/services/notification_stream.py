@@ -0,0 +1,143 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from functools import cache
+from typing import AsyncIterator, Sequence
+from uuid import UUID
+
+from redis.asyncio import Redis
+from redis.asyncio.client import PubSub
+
+from app.core.constants import (
+    NOTIFICATION_STREAM_KEEPALIVE,
+    NOTIFICATION_STREAM_QUEUE_SIZE,
+)
+from app.schemas.notification import NotificationDetailScheme
+from app.services.redis import RedisService
+
+logger = logging.getLogger(__name__)
+
+
+def notification_channel(user_id: UUID | str) -> str:
+    return f"notifications:{user_id}"
+
+
+async def publish_notifications(
+    notifications: Sequence[NotificationDetailScheme],
+) -> None:
+    await RedisService().publish(
+        [
+            (notification_channel(n.user_id), n.model_dump_json())
+            for n in notifications
+        ]
+    )
+
+
+class NotificationBroker:
+    """
+    Deliver per user Redis channels to the streams of this worker.
+
+    The worker holds one pub/sub connection, a user channel is subscribed
+    while at least one stream of the user is open.
+    """
+
+    def __init__(self, queue_size: int = NOTIFICATION_STREAM_QUEUE_SIZE):
+        self._queue_size = queue_size
+        self._queues: dict[str, set[asyncio.Queue]] = {}
+        self._pubsub: PubSub | None = None
+        self._lock: asyncio.Lock | None = None
+        self._task: asyncio.Task | None = None
+
+    def _init_broker(self, redis: Redis):
+        self._pubsub = redis.pubsub()
+        self._lock = asyncio.Lock()
+
+    async def _close_broker(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+        self._queues.clear()
+
+    async def _run(self):
+        while True:
+            try:
+                message = await self._pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=None
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # the connection is restored with its subscriptions
+                # by the next read
+                logger.exception("Notification channel read failed")
+                await asyncio.sleep(1)
+                continue
+            if message is None:
+                continue
+            for queue in self._queues.get(message["channel"], ()):
+                try:
+                    queue.put_nowait(message["data"])
+                except asyncio.QueueFull:
+                    logger.warning(
+                        f"Notification dropped for slow stream "
+                        f"{message['channel']}"
+                    )
+
+    @asynccontextmanager
+    async def listen(self, user_id: UUID) -> AsyncIterator[asyncio.Queue]:
+        """
+        Queue of the user notifications published while the block runs.
+        """
+        if self._pubsub is None:
+            raise Exception("Notification broker not initialized")
+        channel = notification_channel(user_id)
+        queue = asyncio.Queue(maxsize=self._queue_size)
+        async with self._lock:
+            listeners = self._queues.setdefault(channel, set())
+            if not listeners:
+                await self._pubsub.subscribe(channel)
+            listeners.add(queue)
+            if self._task is None:
+                self._task = asyncio.create_task(self._run())
+        try:
+            yield queue
+        finally:
+            async with self._lock:
+                listeners.discard(queue)
+                if not listeners and self._queues.get(channel) is listeners:
+                    del self._queues[channel]
+                    if self._pubsub is not None:
+                        await self._pubsub.unsubscribe(channel)
+
+    async def stream(
+        self,
+        user_id: UUID,
+        keepalive: float = NOTIFICATION_STREAM_KEEPALIVE,
+    ) -> AsyncIterator[str]:
+        """
+        Server-sent events of the user notifications.
+
+        A comment is sent when the stream is idle for keepalive seconds,
+        so proxies do not close it.
+        """
+        async with self.listen(user_id) as queue:
+            yield ": connected\n\n"
+            while True:
+                try:
+                    data = await asyncio.wait_for(queue.get(), keepalive)
+                except TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: notification\ndata: {data}\n\n"
+
+
+@cache
+def get_notification_broker() -> NotificationBroker:
+    return NotificationBroker()
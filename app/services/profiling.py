@@ -0,0 +1,87 @@
+import cProfile
+import io
+import json
+import pstats
+import re
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+from app.core.constants import PROFILE_MAX_FILES, PROFILE_TOP_FUNCTIONS
+from app.schemas.profiling import ProfileSummaryScheme
+
+_unsafe_chars = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+class ProfilingService:
+    """
+    Store request profiles in the profile directory.
+
+    Every profile has a json summary with time breakdown, optional
+    cProfile dump (.prof, readable by pstats or snakeviz) and optional
+    collapsed stack samples (.folded, flamegraph format).
+    """
+
+    def __init__(self, directory: str):
+        self._directory = Path(directory)
+
+    def save_profile(
+        self,
+        summary: ProfileSummaryScheme,
+        profile: cProfile.Profile | None = None,
+        stack_samples: Counter | None = None,
+    ) -> ProfileSummaryScheme:
+        self._directory.mkdir(parents=True, exist_ok=True)
+        route = _unsafe_chars.sub("_", summary.route).strip("_") or "root"
+        name = f"{int(time.time() * 1000)}_{summary.method}_{route}"
+        summary.name = name
+        if profile is not None:
+            profile.dump_stats(self._directory / f"{name}.prof")
+            summary.top_functions = self._top_functions(profile)
+        if stack_samples:
+            (self._directory / f"{name}.folded").write_text(
+                "\n".join(
+                    f"{stack} {count}"
+                    for stack, count in stack_samples.items()
+                )
+            )
+        (self._directory / f"{name}.json").write_text(
+            summary.model_dump_json()
+        )
+        self._remove_oldest()
+        return summary
+
+    def list_profiles(self) -> list[ProfileSummaryScheme]:
+        if not self._directory.exists():
+            return []
+        return [
+            ProfileSummaryScheme.model_validate(json.loads(path.read_text()))
+            for path in sorted(self._directory.glob("*.json"), reverse=True)
+        ]
+
+    def get_profile_file(self, name: str, suffix: str) -> Path | None:
+        path = self._directory / f"{_unsafe_chars.sub('_', name)}{suffix}"
+        return path if path.is_file() else None
+
+    def _remove_oldest(self):
+        summaries = sorted(self._directory.glob("*.json"))
+        for path in summaries[: max(0, len(summaries) - PROFILE_MAX_FILES)]:
+            for suffix in (".json", ".prof", ".folded"):
+                path.with_suffix(suffix).unlink(missing_ok=True)
+
+    @staticmethod
+    def _top_functions(profile: cProfile.Profile) -> list[dict[str, Any]]:
+        stats = pstats.Stats(profile, stream=io.StringIO())
+        rows = sorted(
+            stats.stats.items(), key=lambda item: item[1][3], reverse=True
+        )[:PROFILE_TOP_FUNCTIONS]
+        return [
+            {
+                "function": f"{file}:{line}({func})",
+                "calls": calls,
+                "own_ms": round(own * 1000, 3),
+                "cumulative_ms": round(cumulative * 1000, 3),
+            }
+            for (file, line, func), (_, calls, own, cumulative, _) in rows
+        ]
@@ -1,22 +1,38 @@
+import uuid
+from collections import Counter
+from functools import partial
+from typing import AsyncIterator
 from uuid import UUID
 
+from app.core.constants import QUIZ_BULK_BATCH_SIZE
 from app.db.models import User
+from app.db.postgres import on_commit
 from app.repositories.answer import AnswerRepository
 from app.repositories.company_member import CompanyMemberRepository
 from app.repositories.notification import NotificationRepository
 from app.repositories.question import QuestionRepository
 from app.repositories.quiz import QuizRepository
-from app.schemas.notification import NotificationCreateScheme
+from app.repositories.score_total import ScoreTotalRepository
 from app.schemas.quiz import (
     AnswerCreateScheme,
     AnswerDetailScheme,
     ListQuizDetailScheme,
     QuestionCreateScheme,
     QuestionDetailScheme,
+    QuizBulkCreateResultScheme,
     QuizCreateRequestScheme,
     QuizDetailScheme,
 )
+from app.services.answers_version import (
+    company_answers_version_key,
+    drop_answers_versions,
+    quiz_answers_version_key,
+    user_answers_version_key,
+)
 from app.services.base import Service
+from app.services.notification import publish_on_commit
+from app.utils.conditional import Version
+from app.utils.streaming import batched
 from app.utils.validators.quiz import QuizCreateValidator
 
 
@@ -29,8 +45,17 @@ class QuizService(Service):
         self.answer_repository = AnswerRepository(session)
         self.company_member_repository = CompanyMemberRepository(session)
         self.notification_repo = NotificationRepository(session)
+        self.score_total_repository = ScoreTotalRepository(session)
         super().__init__(session)
 
+    async def _notify_company_members(self, company_id: UUID, text: str):
+        rows = (
+            await self.notification_repo.create_company_members_notifications(
+                company_id=company_id, text=text
+            )
+        )
+        publish_on_commit(self.session, rows)
+
     @validator.validate_quiz_company_and_name_unique
     @validator.validate_exist_company_is_active
     @validator.validate_user_is_owner_or_admin_by_company_id
@@ -58,23 +83,79 @@ class QuizService(Service):
         )
 
         # send notification to company members
-        raw_members_ids = (
-            await self.company_member_repository.get_user_id_company_members(
-                company_id=company_id
-            )
+        await self._notify_company_members(
+            company_id=company_id, text=f'New quiz "{scheme.name}" created'
         )
-        text = f'New quiz "{scheme.name}" created'
-        for user_id in raw_members_ids:
-            notification_scheme = NotificationCreateScheme(
-                text=text, user_id=user_id
-            )
-            new_notification = (
-                await self.notification_repo.create_notification(
-                    scheme=notification_scheme
+
+        return QuizDetailScheme.from_orm(nested_quiz)
+
+    @validator.validate_exist_company_is_active
+    @validator.validate_user_is_owner_or_admin_by_company_id
+    async def bulk_create_quizzes(
+        self,
+        schemes: AsyncIterator[QuizCreateRequestScheme],
+        company_id: UUID,
+        user: User,
+    ) -> QuizBulkCreateResultScheme:
+        """
+        Load quizzes in batches of COPY statements in one transaction.
+
+        Company members get one notification per batch.
+        """
+        result = QuizBulkCreateResultScheme(
+            quizzes=0, questions=0, answers=0, quiz_ids=[]
+        )
+        names = set()
+        async for batch in batched(schemes, QUIZ_BULK_BATCH_SIZE):
+            batch_names = Counter(scheme.name for scheme in batch)
+            if (
+                any(count > 1 for count in batch_names.values())
+                or not names.isdisjoint(batch_names)
+                or await self.quiz_repository.get_active_quiz_names(
+                    company_id=company_id, names=batch_names
+                )
+            ):
+                raise PermissionError("Validation error. Quiz is exist.")
+            names.update(batch_names)
+
+            quizzes, questions, answers = [], [], []
+            for scheme in batch:
+                quiz_id = uuid.uuid4()
+                quizzes.append(
+                    (
+                        quiz_id,
+                        company_id,
+                        scheme.name,
+                        scheme.description,
+                        0,
+                        True,
+                    )
                 )
+                result.quiz_ids.append(quiz_id)
+                for question in scheme.questions:
+                    question_id = uuid.uuid4()
+                    questions.append((question_id, quiz_id, question.text))
+                    answers.extend(
+                        (
+                            uuid.uuid4(),
+                            question_id,
+                            answer.text,
+                            answer.is_correct,
+                        )
+                        for answer in question.answers
+                    )
+            await self.quiz_repository.copy_quizzes(
+                quizzes=quizzes, questions=questions, answers=answers
             )
+            result.quizzes += len(quizzes)
+            result.questions += len(questions)
+            result.answers += len(answers)
 
-        return QuizDetailScheme.from_orm(nested_quiz)
+            await self._notify_company_members(
+                company_id=company_id,
+                text=f"{len(quizzes)} new quizzes created",
+            )
+        return result
 
     async def get_all_company_quizzes(
         self, company_id: UUID, page: int, limit: int
@@ -87,6 +168,25 @@ class QuizService(Service):
         quizzes = [QuizDetailScheme.from_orm(quiz) for quiz in raw_quizzes]
         return ListQuizDetailScheme(quizzes=quizzes)
 
+    async def get_all_company_quizzes_version(
+        self, company_id: UUID, page: int, limit: int
+    ) -> Version:
+        (
+            count,
+            digest,
+        ) = await self.quiz_repository.get_company_quizzes_fingerprint(
+            company_id=company_id
+        )
+        return Version(company_id, page, limit, count, digest)
+
+    @validator.validate_quiz_exist_and_active_by_quiz_id
+    @validator.validate_user_is_company_member_or_owner_by_quiz_id
+    async def get_quiz_version(self, quiz_id: UUID, user: User) -> Version:
+        updated_at = await self.quiz_repository.get_quiz_updated_at(
+            quiz_id=quiz_id
+        )
+        return Version(quiz_id, updated_at, last_modified=updated_at)
+
     @validator.validate_quiz_exist_and_active_by_quiz_id
     @validator.validate_user_is_company_member_or_owner_by_quiz_id
     async def get_quiz(self, quiz_id: UUID, user: User) -> QuizDetailScheme:
@@ -104,6 +204,22 @@ class QuizService(Service):
         raw_quiz = await self.quiz_repository.update_quiz(
             quiz_id=quiz_id, is_active=False
         )
+        # averages count attempts on active quizzes only
+        user_ids = await self.score_total_repository.subtract_quiz(
+            quiz_id=quiz_id, company_id=raw_quiz.company_id
+        )
+        # exports of the answers leave the quiz out
+        on_commit(
+            self.session,
+            partial(
+                drop_answers_versions,
+                [
+                    quiz_answers_version_key(quiz_id),
+                    company_answers_version_key(raw_quiz.company_id),
+                    *map(user_answers_version_key, user_ids),
+                ],
+            ),
+        )
         return QuizDetailScheme.from_orm(nested_quiz)
 
     @validator.validate_quiz_exist_and_active_by_quiz_id
@@ -117,6 +233,7 @@ class QuizService(Service):
         raw_answers = await self.answer_repository.create_answers(
             answers=scheme.answers, question_id=raw_question.question_id
         )
+        await self.quiz_repository.touch_quiz(quiz_id=quiz_id)
         nested_question = await self.question_repository.get_nested_question(
             question_id=raw_question.question_id
         )
@@ -133,6 +250,7 @@ class QuizService(Service):
         raw_question = await self.question_repository.delete_question(
             question_id=question_id
         )
+        await self.quiz_repository.touch_quiz(quiz_id=nested_question.quiz_id)
         return QuestionDetailScheme.from_orm(nested_question)
 
     @validator.validate_quiz_exist_and_active_by_question_id
@@ -143,6 +261,9 @@ class QuizService(Service):
         raw_answer = await self.answer_repository.create_answer(
             answer=scheme, question_id=question_id
         )
+        await self.quiz_repository.touch_quiz_by_question_id(
+            question_id=question_id
+        )
         return AnswerDetailScheme.from_orm(raw_answer)
 
     @validator.validate_quiz_exist_and_active_by_answer_id
@@ -151,4 +272,7 @@ class QuizService(Service):
         raw_answer = await self.answer_repository.delete_answer(
             answer_id=answer_id
         )
+        await self.quiz_repository.touch_quiz_by_question_id(
+            question_id=raw_answer.question_id
+        )
         return AnswerDetailScheme.from_orm(raw_answer)
@@ -1,12 +1,93 @@
+import os
+import time
+import uuid
+from typing import Mapping, Sequence
+
 import redis.asyncio as aioredis
 from redis.asyncio import Redis
 
 from app.core.constants import REDIS_MAX_CONNECTIONS
+from app.utils.metrics import CACHE_REQUESTS, REDIS_COMMAND_DURATION
+from app.utils.stats import get_request_stats
+
+# INCRBY that does not create missing counters, bumps the generation of
+# the counter in KEYS[2] so a fill counted before is not stored
+_INCR_COUNTER_SCRIPT = """
+redis.call("INCR", KEYS[2])
+redis.call("EXPIRE", KEYS[2], ARGV[2])
+if redis.call("EXISTS", KEYS[1]) == 1 then
+    return redis.call("INCRBY", KEYS[1], ARGV[1])
+end
+"""
+
+_DROP_COUNTER_SCRIPT = """
+redis.call("INCR", KEYS[2])
+redis.call("EXPIRE", KEYS[2], ARGV[1])
+redis.call("DEL", KEYS[1])
+"""
+
+# sets the counter unless its generation changed since ARGV[1] was read
+_FILL_COUNTER_SCRIPT = """
+if (redis.call("GET", KEYS[2]) or "") ~= ARGV[1] then
+    return 0
+end
+redis.call("SET", KEYS[1], ARGV[2], "EX", ARGV[3])
+return 1
+"""
+
+# adds an attempt to the score sums of a member and ranks the member by
+# the average score, rankings not filled yet are left missing
+_ADD_TO_RANKING_SCRIPT = """
+if redis.call("HEXISTS", KEYS[2], "filled") == 0 then
+    return
+end
+local correct = redis.call("HINCRBY", KEYS[2], ARGV[1] .. ":correct", ARGV[2])
+local total = redis.call("HINCRBY", KEYS[2], ARGV[1] .. ":total", ARGV[3])
+if total > 0 then
+    redis.call("ZADD", KEYS[1], correct / total, ARGV[1])
+end
+"""
+
+# replaces the ranking and its score sums with members given by (member,
+# correct, total) argument triples, unless ARGV[2] is "0" and the ranking
+# is filled already. Both keys expire after ARGV[1] seconds.
+_FILL_RANKING_SCRIPT = """
+if ARGV[2] == "0" and redis.call("HEXISTS", KEYS[2], "filled") == 1 then
+    return 0
+end
+redis.call("DEL", KEYS[1], KEYS[2])
+redis.call("HSET", KEYS[2], "filled", 1)
+for i = 3, #ARGV, 3 do
+    local correct = tonumber(ARGV[i + 1])
+    local total = tonumber(ARGV[i + 2])
+    redis.call(
+        "HSET", KEYS[2],
+        ARGV[i] .. ":correct", correct, ARGV[i] .. ":total", total
+    )
+    if total > 0 then
+        redis.call("ZADD", KEYS[1], correct / total, ARGV[i])
+    end
+end
+redis.call("EXPIRE", KEYS[1], ARGV[1])
+redis.call("EXPIRE", KEYS[2], ARGV[1])
+return 1
+"""
+
+# version token of the key, a missing one is set to the given new token
+_GET_VERSION_SCRIPT = """
+local version = redis.call("GET", KEYS[1])
+if not version then
+    version = ARGV[1]
+    redis.call("SET", KEYS[1], version, "EX", ARGV[2])
+end
+return version
+"""
 
 
 class RedisService:
     _instance = None
     _redis: Redis = None
+    _pid: int = None
 
     def __new__(cls):
         if cls._instance is None:
@@ -14,30 +95,245 @@ class RedisService:
         return cls._instance
 
     def _init_redis(self, url):
-        if self._redis is None:
-            pool = aioredis.ConnectionPool(
-                max_connections=REDIS_MAX_CONNECTIONS
-            ).from_url(url, decode_responses=True)
-            pool.get_available_connection()
+        # every worker process needs its own client, connections
+        # inherited from the parent process must not be reused
+        if self._redis is None or self._pid != os.getpid():
+            pool = aioredis.ConnectionPool.from_url(
+                url,
+                max_connections=REDIS_MAX_CONNECTIONS,
+                decode_responses=True,
+            )
             self._redis = aioredis.Redis(
                 connection_pool=pool, decode_responses=True
             )
+            self._pid = os.getpid()
 
     def _get_redis(self):
-        if self._redis is None:
+        if self._redis is None or self._pid != os.getpid():
             raise Exception("Redis not initialized")
         return self._redis
 
     async def _close_redis(self):
         if self._redis is not None:
-            await self._redis.aclose()
+            # the pool is passed in, the client does not close it by default
+            await self._redis.aclose(close_connection_pool=True)
+            self._redis = None
+            self._pid = None
+
+    @staticmethod
+    def _observe(command: str, start: float):
+        duration = time.perf_counter() - start
+        REDIS_COMMAND_DURATION.observe(duration, command)
+        if stats := get_request_stats():
+            stats.redis_time += duration
+
+    @staticmethod
+    def _key_prefix(key: str) -> str:
+        prefix, sep, _ = key.partition(":")
+        return prefix if sep else "user_quiz"
 
     async def set_value(self, key, value: str, expire: int = None):
         key = str(key)
-        await self._redis.set(key, value)
-        if expire:
-            await self._redis.expire(key, expire)
+        redis = self._get_redis()
+        # expiration is set by the same command, one round trip
+        start = time.perf_counter()
+        await redis.set(key, value, ex=expire)
+        self._observe("set", start)
 
     async def get_value(self, key):
         key = str(key)
-        return await self._redis.get(key)
+        start = time.perf_counter()
+        value = await self._get_redis().get(key)
+        self._observe("get", start)
+        CACHE_REQUESTS.inc(
+            self._key_prefix(key), "miss" if value is None else "hit"
+        )
+        return value
+
+    async def publish(self, messages: Sequence[tuple[str, str]]):
+        """
+        Publish (channel, message) pairs, pipelined in one round trip.
+        """
+        if not messages:
+            return
+        redis = self._get_redis()
+        start = time.perf_counter()
+        async with redis.pipeline(transaction=False) as pipe:
+            for channel, message in messages:
+                pipe.publish(channel, message)
+            await pipe.execute()
+        self._observe("publish", start)
+
+    async def delete_value(self, key):
+        start = time.perf_counter()
+        await self._get_redis().delete(str(key))
+        self._observe("delete", start)
+
+    async def delete_values(self, keys: Sequence[str]):
+        if not keys:
+            return
+        start = time.perf_counter()
+        await self._get_redis().delete(*keys)
+        self._observe("delete", start)
+
+    async def get_version(self, key: str, expire: int) -> str:
+        """
+        Version token of the key, a missing one is set to a new random
+        token. Tokens never repeat, so a version dropped or lost with the
+        Redis data does not match the representations of an older one.
+        """
+        redis = self._get_redis()
+        script = redis.register_script(_GET_VERSION_SCRIPT)
+        start = time.perf_counter()
+        version = await script(keys=[key], args=[uuid.uuid4().hex, expire])
+        self._observe("get_version", start)
+        return version
+
+    @staticmethod
+    def _generation_key(key: str) -> str:
+        return f"{key}:generation"
+
+    async def incr_counters(self, amounts: Mapping[str, int], expire: int):
+        """
+        Increment counters which are set, keep missing ones missing.
+
+        Counters are filled on read, creating one here from zero would
+        store a wrong value. The generation of every counter is bumped,
+        so a fill counted before the increment is not stored.
+        """
+        if not amounts:
+            return
+        redis = self._get_redis()
+        script = redis.register_script(_INCR_COUNTER_SCRIPT)
+        start = time.perf_counter()
+        async with redis.pipeline(transaction=False) as pipe:
+            for key, amount in amounts.items():
+                await script(
+                    keys=[key, self._generation_key(key)],
+                    args=[amount, expire],
+                    client=pipe,
+                )
+            await pipe.execute()
+        self._observe("incr_counters", start)
+
+    async def drop_counter(self, key: str, expire: int):
+        redis = self._get_redis()
+        script = redis.register_script(_DROP_COUNTER_SCRIPT)
+        start = time.perf_counter()
+        await script(keys=[key, self._generation_key(key)], args=[expire])
+        self._observe("drop_counter", start)
+
+    async def get_counter_generation(self, key: str) -> str:
+        """
+        Generation to pass to fill_counter, read before the counted value.
+        """
+        start = time.perf_counter()
+        generation = await self._get_redis().get(self._generation_key(key))
+        self._observe("get", start)
+        return generation or ""
+
+    async def fill_counter(
+        self, key: str, value: int, generation: str, expire: int
+    ) -> bool:
+        """
+        Set the counter unless it was incremented or dropped since the
+        generation was read, return whether it is set.
+        """
+        redis = self._get_redis()
+        script = redis.register_script(_FILL_COUNTER_SCRIPT)
+        start = time.perf_counter()
+        filled = await script(
+            keys=[key, self._generation_key(key)],
+            args=[generation, value, expire],
+        )
+        self._observe("fill_counter", start)
+        return bool(filled)
+
+    @staticmethod
+    def _sums_key(key: str) -> str:
+        return f"{key}:sums"
+
+    async def add_to_rankings(
+        self, updates: Sequence[tuple[str, str, int, int]]
+    ):
+        """
+        Add (ranking key, member, correct, total) to the score sums of
+        members and rank them by the average, in one round trip.
+
+        Rankings are filled from Postgres on read, adding to a missing
+        one would rank only the latest attempts.
+        """
+        if not updates:
+            return
+        redis = self._get_redis()
+        script = redis.register_script(_ADD_TO_RANKING_SCRIPT)
+        start = time.perf_counter()
+        async with redis.pipeline(transaction=False) as pipe:
+            for key, member, correct, total in updates:
+                await script(
+                    keys=[key, self._sums_key(key)],
+                    args=[member, correct, total],
+                    client=pipe,
+                )
+            await pipe.execute()
+        self._observe("add_to_rankings", start)
+
+    async def fill_ranking(
+        self,
+        key: str,
+        sums: Mapping[str, tuple[int, int]],
+        expire: int,
+        replace: bool = False,
+    ) -> bool:
+        """
+        Fill the ranking with members (correct, total) score sums, return
+        whether it is filled. A ranking filled meanwhile by a concurrent
+        read is kept unless replace is set.
+        """
+        args = [expire, int(replace)]
+        for member, (correct, total) in sums.items():
+            args += (member, correct, total)
+        redis = self._get_redis()
+        script = redis.register_script(_FILL_RANKING_SCRIPT)
+        start = time.perf_counter()
+        filled = await script(keys=[key, self._sums_key(key)], args=args)
+        self._observe("fill_ranking", start)
+        return bool(filled)
+
+    async def is_ranking_filled(self, key: str) -> bool:
+        start = time.perf_counter()
+        filled = await self._get_redis().hexists(self._sums_key(key), "filled")
+        self._observe("hexists", start)
+        return filled
+
+    async def get_ranking_page(
+        self, key: str, offset: int, limit: int
+    ) -> tuple[list[tuple[str, float]], int]:
+        """
+        Members with scores from the highest, and the members count.
+        """
+        redis = self._get_redis()
+        start = time.perf_counter()
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.zrevrange(key, offset, offset + limit - 1, withscores=True)
+            pipe.zcard(key)
+            members, total = await pipe.execute()
+        self._observe("get_ranking_page", start)
+        return members, total
+
+    async def get_ranking_position(
+        self, key: str, member: str
+    ) -> tuple[int | None, float | None, int]:
+        """
+        Zero based rank from the highest score, the score and the members
+        count. Rank and score are None for a member not ranked.
+        """
+        redis = self._get_redis()
+        start = time.perf_counter()
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.zrevrank(key, member)
+            pipe.zscore(key, member)
+            pipe.zcard(key)
+            rank, score, total = await pipe.execute()
+        self._observe("get_ranking_position", start)
+        return rank, score, total
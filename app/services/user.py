@@ -12,6 +12,8 @@ from app.schemas.user import (
     UserUpdateRequestScheme,
 )
 from app.services.base import Service
+from app.utils.conditional import Version
+from app.utils.schemas import list_adapter
 
 logger = getLogger(__name__)
 
@@ -27,6 +29,14 @@ class UserService(Service):
         new_user = await self.user_repository.create_user(scheme=scheme)
         return UserSchemeDetailResponseScheme.from_orm(new_user)
 
+    async def get_user_version(self, user_id: UUID) -> Version | None:
+        updated_at = await self.user_repository.get_user_updated_at(
+            user_id=user_id
+        )
+        if updated_at is None:
+            return None
+        return Version(user_id, updated_at, last_modified=updated_at)
+
     async def get_user_by_id(
         self, user_id: UUID
     ) -> UserSchemeDetailResponseScheme:
@@ -60,7 +70,7 @@ class UserService(Service):
         raw_users = await self.user_repository.get_users_list_by_attributes(
             page=page, limit=limit
         )
-        users = [
-            UserSchemeDetailResponseScheme.from_orm(user) for user in raw_users
-        ]
+        users = list_adapter(UserSchemeDetailResponseScheme).validate_python(
+            raw_users
+        )
         return UsersListResponseScheme(users=users)
@@ -18,6 +18,7 @@ from app.schemas.user_request import (
     UserRequestListDetailResponseScheme,
 )
 from app.services.base import Service
+from app.utils.schemas import list_adapter
 from app.utils.validators.user import UserValidator
 
 
@@ -56,10 +57,9 @@ class UserActionService(Service):
         raw_requests = await self.user_request_repository.get_user_requests_list_by_attributes(
             page=page, limit=limit, user_id=user.user_id
         )
-        requests = [
-            UserRequestDetailResponseScheme.from_orm(request)
-            for request in raw_requests
-        ]
+        requests = list_adapter(
+            UserRequestDetailResponseScheme
+        ).validate_python(raw_requests)
         return UserRequestListDetailResponseScheme(requests=requests)
 
     async def list_company_requests_for_user(
@@ -68,10 +68,9 @@ class UserActionService(Service):
         raw_invitations = await self.company_request_repository.get_company_requests_list_by_attributes(
             page=page, limit=limit, user_id=user.user_id
         )
-        invitations = [
-            CompanyRequestDetailResponseScheme.from_orm(invitation)
-            for invitation in raw_invitations
-        ]
+        invitations = list_adapter(
+            CompanyRequestDetailResponseScheme
+        ).validate_python(raw_invitations)
         return CompanyRequestListDetailResponseScheme(requests=invitations)
 
     @validator.validate_company_invitation
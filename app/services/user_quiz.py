@@ -1,24 +1,43 @@
 import json
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import partial
 from io import StringIO
+from typing import AsyncIterator, Sequence
 from uuid import UUID
 
-import pandas as pd
+from sqlalchemy import RowMapping
 
-from app.core.constants import USER_QUIZ_ANSWERS_EXPIRE_TIME
+from app.core.constants import (
+    EXPORT_CHUNK_SIZE,
+    SCORE_PERCENTILES,
+    USER_QUIZ_ANSWERS_EXPIRE_TIME,
+)
 from app.db.models import User
+from app.db.postgres import on_commit
 from app.repositories.company_member import CompanyMemberRepository
 from app.repositories.quiz import QuizRepository
+from app.repositories.score_histogram import ScoreHistogramRepository
+from app.repositories.score_total import ScoreTotalRepository
 from app.repositories.user_quiz import UserQuizRepository
 from app.repositories.user_quiz_answers import UserQuizAnswersRepository
 from app.schemas.analytics import (
     AverageScoreScheme,
     CompanyMemberLastPassingQuizScheme,
+    CompanyMemberQuizAverageScoresScheme,
     CompanyMemberUserQuizAverageScoreScheme,
+    CompanyScoreDistributionScheme,
+    LeaderboardEntryScheme,
+    LeaderboardRankScheme,
+    LeaderboardScheme,
     ListCompanyMemberLastPassingQuizScheme,
+    ListCompanyMemberQuizAverageScoresScheme,
     ListCompanyMemberUserQuizAverageScoreScheme,
+    ListQuizScoreDistributionScheme,
     ListUserQuizAverageScoreScheme,
     ListUserQuizLastPassingScheme,
+    QuizScoreDistributionScheme,
+    ScoreBucketScheme,
+    ScoreMatrixScheme,
     UserQuizAverageScoreScheme,
     UserQuizLastPassingScheme,
 )
@@ -28,9 +47,26 @@ from app.schemas.user_quiz import (
     UserQuizCreateScheme,
     UserQuizDetailScheme,
 )
+from app.services.answers_version import (
+    company_answers_version_key,
+    drop_answers_versions,
+    get_answers_version,
+    quiz_answers_version_key,
+    user_answers_version_key,
+)
 from app.services.base import Service
+from app.services.leaderboard import (
+    add_attempt_to_leaderboards,
+    company_leaderboard_key,
+    fill_leaderboard,
+    quiz_leaderboard_key,
+)
 from app.services.redis import RedisService
 from app.utils.generics import ResponseFileType
+from app.utils.histogram import merge_counts, percentile, score_bucket
+from app.utils.metrics import EXPORT_BYTES
+from app.utils.schemas import list_adapter
+from app.utils.stats import track_time
 from app.utils.validators.quiz import QuizAnswerValidator
 
 
@@ -42,6 +78,8 @@ class UserQuizService(Service):
         self.quiz_repo = QuizRepository(session)
         self.user_quiz_repo = UserQuizRepository(session)
         self.user_quiz_answers_repo = UserQuizAnswersRepository(session)
+        self.score_histogram_repo = ScoreHistogramRepository(session)
+        self.score_total_repo = ScoreTotalRepository(session)
         self.redis = RedisService()
         super().__init__(session)
 
@@ -83,6 +121,55 @@ class UserQuizService(Service):
             )
         return correct_answers_sum / question_count_sum
 
+    @staticmethod
+    def _build_score_distribution(counts: dict[int, int]) -> dict:
+        return dict(
+            attempts=sum(counts.values()),
+            median=percentile(counts, 50),
+            percentiles={
+                f"p{p}": percentile(counts, p) for p in SCORE_PERCENTILES
+            },
+            histogram=[
+                ScoreBucketScheme(score=score, count=counts[score])
+                for score in sorted(counts)
+            ],
+        )
+
+    @staticmethod
+    def _build_user_quizzes(
+        rows: Sequence[RowMapping],
+    ) -> ListUserQuizDetailScheme:
+        """
+        Group flat user quiz answer rows by user_quiz_id and validate
+        the whole list at once.
+        """
+        user_quizzes: dict[UUID, dict] = {}
+        for row in rows:
+            user_quiz_id = row["user_quiz_id"]
+            if (user_quiz := user_quizzes.get(user_quiz_id)) is None:
+                user_quiz = user_quizzes[user_quiz_id] = {
+                    "user_quiz_id": user_quiz_id,
+                    "user_id": row["user_id"],
+                    "quiz_id": row["quiz_id"],
+                    "correct_answers_count": row["correct_answers_count"],
+                    "total_questions": row["total_questions"],
+                    "attempt_time": row["attempt_time"],
+                    "answers": [],
+                }
+            if row["user_answer_id"] is not None:
+                user_quiz["answers"].append(
+                    {
+                        "user_answer_id": row["user_answer_id"],
+                        "user_quiz_id": user_quiz_id,
+                        "question_id": row["question_id"],
+                        "answer_id": row["answer_id"],
+                    }
+                )
+        list_user_quizzes = list_adapter(UserQuizDetailScheme).validate_python(
+            list(user_quizzes.values())
+        )
+        return ListUserQuizDetailScheme(user_quizzes=list_user_quizzes)
+
     @staticmethod
     def _export_user_quizzes_to_json(scheme: ListUserQuizDetailScheme) -> str:
         json_dump = scheme.model_dump_json(exclude_unset=True)
@@ -90,6 +177,9 @@ class UserQuizService(Service):
 
     @staticmethod
     def _export_user_quizzes_to_csv(scheme: ListUserQuizDetailScheme) -> str:
+        # pandas is heavy to import and only needed for csv export
+        import pandas as pd
+
         json_dump = scheme.model_dump_json(exclude_unset=True)
         json_data = json.loads(json_dump)
         normalize_data = pd.json_normalize(
@@ -120,13 +210,22 @@ class UserQuizService(Service):
     def export_user_quizzes(
         self, scheme: ListUserQuizDetailScheme, file_type: ResponseFileType
     ) -> str:
-        match file_type:
-            case "json":
-                return self._export_user_quizzes_to_json(scheme=scheme)
-            case "csv":
-                return self._export_user_quizzes_to_csv(scheme=scheme)
-            case _:
-                raise ValueError(f"Invalid file type: {file_type}")
+        with track_time("serialization_time"):
+            match file_type:
+                case "json":
+                    return self._export_user_quizzes_to_json(scheme=scheme)
+                case "csv":
+                    return self._export_user_quizzes_to_csv(scheme=scheme)
+                case _:
+                    raise ValueError(f"Invalid file type: {file_type}")
+
+    @staticmethod
+    async def stream_export(content: str) -> AsyncIterator[bytes]:
+        data = content.encode()
+        for start in range(0, len(data), EXPORT_CHUNK_SIZE):
+            chunk = data[start : start + EXPORT_CHUNK_SIZE]
+            EXPORT_BYTES.inc(amount=len(chunk))
+            yield chunk
 
     @validator.validate_quiz_exist_and_active_by_quiz_id
     @validator.validate_user_is_company_member_or_owner_by_quiz_id
@@ -150,15 +249,43 @@ class UserQuizService(Service):
             total_questions=question_count,
         )
         user_quiz_id = raw_user_quiz.user_quiz_id
+        attempt_time = raw_user_quiz.attempt_time
         for question in scheme.questions:
             question_id = question.question_id
             for answer in question.answers:
                 answer_id = answer.answer_id
                 await self.user_quiz_answers_repo.create_user_quiz_answer(
                     user_quiz_id=user_quiz_id,
+                    attempt_time=attempt_time,
                     question_id=question_id,
                     answer_id=answer_id,
                 )
+        # the company leaderboard ranks active members, not the owner
+        is_member = await self.company_member_repo.is_active_member(
+            company_id=raw_nested_quiz.company_id, user_id=user.user_id
+        )
+        on_commit(
+            self.session,
+            partial(
+                add_attempt_to_leaderboards,
+                company_id=raw_nested_quiz.company_id if is_member else None,
+                quiz_id=quiz_id,
+                user_id=user.user_id,
+                correct_answers_count=correct_answer_count,
+                total_questions=question_count,
+            ),
+        )
+        on_commit(
+            self.session,
+            partial(
+                drop_answers_versions,
+                [
+                    user_answers_version_key(user.user_id),
+                    quiz_answers_version_key(quiz_id),
+                    company_answers_version_key(raw_nested_quiz.company_id),
+                ],
+            ),
+        )
 
         raw_nested_user_quiz = await self.user_quiz_repo.get_nested_user_quiz(
             user_quiz_id=user_quiz_id
@@ -171,6 +298,27 @@ class UserQuizService(Service):
             value=user_quiz.model_dump_json(exclude_unset=True),
             expire=USER_QUIZ_ANSWERS_EXPIRE_TIME,
         )
+
+        # rows shared with concurrent attempts are updated last, their
+        # locks are held only until the commit
+        await self.user_quiz_repo.set_last_attempt(
+            quiz_id=quiz_id,
+            company_id=raw_nested_quiz.company_id,
+            user_id=user.user_id,
+            attempt_time=attempt_time,
+        )
+        await self.score_total_repo.add_attempt(
+            user_id=user.user_id,
+            company_id=raw_nested_quiz.company_id,
+            correct_answers_count=correct_answer_count,
+            total_questions=question_count,
+        )
+        await self.score_histogram_repo.add_score(
+            quiz_id=quiz_id,
+            company_id=raw_nested_quiz.company_id,
+            day=attempt_time.astimezone(timezone.utc).date(),
+            bucket=score_bucket(correct_answer_count, question_count),
+        )
         return user_quiz
 
     @validator.validate_user_quiz_is_exist_by_user_quiz_id
@@ -188,59 +336,71 @@ class UserQuizService(Service):
         member = await self.company_member_repo.get_member_by_attributes(
             member_id=company_member_id
         )
-        correct_answers_sum = (
-            await self.user_quiz_repo.get_sum_correct_answers_count_by_user(
-                user_id=member.user_id, company_id=member.company_id
-            )
-        )
-
-        question_count_sum = (
-            await self.user_quiz_repo.get_sum_total_questions_by_user(
-                user_id=member.user_id, company_id=member.company_id
-            )
+        total = await self.score_total_repo.get_company_user_score_total(
+            company_id=member.company_id, user_id=member.user_id
         )
         score = self._get_average_score(
-            correct_answers_sum, question_count_sum
+            total.correct_answers_count, total.total_questions
         )
         return AverageScoreScheme(average_score=score)
 
     @validator.validate_user_has_user_quiz
     async def average_user_score(self, user_id: UUID):
-        correct_answers_sum = (
-            await self.user_quiz_repo.get_sum_correct_answers_count_by_user(
-                user_id=user_id,
-            )
-        )
-
-        question_count_sum = (
-            await self.user_quiz_repo.get_sum_total_questions_by_user(
-                user_id=user_id,
-            )
+        total = await self.score_total_repo.get_user_score_total(
+            user_id=user_id
         )
         score = self._get_average_score(
-            correct_answers_sum, question_count_sum
+            total.correct_answers_count, total.total_questions
         )
         return AverageScoreScheme(average_score=score)
 
+    # version tokens of the exports, cached exports are keyed by them
+
+    async def get_user_answers_version(self, user: User) -> str:
+        return await get_answers_version(
+            user_answers_version_key(user.user_id)
+        )
+
+    @validator.validate_user_is_owner_or_admin_by_company_member_id
+    async def get_company_member_answers_version(
+        self, member_id: UUID, user: User
+    ) -> str:
+        member = await self.company_member_repo.get_member_by_attributes(
+            member_id=member_id
+        )
+        return await get_answers_version(
+            user_answers_version_key(member.user_id)
+        )
+
+    @validator.validate_exist_company_is_active
+    @validator.validate_user_is_owner_or_admin_by_company_id
+    async def get_company_members_answers_version(
+        self, company_id: UUID, user: User
+    ) -> str:
+        return await get_answers_version(
+            company_answers_version_key(company_id)
+        )
+
+    @validator.validate_quiz_exist_and_active_by_quiz_id
+    @validator.validate_user_is_company_member_or_owner_by_quiz_id
+    async def get_quiz_answers_version(self, quiz_id: UUID, user: User) -> str:
+        return await get_answers_version(quiz_answers_version_key(quiz_id))
+
     async def get_all_user_quizzes(
-        self, user: User
+        self, user: User, version: str
     ) -> ListUserQuizDetailScheme:
-        if cache := await self.redis.get_value(f"user_answers:{user.user_id}"):
+        key = f"user_answers:{user.user_id}:{version}"
+        if cache := await self.redis.get_value(key):
             return ListUserQuizDetailScheme.parse_raw(cache)
 
-        raw_nested_user_quizzes = (
-            await self.user_quiz_repo.get_nested_user_quizzes_by_user_id(
-                user_id=user.user_id
-            )
+        rows = await self.user_quiz_repo.get_user_quiz_rows_by_user_id(
+            user_id=user.user_id
         )
-        list_user_quizzes = [
-            UserQuizDetailScheme.from_orm(uq) for uq in raw_nested_user_quizzes
-        ]
-        user_quizzes = ListUserQuizDetailScheme(user_quizzes=list_user_quizzes)
+        user_quizzes = self._build_user_quizzes(rows)
 
         # add to redis
         await self.redis.set_value(
-            key=f"user_answers:{user.user_id}",
+            key=key,
             value=user_quizzes.model_dump_json(exclude_unset=True),
             expire=USER_QUIZ_ANSWERS_EXPIRE_TIME,
         )
@@ -249,24 +409,20 @@ class UserQuizService(Service):
 
     @validator.validate_user_is_owner_or_admin_by_company_member_id
     async def get_company_member_quizzes(
-        self, member_id: UUID, user: User
+        self, member_id: UUID, user: User, version: str
     ) -> ListUserQuizDetailScheme:
-        if cache := await self.redis.get_value(f"member_answers:{member_id}"):
+        key = f"member_answers:{member_id}:{version}"
+        if cache := await self.redis.get_value(key):
             return ListUserQuizDetailScheme.parse_raw(cache)
 
-        raw_nested_user_quizzes = (
-            await self.user_quiz_repo.get_nested_user_quizzes_by_member_id(
-                member_id=member_id,
-            )
+        rows = await self.user_quiz_repo.get_user_quiz_rows_by_member_id(
+            member_id=member_id,
         )
-        list_user_quizzes = [
-            UserQuizDetailScheme.from_orm(uq) for uq in raw_nested_user_quizzes
-        ]
-        user_quizzes = ListUserQuizDetailScheme(user_quizzes=list_user_quizzes)
+        user_quizzes = self._build_user_quizzes(rows)
 
         # add to redis
         await self.redis.set_value(
-            key=f"member_answers:{member_id}",
+            key=key,
             value=user_quizzes.model_dump_json(exclude_unset=True),
             expire=USER_QUIZ_ANSWERS_EXPIRE_TIME,
         )
@@ -275,26 +431,20 @@ class UserQuizService(Service):
     @validator.validate_exist_company_is_active
     @validator.validate_user_is_owner_or_admin_by_company_id
     async def get_all_company_members_quizzes(
-        self, company_id: UUID, user: User
+        self, company_id: UUID, user: User, version: str
     ) -> ListUserQuizDetailScheme:
-        if cache := await self.redis.get_value(
-            f"members_answers:{company_id}"
-        ):
+        key = f"members_answers:{company_id}:{version}"
+        if cache := await self.redis.get_value(key):
             return ListUserQuizDetailScheme.parse_raw(cache)
 
-        raw_nested_user_quizzes = (
-            await self.user_quiz_repo.get_nested_quizzes_by_company_id(
-                company_id=company_id
-            )
+        rows = await self.user_quiz_repo.get_user_quiz_rows_by_company_id(
+            company_id=company_id
         )
-        list_user_quizzes = [
-            UserQuizDetailScheme.from_orm(uq) for uq in raw_nested_user_quizzes
-        ]
-        user_quizzes = ListUserQuizDetailScheme(user_quizzes=list_user_quizzes)
+        user_quizzes = self._build_user_quizzes(rows)
 
         # add to redis
         await self.redis.set_value(
-            key=f"members_answers:{company_id}",
+            key=key,
             value=user_quizzes.model_dump_json(exclude_unset=True),
             expire=USER_QUIZ_ANSWERS_EXPIRE_TIME,
         )
@@ -303,24 +453,20 @@ class UserQuizService(Service):
     @validator.validate_quiz_exist_and_active_by_quiz_id
     @validator.validate_user_is_company_member_or_owner_by_quiz_id
     async def get_all_quiz_answers(
-        self, quiz_id: UUID, user: User
+        self, quiz_id: UUID, user: User, version: str
     ) -> ListUserQuizDetailScheme:
-        if cache := await self.redis.get_value(f"quiz_answers:{quiz_id}"):
+        key = f"quiz_answers:{quiz_id}:{version}"
+        if cache := await self.redis.get_value(key):
             return ListUserQuizDetailScheme.parse_raw(cache)
 
-        raw_nested_user_quizzes = (
-            await self.user_quiz_repo.get_nested_quizzes_by_quiz_id(
-                quiz_id=quiz_id,
-            )
+        rows = await self.user_quiz_repo.get_user_quiz_rows_by_quiz_id(
+            quiz_id=quiz_id,
         )
-        list_user_quizzes = [
-            UserQuizDetailScheme.from_orm(uq) for uq in raw_nested_user_quizzes
-        ]
-        user_quizzes = ListUserQuizDetailScheme(user_quizzes=list_user_quizzes)
+        user_quizzes = self._build_user_quizzes(rows)
 
         # add to redis
         await self.redis.set_value(
-            key=f"quiz_answers:{quiz_id}",
+            key=key,
             value=user_quizzes.model_dump_json(exclude_unset=True),
             expire=USER_QUIZ_ANSWERS_EXPIRE_TIME,
         )
@@ -417,6 +563,38 @@ class UserQuizService(Service):
         ]
         return ListUserQuizAverageScoreScheme(quizzes=quizzes_list)
 
+    @validator.validate_from_date_and_to_date
+    @validator.validate_exist_company_is_active
+    @validator.validate_user_is_owner_or_admin_by_company_id
+    async def get_company_score_matrix(
+        self,
+        company_id: UUID,
+        from_date: datetime,
+        to_date: datetime,
+        user: User,
+    ) -> ScoreMatrixScheme:
+        # numpy is only needed for the matrix
+        from app.utils.score_matrix import build_score_matrix
+
+        member_ids = await self.company_member_repo.get_active_member_ids(
+            company_id=company_id
+        )
+        quiz_ids = await self.quiz_repo.get_active_quiz_ids(
+            company_id=company_id
+        )
+        repo = self.user_quiz_repo
+        statistics = (
+            await repo.get_statistic_for_each_member_and_quiz_by_company_id(
+                company_id=company_id, from_date=from_date, to_date=to_date
+            )
+        )
+        return ScoreMatrixScheme(
+            company_id=company_id,
+            member_ids=member_ids,
+            quiz_ids=quiz_ids,
+            scores=build_score_matrix(member_ids, quiz_ids, statistics),
+        )
+
     @validator.validate_exist_company_is_active
     @validator.validate_user_is_owner_or_admin_by_company_id
     async def get_company_members_with_last_pass_quiz_time(
@@ -432,3 +610,221 @@ class UserQuizService(Service):
             for member_id, last_passing in statistics
         ]
         return ListCompanyMemberLastPassingQuizScheme(members=members_list)
+
+    @validator.validate_from_date_and_to_date
+    @validator.validate_quiz_exist_and_active_by_quiz_id
+    @validator.validate_user_is_company_member_or_owner_by_quiz_id
+    async def get_quiz_score_distribution(
+        self,
+        quiz_id: UUID,
+        from_date: datetime,
+        to_date: datetime,
+        user: User,
+    ):
+        histograms = await self.score_histogram_repo.get_quiz_histograms(
+            quiz_id=quiz_id, from_day=from_date.date(), to_day=to_date.date()
+        )
+        return QuizScoreDistributionScheme(
+            quiz_id=quiz_id,
+            **self._build_score_distribution(merge_counts(histograms)),
+        )
+
+    @validator.validate_from_date_and_to_date
+    @validator.validate_exist_company_is_active
+    @validator.validate_user_is_owner_or_admin_by_company_id
+    async def get_company_score_distribution(
+        self,
+        company_id: UUID,
+        from_date: datetime,
+        to_date: datetime,
+        user: User,
+    ):
+        histograms = await self.score_histogram_repo.get_company_histograms(
+            company_id=company_id,
+            from_day=from_date.date(),
+            to_day=to_date.date(),
+        )
+        return CompanyScoreDistributionScheme(
+            company_id=company_id,
+            **self._build_score_distribution(merge_counts(histograms)),
+        )
+
+    # batch analytics, one validation and one grouped query for all ids
+
+    @validator.validate_from_date_and_to_date
+    @validator.validate_user_is_owner_or_admin_by_member_ids
+    async def get_average_score_for_each_quiz_by_company_members(
+        self,
+        member_ids: list[UUID],
+        from_date: datetime,
+        to_date: datetime,
+        user: User,
+    ):
+        member_ids = list(dict.fromkeys(member_ids))
+        repo = self.user_quiz_repo
+        statistics = (
+            await repo.get_statistic_for_each_quiz_for_company_members(
+                member_ids=member_ids, from_date=from_date, to_date=to_date
+            )
+        )
+        quizzes = {member_id: [] for member_id in member_ids}
+        for member_id, quiz_id, total_questions, correct_answers in statistics:
+            quizzes[member_id].append(
+                UserQuizAverageScoreScheme(
+                    quiz_id=quiz_id,
+                    average_score=self._get_average_score(
+                        correct_answers, total_questions
+                    ),
+                )
+            )
+        members_list = [
+            CompanyMemberQuizAverageScoresScheme(
+                member_id=member_id, quizzes=member_quizzes
+            )
+            for member_id, member_quizzes in quizzes.items()
+        ]
+        return ListCompanyMemberQuizAverageScoresScheme(members=members_list)
+
+    @validator.validate_user_is_owner_or_admin_by_member_ids
+    async def average_company_members_score(
+        self, member_ids: list[UUID], user: User
+    ):
+        totals = await self.score_total_repo.get_company_member_score_totals(
+            member_ids=set(member_ids)
+        )
+        members_list = [
+            CompanyMemberUserQuizAverageScoreScheme(
+                member_id=member_id,
+                average_score=self._get_average_score(
+                    correct_answers_count, total_questions
+                ),
+            )
+            for member_id, correct_answers_count, total_questions in totals
+        ]
+        return ListCompanyMemberUserQuizAverageScoreScheme(
+            members=members_list
+        )
+
+    @validator.validate_from_date_and_to_date
+    @validator.validate_user_is_company_member_or_owner_by_quiz_ids
+    async def get_score_distribution_for_quizzes(
+        self,
+        quiz_ids: list[UUID],
+        from_date: datetime,
+        to_date: datetime,
+        user: User,
+    ):
+        quiz_ids = list(dict.fromkeys(quiz_ids))
+        rows = await self.score_histogram_repo.get_histograms_for_quizzes(
+            quiz_ids=quiz_ids,
+            from_day=from_date.date(),
+            to_day=to_date.date(),
+        )
+        histograms = {quiz_id: [] for quiz_id in quiz_ids}
+        for quiz_id, counts in rows:
+            histograms[quiz_id].append(counts)
+        quizzes_list = [
+            QuizScoreDistributionScheme(
+                quiz_id=quiz_id,
+                **self._build_score_distribution(
+                    merge_counts(quiz_histograms)
+                ),
+            )
+            for quiz_id, quiz_histograms in histograms.items()
+        ]
+        return ListQuizScoreDistributionScheme(quizzes=quizzes_list)
+
+    # leaderboards
+
+    async def _fill_company_leaderboard(self, company_id: UUID):
+        sums = await self.user_quiz_repo.get_score_sums_for_each_company_user(
+            company_id=company_id
+        )
+        await fill_leaderboard(
+            company_leaderboard_key(company_id),
+            [(user_id, correct, total) for _, user_id, correct, total in sums],
+        )
+
+    async def _fill_quiz_leaderboard(self, quiz_id: UUID):
+        sums = await self.user_quiz_repo.get_score_sums_for_each_quiz_user(
+            quiz_id=quiz_id
+        )
+        await fill_leaderboard(
+            quiz_leaderboard_key(quiz_id),
+            [(user_id, correct, total) for _, user_id, correct, total in sums],
+        )
+
+    async def _get_leaderboard_page(
+        self, key: str, fill, page: int, limit: int
+    ) -> LeaderboardScheme:
+        # lost or never read leaderboards are filled from Postgres once
+        if not await self.redis.is_ranking_filled(key):
+            await fill()
+        offset = (page - 1) * limit
+        members, total = await self.redis.get_ranking_page(
+            key, offset=offset, limit=limit
+        )
+        entries = [
+            LeaderboardEntryScheme(
+                rank=offset + i + 1, user_id=member, average_score=score
+            )
+            for i, (member, score) in enumerate(members)
+        ]
+        return LeaderboardScheme(total=total, entries=entries)
+
+    async def _get_leaderboard_rank(
+        self, key: str, fill, user: User
+    ) -> LeaderboardRankScheme:
+        if not await self.redis.is_ranking_filled(key):
+            await fill()
+        rank, score, total = await self.redis.get_ranking_position(
+            key, str(user.user_id)
+        )
+        entry = None
+        if rank is not None:
+            entry = LeaderboardEntryScheme(
+                rank=rank + 1, user_id=user.user_id, average_score=score
+            )
+        return LeaderboardRankScheme(total=total, entry=entry)
+
+    @validator.validate_exist_company_is_active
+    @validator.validate_user_is_company_member_or_owner_by_company_id
+    async def get_company_leaderboard(
+        self, company_id: UUID, page: int, limit: int, user: User
+    ):
+        return await self._get_leaderboard_page(
+            company_leaderboard_key(company_id),
+            partial(self._fill_company_leaderboard, company_id),
+            page=page,
+            limit=limit,
+        )
+
+    @validator.validate_exist_company_is_active
+    @validator.validate_user_is_company_member_or_owner_by_company_id
+    async def get_company_leaderboard_rank(self, company_id: UUID, user: User):
+        return await self._get_leaderboard_rank(
+            company_leaderboard_key(company_id),
+            partial(self._fill_company_leaderboard, company_id),
+            user=user,
+        )
+
+    @validator.validate_quiz_exist_and_active_by_quiz_id
+    @validator.validate_user_is_company_member_or_owner_by_quiz_id
+    async def get_quiz_leaderboard(
+        self, quiz_id: UUID, page: int, limit: int, user: User
+    ):
+        return await self._get_leaderboard_page(
+            quiz_leaderboard_key(quiz_id),
+            partial(self._fill_quiz_leaderboard, quiz_id),
+            page=page,
+            limit=limit,
+        )
+
+    @validator.validate_quiz_exist_and_active_by_quiz_id
+    @validator.validate_user_is_company_member_or_owner_by_quiz_id
+    async def get_quiz_leaderboard_rank(self, quiz_id: UUID, user: User):
+        return await self._get_leaderboard_rank(
+            quiz_leaderboard_key(quiz_id),
+            partial(self._fill_quiz_leaderboard, quiz_id),
+            user=user,
+        )
@@ -0,0 +1,96 @@
+"""
+Conditional GET with ETag / If-None-Match and Last-Modified /
+If-Modified-Since.
+
+A representation is identified by cheap version markers, updated_at
+columns or version tokens, read before the entity is loaded. A request
+holding the current version is answered with 304 and no body.
+"""
+
+import datetime
+import hashlib
+from email.utils import format_datetime, parsedate_to_datetime
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.constants import PUBLIC_CACHE_MAX_AGE
+
+# stored by the client and revalidated on every use
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+PUBLIC_CACHE_CONTROL = f"public, max-age={PUBLIC_CACHE_MAX_AGE}"
+
+
+class Version:
+    """
+    Validators of a representation, the ETag is a digest of the markers.
+    """
+
+    __slots__ = ("etag", "last_modified")
+
+    def __init__(
+        self, *markers, last_modified: datetime.datetime | None = None
+    ):
+        digest = hashlib.blake2b(repr(markers).encode(), digest_size=12)
+        self.etag = f'"{digest.hexdigest()}"'
+        self.last_modified = last_modified
+
+    def headers(
+        self, cache_control: str = PRIVATE_CACHE_CONTROL
+    ) -> dict[str, str]:
+        headers = {"ETag": self.etag, "Cache-Control": cache_control}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(
+                self.last_modified.astimezone(datetime.timezone.utc),
+                usegmt=True,
+            )
+        return headers
+
+    def _modified_since(self, value: str) -> bool:
+        try:
+            since = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return True
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=datetime.timezone.utc)
+        # Last-Modified is sent in whole seconds
+        return self.last_modified.replace(microsecond=0) > since
+
+    def matches(self, request: Request) -> bool:
+        """
+        Whether the request holds this version, If-None-Match takes
+        precedence over If-Modified-Since.
+        """
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            # weak comparison, as for GET
+            tags = {
+                tag.strip().removeprefix("W/")
+                for tag in if_none_match.split(",")
+            }
+            return "*" in tags or self.etag in tags
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since is None or self.last_modified is None:
+            return False
+        return not self._modified_since(if_modified_since)
+
+
+def version_headers(
+    version: Version | None, cache_control: str = PRIVATE_CACHE_CONTROL
+) -> dict[str, str]:
+    if version is None:
+        return {"Cache-Control": cache_control}
+    return version.headers(cache_control)
+
+
+def not_modified(
+    request: Request,
+    version: Version | None,
+    cache_control: str = PRIVATE_CACHE_CONTROL,
+) -> Response | None:
+    """
+    304 response for a request holding the current version, else None.
+    """
+    if version is None or not version.matches(request):
+        return None
+    return Response(status_code=304, headers=version.headers(cache_control))
@@ -0,0 +1,44 @@
+"""
+Score histograms, attempts count by score percent.
+
+Histograms of any periods merge by adding the counts, percentiles are
+read from the merged counts in time independent of the attempts number.
+"""
+
+from typing import Iterable, Mapping
+
+
+def score_bucket(correct_answers_count: int, total_questions: int) -> int:
+    """
+    Score percent rounded down, 0 - 100.
+    """
+    if total_questions <= 0:
+        return 0
+    score = correct_answers_count * 100 // total_questions
+    return max(0, min(score, 100))
+
+
+def merge_counts(histograms: Iterable[Mapping]) -> dict[int, int]:
+    merged: dict[int, int] = {}
+    for counts in histograms:
+        for bucket, count in counts.items():
+            bucket = int(bucket)
+            merged[bucket] = merged.get(bucket, 0) + count
+    return merged
+
+
+def percentile(counts: Mapping[int, int], p: float) -> float | None:
+    """
+    Nearest rank percentile of the scores, None for an empty histogram.
+    """
+    total = sum(counts.values())
+    if total == 0:
+        return None
+    # the rank of the first value at or above p percent of the values
+    rank = max(1, -(-total * p // 100))
+    seen = 0
+    for bucket in sorted(counts):
+        seen += counts[bucket]
+        if seen >= rank:
+            return float(bucket)
+    return float(max(counts))
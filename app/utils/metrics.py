@@ -0,0 +1,320 @@
+"""
+In-process metrics in the Prometheus text format.
+
+Values are plain dicts updated from the event loop thread, so recording
+a sample takes no lock. With several workers every worker periodically
+writes its snapshot to METRICS_DIR and a scrape merges the snapshots of
+all live workers.
+"""
+
+import asyncio
+import json
+import os
+import time
+from bisect import bisect_left
+from functools import cache
+from pathlib import Path
+from typing import Any, Iterable
+
+from app.core.constants import METRICS_FLUSH_INTERVAL, METRICS_STALE_AFTER
+from app.core.settings import get_app_settings
+
+type Snapshot = dict[str, dict[str, Any]]
+
+DEFAULT_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: dict[str, "_Metric"] = {}
+
+    def register(self, metric: "_Metric"):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+
+    def snapshot(self) -> Snapshot:
+        return {
+            name: metric.snapshot() for name, metric in self._metrics.items()
+        }
+
+
+REGISTRY = MetricsRegistry()
+
+
+class _Metric:
+    type: str
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        registry: MetricsRegistry = REGISTRY,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple[str, ...], Any] = {}
+        registry.register(self)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "type": self.type,
+            "help": self.documentation,
+            "labelnames": list(self.labelnames),
+            "samples": [
+                [list(labels), value] for labels, value in self._values.items()
+            ],
+        }
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, *labels: str, amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+
+class Gauge(_Metric):
+    type = "gauge"
+
+    def inc(self, *labels: str, amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels: str, amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) - amount
+
+    def set(self, value: float, *labels: str):
+        self._values[labels] = value
+
+
+class Histogram(_Metric):
+    """
+    Per bucket (not cumulative) counts followed by sum and count.
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self, *args, buckets: Iterable[float] = DEFAULT_BUCKETS, **kw
+    ):
+        super().__init__(*args, **kw)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str):
+        values = self._values.get(labels)
+        if values is None:
+            # one slot per bucket, +Inf, sum and count
+            values = self._values[labels] = [0] * (len(self.buckets) + 3)
+        values[bisect_left(self.buckets, value)] += 1
+        values[-2] += value
+        values[-1] += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        snapshot = super().snapshot()
+        snapshot["buckets"] = list(self.buckets)
+        return snapshot
+
+
+def merge_snapshots(snapshots: Iterable[Snapshot]) -> Snapshot:
+    """
+    Sum samples of the same metric and labels across workers.
+    """
+    merged: Snapshot = {}
+    for snapshot in snapshots:
+        for name, metric in snapshot.items():
+            target = merged.setdefault(name, {**metric, "samples": {}})
+            samples = target["samples"]
+            for labels, value in metric["samples"]:
+                key = tuple(labels)
+                if key not in samples:
+                    samples[key] = (
+                        list(value) if isinstance(value, list) else value
+                    )
+                elif isinstance(value, list):
+                    samples[key] = [a + b for a, b in zip(samples[key], value)]
+                else:
+                    samples[key] += value
+    for metric in merged.values():
+        metric["samples"] = list(metric["samples"].items())
+    return merged
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [
+        f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)
+    ]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def render(snapshot: Snapshot) -> str:
+    lines = []
+    for name, metric in sorted(snapshot.items()):
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['type']}")
+        labelnames = metric["labelnames"]
+        for labels, value in metric["samples"]:
+            if metric["type"] != "histogram":
+                lines.append(
+                    f"{name}{_format_labels(labelnames, labels)} {value}"
+                )
+                continue
+            cumulative = 0
+            bounds = [*metric["buckets"], "+Inf"]
+            for bound, count in zip(bounds, value):
+                cumulative += count
+                bucket_labels = _format_labels(
+                    [*labelnames, "le"], [*labels, bound]
+                )
+                lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+            label_str = _format_labels(labelnames, labels)
+            lines.append(f"{name}_sum{label_str} {value[-2]}")
+            lines.append(f"{name}_count{label_str} {value[-1]}")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsExporter:
+    """
+    Share the worker snapshot with other workers through a directory.
+    """
+
+    def __init__(
+        self,
+        directory: str | None,
+        flush_interval: float,
+        stale_after: float,
+        registry: MetricsRegistry = REGISTRY,
+    ):
+        self._directory = Path(directory) if directory else None
+        self._flush_interval = flush_interval
+        self._stale_after = stale_after
+        self._registry = registry
+        self._task: asyncio.Task | None = None
+
+    @property
+    def _file(self) -> Path:
+        return self._directory / f"{os.getpid()}.json"
+
+    def flush(self):
+        tmp = self._file.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self._registry.snapshot()))
+        # atomic replace, readers never see a partial file
+        tmp.replace(self._file)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            self.flush()
+
+    def start(self):
+        if self._directory is not None and self._task is None:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            self.flush()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._file.unlink(missing_ok=True)
+
+    def _read_workers_snapshots(self) -> list[Snapshot]:
+        snapshots = []
+        now = time.time()
+        for path in self._directory.glob("*.json"):
+            if path == self._file:
+                continue
+            try:
+                if now - path.stat().st_mtime > self._stale_after:
+                    continue
+                snapshots.append(json.loads(path.read_text()))
+            except (OSError, ValueError):
+                # worker exited or replaced the file meanwhile
+                continue
+        return snapshots
+
+    def collect(self) -> Snapshot:
+        snapshots = [self._registry.snapshot()]
+        if self._directory is not None:
+            snapshots.extend(self._read_workers_snapshots())
+        return merge_snapshots(snapshots)
+
+
+@cache
+def get_metrics_exporter() -> MetricsExporter:
+    return MetricsExporter(
+        directory=get_app_settings().METRICS_DIR,
+        flush_interval=METRICS_FLUSH_INTERVAL,
+        stale_after=METRICS_STALE_AFTER,
+    )
+
+
+# http
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    labelnames=("method", "route", "status"),
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests being processed"
+)
+
+# postgres
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time waited for a connection from the pool",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Connections checked out from the pool"
+)
+DB_QUERIES = Counter(
+    "db_queries_total", "SQL statements executed", labelnames=("route",)
+)
+DB_QUERY_TIME = Counter(
+    "db_query_seconds_total",
+    "Time spent executing SQL statements",
+    labelnames=("route",),
+)
+DB_N_PLUS_ONE = Counter(
+    "db_n_plus_one_requests_total",
+    "Requests that repeated a statement N_PLUS_ONE_THRESHOLD times",
+    labelnames=("route",),
+)
+
+# redis
+REDIS_COMMAND_DURATION = Histogram(
+    "redis_command_duration_seconds",
+    "Redis command latency",
+    labelnames=("command",),
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Redis cache lookups by key prefix and result",
+    labelnames=("prefix", "result"),
+)
+
+# export
+EXPORT_BYTES = Counter("export_bytes_total", "Export bytes streamed")
@@ -1,6 +1,11 @@
-from typing import Type
+import base64
+import datetime
+from typing import Self, Sequence, Type
+from uuid import UUID
 
-from sqlalchemy import BinaryExpression, select
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import BinaryExpression, RowMapping, Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models import Base
@@ -17,16 +22,62 @@ class Paginator[Model: Type[Base]]:
         self._session = session
         self._filter_condition = filter_condition
 
-    async def paginate(self, page: int, limit: int) -> list[Model]:
+    def _build_query(self, page: int, limit: int, *entities) -> Select:
         if page < 1:
             raise AttributeError(f"Page must be >= 1, page: {page}")
         elif limit < 1:
             raise AttributeError(f"Limit must be >= 1, limit: {limit}")
 
         skip = page - 1 if page == 1 else (page - 1) * limit
-        query = select(self._model).limit(limit).offset(skip)
+        query = select(*entities).limit(limit).offset(skip)
         if self._filter_condition:
             query = query.where(*(self._filter_condition))
+        return query
+
+    async def paginate(self, page: int, limit: int) -> list[Model]:
+        query = self._build_query(page, limit, self._model)
         result = await self._session.execute(query)
         entities = result.scalars().all()
         return entities
+
+    async def paginate_rows(
+        self, page: int, limit: int
+    ) -> Sequence[RowMapping]:
+        """
+        Paginate plain table columns, skip ORM objects hydration.
+        """
+        query = self._build_query(page, limit, *self._model.__table__.c)
+        result = await self._session.execute(query)
+        return result.mappings().all()
+
+
+class TimeCursor(BaseModel):
+    """
+    Keyset pagination position, the last row time and id.
+
+    Sent to clients as an opaque url safe string.
+    """
+
+    time: datetime.datetime
+    id: UUID
+
+    def encode(self) -> str:
+        data = self.model_dump_json().encode()
+        return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, cursor: str) -> Self:
+        try:
+            data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            return cls.model_validate_json(data)
+        except (ValueError, ValidationError):
+            raise RequestValidationError(
+                [
+                    {
+                        "type": "value_error",
+                        "loc": ("query", "cursor"),
+                        "msg": "Invalid cursor",
+                        "input": cursor,
+                    }
+                ]
+            )
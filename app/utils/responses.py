@@ -0,0 +1,76 @@
+import asyncio
+from typing import Any, Callable, Coroutine
+
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from pydantic_core import to_json
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+
+from app.core.settings import app_settings
+from app.utils.stats import track_time
+
+
+class ModelJSONResponse(JSONResponse):
+    """
+    JSON response rendered straight to bytes by pydantic-core.
+    """
+
+    def render(self, content: Any) -> bytes:
+        with track_time("serialization_time"):
+            if isinstance(content, BaseModel):
+                return content.__pydantic_serializer__.to_json(
+                    content, by_alias=True
+                )
+            return to_json(content)
+
+
+class FastJSONRoute(APIRoute):
+    """
+    Route that renders a returned response model instance directly.
+
+    FastAPI re-validates the endpoint result against the response model,
+    dumps it to python objects and encodes them with stdlib json. When
+    the endpoint already returns an instance of exactly its response
+    model, the result is rendered with ModelJSONResponse instead.
+    Any other result falls back to the default FastAPI handling.
+    """
+
+    def _is_fast_json_route(self) -> bool:
+        response_class = self.response_class
+        if isinstance(response_class, DefaultPlaceholder):
+            response_class = response_class.value
+        return (
+            app_settings.FAST_JSON_RESPONSE
+            and asyncio.iscoroutinefunction(self.dependant.call)
+            and isinstance(self.response_model, type)
+            and issubclass(self.response_model, BaseModel)
+            and issubclass(response_class, JSONResponse)
+            and self.dependant.response_param_name is None
+            and self.response_model_include is None
+            and self.response_model_exclude is None
+            and self.response_model_by_alias
+            and not self.response_model_exclude_unset
+            and not self.response_model_exclude_defaults
+            and not self.response_model_exclude_none
+        )
+
+    def get_route_handler(
+        self,
+    ) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        if self._is_fast_json_route():
+            self.dependant.call = self._wrap_endpoint(self.dependant.call)
+        return super().get_route_handler()
+
+    def _wrap_endpoint(self, call: Callable) -> Callable:
+        response_model = self.response_model
+        status_code = self.status_code or 200
+
+        async def endpoint(*args, **kwargs):
+            content = await call(*args, **kwargs)
+            if type(content) is not response_model:
+                return content
+            return ModelJSONResponse(content, status_code=status_code)
+
+        return endpoint
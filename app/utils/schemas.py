@@ -1,7 +1,8 @@
 from copy import deepcopy
+from functools import cache
 from typing import Any, Optional, Tuple, Type
 
-from pydantic import BaseModel, create_model
+from pydantic import BaseModel, TypeAdapter, create_model
 from pydantic.fields import FieldInfo
 
 
@@ -32,4 +33,14 @@ def optionalise_fields(model: Type[BaseModel]):
     )
 
 
+@cache
+def list_adapter[Scheme: BaseModel](
+    scheme: Type[Scheme],
+) -> TypeAdapter[list[Scheme]]:
+    """
+    Cached TypeAdapter that validates a whole list of rows in one call.
+    """
+    return TypeAdapter(list[scheme])
+
+
 # https://dev.to/gyudoza/the-best-practice-of-handling-fastapi-schema-2g3a use it for Omit
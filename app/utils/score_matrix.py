@@ -0,0 +1,54 @@
+"""
+Member by quiz average score matrix built with numpy.
+
+Cells are placed by index arrays over the whole statistics at once, no
+per cell objects are created till the final list conversion.
+"""
+
+from typing import Sequence
+from uuid import UUID
+
+import numpy as np
+
+
+def _positions(ids: Sequence[UUID], cell_ids: Sequence[UUID]) -> np.ndarray:
+    """
+    Positions of the cell ids in the ids, -1 for the ids missing there.
+    """
+    position = {id_: i for i, id_ in enumerate(ids)}
+    return np.fromiter(
+        (position.get(id_, -1) for id_ in cell_ids),
+        dtype=np.intp,
+        count=len(cell_ids),
+    )
+
+
+def build_score_matrix(
+    member_ids: Sequence[UUID],
+    quiz_ids: Sequence[UUID],
+    statistics: Sequence[tuple[UUID, UUID, int, int]],
+) -> list[list[float | None]]:
+    """
+    Average scores with a row per member and a column per quiz in the ids
+    order, from (member_id, quiz_id, total_questions, correct_answers_count)
+    rows. None marks the quizzes not taken by the member. Rows of members
+    or quizzes missing from the ids are left out, the ids and statistics
+    are read by separate statements.
+    """
+    scores = np.full((len(member_ids), len(quiz_ids)), np.nan)
+    if statistics:
+        members, quizzes, totals, corrects = zip(*statistics)
+        totals = np.array(totals, dtype=np.float64)
+        corrects = np.array(corrects, dtype=np.float64)
+        rows = _positions(member_ids, members)
+        columns = _positions(quiz_ids, quizzes)
+        known = (rows >= 0) & (columns >= 0)
+        scores[rows[known], columns[known]] = np.divide(
+            corrects[known],
+            totals[known],
+            out=np.zeros(known.sum()),
+            where=totals[known] > 0,
+        )
+    matrix = scores.astype(object)
+    matrix[np.isnan(scores)] = None
+    return matrix.tolist()
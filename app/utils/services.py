@@ -1,10 +1,13 @@
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.settings import get_app_settings
 from app.db.postgres import get_async_session
 from app.services.company import CompanyService
 from app.services.company_action import CompanyActionService
+from app.services.health import HealthService
 from app.services.notification import NotificationSrvice
+from app.services.profiling import ProfilingService
 from app.services.quiz import QuizService
 from app.services.user import UserService
 from app.services.user_action import UserActionService
@@ -50,3 +53,11 @@ async def get_notification_service(
 ):
     async with NotificationSrvice(session=db) as service:
         yield service
+
+
+def get_health_service() -> HealthService:
+    return HealthService()
+
+
+def get_profiling_service() -> ProfilingService:
+    return ProfilingService(directory=get_app_settings().PROFILE_DIR)
@@ -0,0 +1,93 @@
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator
+
+_whitespace = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """
+    Statement text with collapsed whitespace, bound values are not part
+    of it, so repeated statements share one fingerprint.
+    """
+    return _whitespace.sub(" ", statement).strip()
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    db_time: float = 0.0
+    redis_time: float = 0.0
+    serialization_time: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+
+    def add_query(self, statement: str, duration: float):
+        self.queries += 1
+        self.db_time += duration
+        self.statements[fingerprint(statement)] += 1
+
+    def merge(self, other: "RequestStats"):
+        self.queries += other.queries
+        self.db_time += other.db_time
+        self.redis_time += other.redis_time
+        self.serialization_time += other.serialization_time
+        self.statements.update(other.statements)
+
+    def repeated(self, threshold: int) -> dict[str, int]:
+        """
+        Statements executed at least threshold times, N+1 candidates.
+        """
+        return {
+            statement: count
+            for statement, count in self.statements.items()
+            if count >= threshold
+        }
+
+    @property
+    def max_repeats(self) -> int:
+        return max(self.statements.values(), default=0)
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar(
+    "request_stats", default=None
+)
+
+
+def get_request_stats() -> RequestStats | None:
+    return _request_stats.get()
+
+
+@contextmanager
+def track_time(attribute: str) -> Iterator[None]:
+    """
+    Add the block duration to the attribute of the current request stats.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if stats := _request_stats.get():
+            duration = time.perf_counter() - start
+            setattr(stats, attribute, getattr(stats, attribute) + duration)
+
+
+@contextmanager
+def collect_request_stats() -> Iterator[RequestStats]:
+    """
+    Collect stats of the statements executed inside the block.
+
+    Nested collectors add their stats to the enclosing one on exit.
+    """
+    parent = _request_stats.get()
+    stats = RequestStats()
+    token = _request_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _request_stats.reset(token)
+        if parent is not None:
+            parent.merge(stats)
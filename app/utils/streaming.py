@@ -0,0 +1,133 @@
+import codecs
+import json
+from typing import Any, AsyncIterator, Type
+
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
+
+NDJSON_MEDIA_TYPES = (
+    "application/x-ndjson",
+    "application/ndjson",
+    "application/jsonl",
+)
+
+_decoder = json.JSONDecoder()
+_whitespace = " \t\n\r"
+
+
+def _invalid_json(index: int, msg: str) -> RequestValidationError:
+    return RequestValidationError(
+        [{"type": "json_invalid", "loc": ("body", index), "msg": msg}]
+    )
+
+
+async def iter_json_array(
+    chunks: AsyncIterator[bytes],
+) -> AsyncIterator[dict[str, Any]]:
+    """
+    Yield objects of a JSON array as soon as each one is received.
+
+    Only objects are accepted as items, an object can not end before its
+    closing brace, so a chunk cut inside one is never decoded too early.
+    """
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer, pos, index = "", 0, 0
+    opened = closed = False
+    expect_item = True
+    async for chunk in chunks:
+        buffer = buffer[pos:] + text_decoder.decode(chunk)
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in _whitespace:
+                pos += 1
+            if pos == len(buffer):
+                break
+            char = buffer[pos]
+            if closed:
+                raise _invalid_json(index, "Extra data after JSON array")
+            if not opened:
+                if char != "[":
+                    raise _invalid_json(index, "Expected JSON array")
+                opened = True
+                pos += 1
+            elif char == "]" and (not expect_item or index == 0):
+                closed = True
+                pos += 1
+            elif char == "," and not expect_item:
+                expect_item = True
+                pos += 1
+            elif char == "{" and expect_item:
+                try:
+                    item, pos = _decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    # the object is not complete yet, wait for more data
+                    break
+                yield item
+                index += 1
+                expect_item = False
+            else:
+                raise _invalid_json(index, f"Unexpected {char!r}")
+    rest = (buffer[pos:] + text_decoder.decode(b"", final=True)).strip()
+    if rest.startswith("{"):
+        try:
+            _decoder.raw_decode(rest)
+        except json.JSONDecodeError as e:
+            raise _invalid_json(index, e.msg)
+    if not closed or rest:
+        raise _invalid_json(index, "Unterminated JSON array")
+
+
+async def iter_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Yield not empty lines of a newline delimited JSON stream.
+    """
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
+    if buffer.strip():
+        yield buffer
+
+
+async def iter_validated[Scheme: BaseModel](
+    chunks: AsyncIterator[bytes], scheme: Type[Scheme], media_type: str
+) -> AsyncIterator[Scheme]:
+    """
+    Validate items of a JSON array or NDJSON body one by one.
+
+    Errors are raised as RequestValidationError with the item index in
+    location, the same way FastAPI reports invalid bodies.
+    """
+    ndjson = media_type.split(";")[0].strip() in NDJSON_MEDIA_TYPES
+    items = iter_ndjson(chunks) if ndjson else iter_json_array(chunks)
+    index = 0
+    async for item in items:
+        try:
+            if ndjson:
+                yield scheme.model_validate_json(item)
+            else:
+                yield scheme.model_validate(item)
+        except ValidationError as e:
+            raise RequestValidationError(
+                [
+                    {**error, "loc": ("body", index, *error["loc"])}
+                    for error in e.errors(include_url=False)
+                ]
+            )
+        index += 1
+
+
+async def batched[T](
+    items: AsyncIterator[T], size: int
+) -> AsyncIterator[list[T]]:
+    batch = []
+    async for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -3,16 +3,19 @@ from functools import wraps
 from uuid import UUID
 
 from sqlalchemy import and_, exists, func, or_, select
+from sqlalchemy.orm import aliased
 
 from app.db.models import (
     Answer,
     Company,
     CompanyMember,
     CompanyRole,
+    CompanyUserScoreTotal,
     Question,
     Quiz,
     User,
     UserQuiz,
+    UserScoreTotal,
 )
 from app.schemas.quiz import QuizCreateRequestScheme
 from app.schemas.user_quiz import UserQuizCreateScheme
@@ -81,6 +84,40 @@ class AbstractQuizValidator(BaseValidator, ABC):
 
         return wrapper
 
+    def validate_user_is_company_member_or_owner_by_company_id(self, f):
+        """
+        Validate that the user is a member or the owner of the company.
+
+        Depends: company_id, user
+        """
+
+        @wraps(f)
+        async def wrapper(self_service, **kwargs):
+            company_id: UUID = kwargs["company_id"]
+            user: User = kwargs["user"]
+
+            member_exists = exists().where(
+                CompanyMember.company_id == company_id,
+                CompanyMember.user_id == user.user_id,
+                CompanyMember.is_active == True,
+            )
+            owner_exists = exists().where(
+                Company.company_id == company_id,
+                Company.owner_id == user.user_id,
+            )
+            query = select(or_(member_exists, owner_exists))
+
+            result = await self_service.session.execute(query)
+            exist = result.scalar()
+
+            if not exist:
+                raise PermissionError(
+                    "Validation error. User is not a company member."
+                )
+            return await f(self_service, **kwargs)
+
+        return wrapper
+
     def validate_user_is_owner_or_admin_by_company_id(self, f):
         """
         Validate that the user is admin or owner of the given company by company_id.
@@ -446,11 +483,10 @@ class QuizAnswerValidator(AbstractQuizValidator):
 
             query = self._build_where_exist_select_query(
                 CompanyMember.member_id == company_member_id,
-                CompanyMember.user_id == UserQuiz.user_id,
-                CompanyMember.company_id == Quiz.company_id,
+                CompanyMember.user_id == CompanyUserScoreTotal.user_id,
+                CompanyMember.company_id == CompanyUserScoreTotal.company_id,
                 CompanyMember.is_active == True,
-                Quiz.is_active == True,
-                UserQuiz.quiz_id == Quiz.quiz_id,
+                CompanyUserScoreTotal.attempts > 0,
             )
 
             result = await self_service.session.execute(query)
@@ -478,9 +514,8 @@ class QuizAnswerValidator(AbstractQuizValidator):
             user_id: UUID = kwargs["user_id"]
 
             query = self._build_where_exist_select_query(
-                UserQuiz.user_id == user_id,
-                UserQuiz.quiz_id == Quiz.quiz_id,
-                Quiz.is_active == True,
+                UserScoreTotal.user_id == user_id,
+                UserScoreTotal.attempts > 0,
             )
 
             result = await self_service.session.execute(query)
@@ -563,3 +598,83 @@ class QuizAnswerValidator(AbstractQuizValidator):
             return await f(self_service, **kwargs)
 
         return wrapper
+
+    def validate_user_is_owner_or_admin_by_member_ids(self, f):
+        """
+        Validate that the user is admin or owner of the companies of all
+        the given active company members, with one query.
+
+        Depends: member_ids, user
+        """
+
+        @wraps(f)
+        async def wrapper(self_service, **kwargs):
+            member_ids: set[UUID] = set(kwargs["member_ids"])
+            user: User = kwargs["user"]
+
+            admin = aliased(CompanyMember)
+            admin_exists = exists().where(
+                admin.company_id == CompanyMember.company_id,
+                admin.user_id == user.user_id,
+                admin.role == CompanyRole.admin.value,
+                admin.is_active == True,
+            )
+            query = (
+                select(func.count(CompanyMember.member_id.distinct()))
+                .join(Company, Company.company_id == CompanyMember.company_id)
+                .where(
+                    CompanyMember.member_id.in_(member_ids),
+                    CompanyMember.is_active == True,
+                    Company.is_active == True,
+                    or_(Company.owner_id == user.user_id, admin_exists),
+                )
+            )
+
+            result = await self_service.session.execute(query)
+            allowed = result.scalar()
+
+            if allowed != len(member_ids):
+                raise PermissionError(
+                    "Validation error. User is not admin or owner."
+                )
+            return await f(self_service, **kwargs)
+
+        return wrapper
+
+    def validate_user_is_company_member_or_owner_by_quiz_ids(self, f):
+        """
+        Validate that all the given quizzes are active and the user is a
+        member or the owner of their companies, with one query.
+
+        Depends: quiz_ids, user
+        """
+
+        @wraps(f)
+        async def wrapper(self_service, **kwargs):
+            quiz_ids: set[UUID] = set(kwargs["quiz_ids"])
+            user: User = kwargs["user"]
+
+            member_exists = exists().where(
+                CompanyMember.company_id == Quiz.company_id,
+                CompanyMember.user_id == user.user_id,
+                CompanyMember.is_active == True,
+            )
+            query = (
+                select(func.count(Quiz.quiz_id))
+                .join(Company, Company.company_id == Quiz.company_id)
+                .where(
+                    Quiz.quiz_id.in_(quiz_ids),
+                    Quiz.is_active == True,
+                    Company.is_active == True,
+                    or_(Company.owner_id == user.user_id, member_exists),
+                )
+            )
+
+            result = await self_service.session.execute(query)
+            allowed = result.scalar()
+
+            if allowed != len(quiz_ids):
+                raise PermissionError("Validation error.")
+            return await f(self_service, **kwargs)
+
+        return wrapper
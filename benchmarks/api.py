@@ -0,0 +1,377 @@
+"""
+Load test of the core API flows against seeded data volumes.
+
+Seeds the test database with one of the `app.db.seed` presets, then
+runs every scenario with a fixed number of requests and concurrency and
+reports throughput and latency percentiles as JSON. Requests go in process
+through the ASGI transport by default; with `--base-url` they are sent to
+a running server, which must use the test database.
+
+Usage:
+    python -m benchmarks.api [--scale small|medium|large] [--keep] [--reuse]
+        [--requests N] [--concurrency N] [--scenarios NAME ...]
+        [--base-url URL] [--output FILE]
+
+Compare two result files with `python -m benchmarks.compare`.
+"""
+
+import argparse
+import asyncio
+import datetime
+import itertools
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from collections import Counter
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db.models import Base
+from app.db.seed import PRESETS
+from benchmarks.dataset import DATABASE_URL_TEST, Dataset, prepare
+
+type RequestBuilder = Callable[[Dataset, int], dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    build: RequestBuilder
+
+
+def _auth(email: str) -> dict[str, str]:
+    from app.services.auth import JWTService
+
+    token = JWTService.create_access_token(data={"email": email})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _member(dataset: Dataset, i: int) -> str:
+    return dataset.member_emails[i % len(dataset.member_emails)]
+
+
+def _date_range() -> dict[str, str]:
+    today = datetime.date.today()
+    return {
+        "from_date": str(today - datetime.timedelta(days=29)),
+        "to_date": str(today),
+    }
+
+
+def create_quiz(dataset: Dataset, i: int) -> dict[str, Any]:
+    questions = len(dataset.submit_quiz.questions)
+    return {
+        "method": "POST",
+        "url": f"/quiz/{dataset.company_id}",
+        "headers": _auth(dataset.owner_email),
+        "json": {
+            "name": f"load quiz {uuid.uuid4().hex}",
+            "description": "load test",
+            "questions": [
+                {
+                    "text": f"question {q}",
+                    "answers": [
+                        {"text": f"answer {a}", "is_correct": a == 0}
+                        for a in range(4)
+                    ],
+                }
+                for q in range(questions)
+            ],
+        },
+    }
+
+
+def submit_quiz(dataset: Dataset, i: int) -> dict[str, Any]:
+    quiz = dataset.submit_quiz
+    return {
+        "method": "POST",
+        "url": f"/quiz/answer/take/{quiz.quiz_id}",
+        "headers": _auth(_member(dataset, i)),
+        "json": {
+            "questions": [
+                {
+                    "question_id": str(question_id),
+                    "answers": [{"answer_id": str(answers[i % len(answers)])}],
+                }
+                for question_id, answers in quiz.questions.items()
+            ]
+        },
+    }
+
+
+def _get(
+    url: str,
+    email: Callable[[Dataset, int], str] | None = None,
+    dates: bool = False,
+) -> RequestBuilder:
+    def build(dataset: Dataset, i: int) -> dict[str, Any]:
+        request = {
+            "method": "GET",
+            "url": url.format(
+                company_id=dataset.company_id,
+                quiz_id=dataset.quiz_ids[i % len(dataset.quiz_ids)],
+            ),
+        }
+        if dates:
+            request["params"] = _date_range()
+        if email is not None:
+            request["headers"] = _auth(email(dataset, i))
+        return request
+
+    return build
+
+
+def _owner(dataset: Dataset, i: int) -> str:
+    return dataset.owner_email
+
+
+SCENARIOS = [
+    Scenario("quiz_create", create_quiz),
+    Scenario("quiz_submit", submit_quiz),
+    Scenario(
+        "analytics_global_average",
+        _get("/analytics/global_average_score"),
+    ),
+    Scenario(
+        "analytics_quiz_average",
+        _get("/analytics/average_score_for_each_quiz", dates=True),
+    ),
+    Scenario(
+        "analytics_last_passing",
+        _get("/analytics/last_passing_time_for_each_quiz"),
+    ),
+    Scenario(
+        "analytics_member_average",
+        _get(
+            "/analytics/average_score_for_each_company_member/{company_id}",
+            _owner,
+            dates=True,
+        ),
+    ),
+    Scenario(
+        "analytics_score_matrix",
+        _get(
+            "/analytics/company/{company_id}/score_matrix",
+            _owner,
+            dates=True,
+        ),
+    ),
+    Scenario(
+        "analytics_quiz_distribution",
+        _get(
+            "/analytics/score_distribution_for_quiz/{quiz_id}",
+            _owner,
+            dates=True,
+        ),
+    ),
+    Scenario(
+        "analytics_company_distribution",
+        _get(
+            "/analytics/score_distribution_for_company/{company_id}",
+            _owner,
+            dates=True,
+        ),
+    ),
+    Scenario(
+        "analytics_company_leaderboard",
+        _get("/analytics/leaderboard_for_company/{company_id}", _member),
+    ),
+    Scenario(
+        "analytics_members_last_pass",
+        _get(
+            "/analytics/company_members_with_last_pass_quiz_time/"
+            "{company_id}",
+            _owner,
+        ),
+    ),
+    Scenario(
+        "export_member_json",
+        _get("/quiz/answer/my_all?response_file_type=json", _member),
+    ),
+    Scenario(
+        "export_quiz_csv",
+        _get("/quiz/answer/quiz_all/{quiz_id}?response_file_type=csv", _owner),
+    ),
+    Scenario(
+        "notifications_list",
+        _get("/notification/my_notifications", _member),
+    ),
+    Scenario("notifications_feed", _get("/notification/feed", _member)),
+    Scenario(
+        "notifications_unread_count",
+        _get("/notification/unread_count", _member),
+    ),
+]
+
+
+def summarize(
+    latencies: list[float], statuses: Counter, elapsed: float
+) -> dict[str, Any]:
+    latencies = sorted(latencies)
+    errors = sum(n for status, n in statuses.items() if status >= 400)
+    percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+
+    def ms(value: float) -> float:
+        return round(value * 1000, 3)
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "statuses": {str(status): n for status, n in sorted(statuses.items())},
+        "seconds": round(elapsed, 3),
+        "rps": round(len(latencies) / elapsed, 2),
+        "mean_ms": ms(statistics.fmean(latencies)),
+        "p50_ms": ms(percentiles[49]),
+        "p90_ms": ms(percentiles[89]),
+        "p99_ms": ms(percentiles[98]),
+        "max_ms": ms(latencies[-1]),
+    }
+
+
+async def run_scenario(
+    ac: AsyncClient,
+    scenario: Scenario,
+    dataset: Dataset,
+    requests: int,
+    concurrency: int,
+) -> dict[str, Any]:
+    counter = itertools.count()
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+
+    async def worker():
+        while (i := next(counter)) < requests:
+            request = scenario.build(dataset, i)
+            start = time.perf_counter()
+            response = await ac.request(**request)
+            await response.aread()
+            latencies.append(time.perf_counter() - start)
+            statuses[response.status_code] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, statuses, time.perf_counter() - start)
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+@asynccontextmanager
+async def client(args: argparse.Namespace, session_maker):
+    if args.base_url:
+        async with AsyncClient(base_url=args.base_url, timeout=None) as ac:
+            yield ac
+        return
+
+    from app.db.db_redis import lifespan_redis
+    from app.db.postgres import get_async_session
+    from app.main import app
+
+    async def override_get_async_session():
+        async with session_maker() as session:
+            yield session
+
+    app.dependency_overrides[get_async_session] = override_get_async_session
+    async with lifespan_redis(app), AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://bench", timeout=None
+    ) as ac:
+        yield ac
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    engine = create_async_engine(
+        DATABASE_URL_TEST, pool_size=args.concurrency, max_overflow=0
+    )
+    config = None if args.reuse else PRESETS[args.scale]
+    dataset, seed_info = await prepare(engine, config)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    scenarios = [
+        scenario
+        for scenario in SCENARIOS
+        if not args.scenarios or scenario.name in args.scenarios
+    ]
+
+    results = {}
+    try:
+        async with client(args, session_maker) as ac:
+            for scenario in scenarios:
+                print(f"running {scenario.name}", file=sys.stderr)
+                await run_scenario(
+                    ac, scenario, dataset, args.warmup, args.concurrency
+                )
+                results[scenario.name] = await run_scenario(
+                    ac, scenario, dataset, args.requests, args.concurrency
+                )
+    finally:
+        # the test suite expects an empty test database
+        if not args.keep:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.drop_all)
+        await engine.dispose()
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "created_at": datetime.datetime.now(
+                datetime.timezone.utc
+            ).isoformat(),
+            "python": platform.python_version(),
+            "transport": args.base_url or "asgi",
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+        },
+        "dataset": seed_info,
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scale", choices=PRESETS, default="small")
+    parser.add_argument(
+        "--reuse",
+        action="store_true",
+        help="skip seeding and use the data kept by a previous run",
+    )
+    parser.add_argument(
+        "--keep",
+        action="store_true",
+        help="leave the seeded data in the database for --reuse",
+    )
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument(
+        "--scenarios",
+        nargs="+",
+        choices=[scenario.name for scenario in SCENARIOS],
+    )
+    parser.add_argument("--base-url")
+    parser.add_argument("--output", help="write the JSON report to a file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
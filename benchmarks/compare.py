@@ -0,0 +1,74 @@
+"""
+Compare two `benchmarks.api` reports.
+
+Prints throughput and p50/p99 latency of every scenario side by side and
+exits with status 1 when a scenario regressed by more than the threshold,
+so it can guard a CI job.
+
+Usage:
+    python -m benchmarks.compare BASELINE CURRENT [--threshold 0.2]
+"""
+
+import argparse
+import json
+import sys
+
+
+def regressions(
+    baseline: dict, current: dict, threshold: float
+) -> list[tuple[str, str, float]]:
+    """
+    Scenarios whose rps dropped or p99 grew more than threshold.
+    """
+    found = []
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            continue
+        base = baseline["results"][name]
+        rps = base["rps"] / result["rps"] - 1 if result["rps"] else 1.0
+        p99 = result["p99_ms"] / base["p99_ms"] - 1 if base["p99_ms"] else 0
+        if result["errors"] > base["errors"]:
+            found.append((name, "errors", result["errors"] - base["errors"]))
+        if rps > threshold:
+            found.append((name, "rps", rps))
+        if p99 > threshold:
+            found.append((name, "p99_ms", p99))
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    print(f"{'scenario':<30}{'rps':>20}{'p50 ms':>22}{'p99 ms':>22}")
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        print(
+            f"{name:<30}"
+            + "".join(
+                f"{base[key]:>10.1f} -> {result[key]:<8.1f}"
+                for key in ("rps", "p50_ms", "p99_ms")
+            )
+        )
+
+    found = regressions(baseline, current, args.threshold)
+    for name, metric, change in found:
+        if metric == "errors":
+            print(f"REGRESSION {name}: {change} more errors")
+        else:
+            print(f"REGRESSION {name}: {metric} worse by {change:.0%}")
+    sys.exit(1 if found else 0)
+
+
+if __name__ == "__main__":
+    main()
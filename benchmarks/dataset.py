@@ -0,0 +1,130 @@
+"""
+Benchmark dataset seeded into the test database.
+
+Data is generated by `app.db.seed` with one of its presets. Company 0 is
+the one the benchmark scenarios act on, the other companies only add
+background volume.
+"""
+
+import time
+from dataclasses import asdict, dataclass, field
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.settings import postgres_config_test as conf
+from app.db.seed import SeedConfig, seed_database
+
+DATABASE_URL_TEST = (
+    f"postgresql+asyncpg://{conf.POSTGRES_USER_TEST}:{conf.POSTGRES_PASSWORD_TEST}@"
+    f"{conf.POSTGRES_SERVER_TEST}:{conf.POSTGRES_PORT_TEST}/{conf.POSTGRES_DB_TEST}"
+)
+
+
+@dataclass
+class QuizQuestions:
+    quiz_id: UUID
+    questions: dict[UUID, list[UUID]]
+
+
+@dataclass
+class Dataset:
+    company_id: UUID
+    owner_email: str
+    member_emails: list[str]
+    quiz_ids: list[UUID]
+    submit_quiz: QuizQuestions
+    rows: dict[str, int] = field(default_factory=dict)
+
+
+COUNTED_TABLES = (
+    "users",
+    "company_members",
+    "quizzes",
+    "questions",
+    "answers",
+    "user_quizzes",
+    "user_quiz_answers",
+    "notifications",
+)
+
+
+async def load_dataset(engine: AsyncEngine, members: int = 100) -> Dataset:
+    """
+    Read ids of the seeded company 0 the scenarios act on.
+    """
+    async with engine.connect() as conn:
+        company_id, owner_email = (
+            await conn.execute(
+                text(
+                    "SELECT c.company_id, u.email FROM companies AS c "
+                    "JOIN users AS u ON u.user_id = c.owner_id "
+                    "WHERE c.name = 'company_0'"
+                )
+            )
+        ).one()
+        member_emails = (
+            await conn.scalars(
+                text(
+                    "SELECT u.email FROM company_members AS m "
+                    "JOIN users AS u USING (user_id) "
+                    "WHERE m.company_id = :company_id "
+                    "ORDER BY u.email LIMIT :limit"
+                ),
+                {"company_id": company_id, "limit": members},
+            )
+        ).all()
+        quiz_ids = (
+            await conn.scalars(
+                text(
+                    "SELECT quiz_id FROM quizzes "
+                    "WHERE company_id = :company_id "
+                    "AND name LIKE 'quiz %' ORDER BY name"
+                ),
+                {"company_id": company_id},
+            )
+        ).all()
+        questions: dict[UUID, list[UUID]] = {}
+        for question_id, answer_id in await conn.execute(
+            text(
+                "SELECT qs.question_id, a.answer_id FROM questions AS qs "
+                "JOIN answers AS a USING (question_id) "
+                "WHERE qs.quiz_id = :quiz_id ORDER BY qs.text, a.text"
+            ),
+            {"quiz_id": quiz_ids[0]},
+        ):
+            questions.setdefault(question_id, []).append(answer_id)
+        rows = {}
+        for table in COUNTED_TABLES:
+            rows[table] = await conn.scalar(
+                text(f"SELECT count(*) FROM {table}")
+            )
+    return Dataset(
+        company_id=company_id,
+        owner_email=owner_email,
+        member_emails=list(member_emails),
+        quiz_ids=list(quiz_ids),
+        submit_quiz=QuizQuestions(quiz_id=quiz_ids[0], questions=questions),
+        rows=rows,
+    )
+
+
+async def prepare(
+    engine: AsyncEngine, config: SeedConfig | None
+) -> tuple[Dataset, dict]:
+    """
+    Recreate the schema and seed it unless config is None, then load
+    the dataset.
+    """
+    info = {}
+    if config is not None:
+        start = time.perf_counter()
+        await seed_database(engine, config, recreate=True)
+        info = {
+            "config": asdict(config),
+            "seconds": round(time.perf_counter() - start, 3),
+        }
+    dataset = await load_dataset(engine)
+    info["rows"] = dataset.rows
+    return dataset, info
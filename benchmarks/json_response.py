@@ -0,0 +1,156 @@
+"""
+Throughput benchmark of the fast JSON response mode.
+
+Seeds the test database, then requests `/user/all/` and
+`/quiz/all/{company_id}` in process through the ASGI transport, once with
+`FAST_JSON_RESPONSE` disabled and once enabled. Each mode runs in its own
+interpreter because routes read the setting when they are created.
+
+Usage:
+    python -m benchmarks.json_response [--requests N] [--concurrency N]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.settings import postgres_config_test as conf
+from app.db.models import Answer, Base, Company, Question, Quiz, User
+
+DATABASE_URL_TEST = (
+    f"postgresql+asyncpg://{conf.POSTGRES_USER_TEST}:{conf.POSTGRES_PASSWORD_TEST}@"
+    f"{conf.POSTGRES_SERVER_TEST}:{conf.POSTGRES_PORT_TEST}/{conf.POSTGRES_DB_TEST}"
+)
+USERS = 100
+QUIZZES = 5
+QUESTIONS_PER_QUIZ = 5
+ANSWERS_PER_QUESTION = 4
+
+
+async def seed(session_maker) -> Company:
+    async with session_maker() as session:
+        users = [
+            User(email=f"bench_{i}@example.com", hashed_password="-")
+            for i in range(USERS)
+        ]
+        company = Company(name="bench", owner=users[0])
+        session.add_all(users)
+        session.add(company)
+        for q in range(QUIZZES):
+            quiz = Quiz(name=f"quiz {q}", description="bench", company=company)
+            for i in range(QUESTIONS_PER_QUIZ):
+                question = Question(text=f"question {i}", quiz=quiz)
+                question.answers = [
+                    Answer(text=f"answer {j}", is_correct=j == 0)
+                    for j in range(ANSWERS_PER_QUESTION)
+                ]
+            session.add(quiz)
+        await session.commit()
+        return company
+
+
+async def measure(
+    ac: AsyncClient, url: str, requests: int, concurrency: int
+) -> float:
+    queue = asyncio.Queue()
+    for _ in range(requests):
+        queue.put_nowait(url)
+
+    async def worker():
+        while not queue.empty():
+            response = await ac.get(queue.get_nowait())
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return requests / (time.perf_counter() - start)
+
+
+async def run(requests: int, concurrency: int) -> dict[str, float]:
+    from app.db.postgres import get_async_session
+    from app.main import app
+
+    # pooled connections keep connection setup out of the measurement
+    engine = create_async_engine(DATABASE_URL_TEST, pool_size=concurrency)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def override_get_async_session():
+        async with session_maker() as session:
+            yield session
+
+    app.dependency_overrides[get_async_session] = override_get_async_session
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    company = await seed(session_maker)
+
+    urls = {
+        "/user/all/": f"/user/all/?limit={USERS}",
+        "/quiz/all/{company_id}": (
+            f"/quiz/all/{company.company_id}?limit={QUIZZES}"
+        ),
+    }
+    results = {}
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://bench"
+    ) as ac:
+        for name, url in urls.items():
+            await measure(ac, url, concurrency, concurrency)
+            results[name] = await measure(ac, url, requests, concurrency)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+    return results
+
+
+def run_mode(fast: bool, args: argparse.Namespace) -> dict[str, float]:
+    env = {**os.environ, "FAST_JSON_RESPONSE": str(fast)}
+    output = subprocess.check_output(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.json_response",
+            "--single",
+            f"--requests={args.requests}",
+            f"--concurrency={args.concurrency}",
+        ],
+        env=env,
+    )
+    return json.loads(output.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument(
+        "--single", action="store_true", help=argparse.SUPPRESS
+    )
+    args = parser.parse_args()
+
+    if args.single:
+        results = asyncio.run(run(args.requests, args.concurrency))
+        print(json.dumps(results))
+        return
+
+    default = run_mode(False, args)
+    fast = run_mode(True, args)
+    print(f"{'endpoint':<26}{'default rps':>14}{'fast rps':>14}{'x':>8}")
+    for name in default:
+        print(
+            f"{name:<26}{default[name]:>14.1f}{fast[name]:>14.1f}"
+            f"{fast[name] / default[name]:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Cold start benchmark of the application import.
+
+Every run imports `app.main` in a fresh interpreter with
+`python -X importtime`, the same work a respawned worker does before it
+can serve requests.
+
+Usage:
+    python -m benchmarks.startup [--runs N] [--top N]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+
+# env variables the application must not need to be imported
+LAZY_ENV_PREFIXES = ("GWT_", "AUTH0_")
+
+
+@dataclass
+class ImportTime:
+    total_us: int
+    modules: dict[str, tuple[int, int]]
+
+
+def measure_import(module: str = "app.main") -> ImportTime:
+    env = {
+        key: value
+        for key, value in os.environ.items()
+        if not key.startswith(LAZY_ENV_PREFIXES)
+    }
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            continue
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return ImportTime(total_us=modules[module][1], modules=modules)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    runs = [measure_import() for _ in range(args.runs)]
+    totals = [run.total_us / 1000 for run in runs]
+    print(
+        f"app.main import: median {statistics.median(totals):.1f} ms, "
+        f"min {min(totals):.1f} ms, max {max(totals):.1f} ms"
+    )
+    last = runs[-1].modules
+    print(f"\n{'module':<50}{'self ms':>10}{'cumulative ms':>15}")
+    for name, (self_us, cumulative_us) in sorted(
+        last.items(), key=lambda item: item[1][0], reverse=True
+    )[: args.top]:
+        print(
+            f"{name:<50}{self_us / 1000:>10.1f}{cumulative_us / 1000:>15.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,7 @@
 import asyncio
+import datetime
+import uuid
+from contextlib import contextmanager
 from typing import AsyncGenerator
 
 import pytest
@@ -12,19 +15,34 @@ from sqlalchemy.ext.asyncio import (
 )
 
 from app.core.settings import postgres_config_test as conf
-from app.db.models import Base
-from app.db.postgres import get_async_session
+from app.db.db_redis import lifespan_redis
+from app.db.models import (
+    Answer,
+    Base,
+    Company,
+    CompanyMember,
+    CompanyRole,
+    Question,
+    Quiz,
+    User,
+)
+from app.db.postgres import get_async_session, instrument_engine
 from app.main import app as _app
+from app.services.auth import JWTService
 from app.services.company import CompanyService
 from app.services.company_action import CompanyActionService
+from app.services.redis import RedisService
 from app.services.user import UserService
 from app.services.user_action import UserActionService
+from app.utils.stats import collect_request_stats
 
 DATABASE_URL_TEST = (
     f"postgresql+asyncpg://{conf.POSTGRES_USER_TEST}:{conf.POSTGRES_PASSWORD_TEST}@"
     f"{conf.POSTGRES_SERVER_TEST}:{conf.POSTGRES_PORT_TEST}/{conf.POSTGRES_DB_TEST}"
 )
-engine = create_async_engine(DATABASE_URL_TEST, poolclass=NullPool)
+engine = instrument_engine(
+    create_async_engine(DATABASE_URL_TEST, poolclass=NullPool)
+)
 async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
 metadata = Base.metadata
 
@@ -65,6 +83,120 @@ async def ac(app) -> AsyncGenerator[AsyncClient, None]:
         yield ac
 
 
+def make_user() -> User:
+    return User(
+        email=f"user_{uuid.uuid4().hex}@example.com", hashed_password="-"
+    )
+
+
+def auth_headers(user: User, **headers) -> dict[str, str]:
+    """
+    Bearer headers of the user, extra headers are given with underscores
+    in place of hyphens, if_none_match for If-None-Match.
+    """
+    token = JWTService.create_access_token(data={"email": user.email})
+    return {
+        "Authorization": f"Bearer {token}",
+        **{name.replace("_", "-"): value for name, value in headers.items()},
+    }
+
+
+def date_params() -> dict[str, str]:
+    today = datetime.date.today()
+    return {
+        "from_date": str(today - datetime.timedelta(days=1)),
+        "to_date": str(today),
+    }
+
+
+def make_quiz(company: Company) -> Quiz:
+    """
+    Quiz of two questions, the first answer of each is the right one.
+    """
+    questions = [
+        Question(
+            text=f"question {q}",
+            answers=[
+                Answer(text="right", is_correct=True),
+                Answer(text="wrong", is_correct=False),
+            ],
+        )
+        for q in range(2)
+    ]
+    return Quiz(name="quiz", company=company, questions=questions)
+
+
+async def create_company(
+    members: int = 1, quizzes: int = 1, admins: int = 0
+) -> tuple[User, list[CompanyMember], list[Quiz]]:
+    """
+    Company with its owner, members, then admins, and quizzes.
+    """
+    async with async_session_maker() as session:
+        owner = make_user()
+        company = Company(name=f"company_{uuid.uuid4().hex}", owner=owner)
+        company_members = [
+            CompanyMember(user=make_user(), company=company)
+            for _ in range(members)
+        ] + [
+            CompanyMember(
+                user=make_user(), company=company, role=CompanyRole.admin
+            )
+            for _ in range(admins)
+        ]
+        company_quizzes = [make_quiz(company) for _ in range(quizzes)]
+        session.add_all([*company_members, *company_quizzes])
+        await session.commit()
+    return owner, company_members, company_quizzes
+
+
+async def take_quiz(ac: AsyncClient, quiz: Quiz, user: User, right: int):
+    """
+    Answer the first right questions of the quiz correctly, the rest not.
+    """
+    body = {
+        "questions": [
+            {
+                "question_id": str(question.question_id),
+                "answers": [
+                    {"answer_id": str(question.answers[q >= right].answer_id)}
+                ],
+            }
+            for q, question in enumerate(quiz.questions)
+        ]
+    }
+    response = await ac.post(
+        f"/quiz/answer/take/{quiz.quiz_id}",
+        json=body,
+        headers=auth_headers(user),
+    )
+    assert response.status_code == 200
+
+
+@pytest.fixture(scope="function")
+async def redis() -> AsyncGenerator[RedisService, None]:
+    async with lifespan_redis(None):
+        yield RedisService()
+
+
+@pytest.fixture(scope="function")
+def assert_max_queries():
+    """
+    Fail when the block executes more SQL statements than allowed.
+    """
+
+    @contextmanager
+    def _assert_max_queries(limit: int):
+        with collect_request_stats() as stats:
+            yield stats
+        assert stats.queries <= limit, (
+            f"{stats.queries} queries executed, limit is {limit}, "
+            f"repeated: {stats.repeated(threshold=2)}"
+        )
+
+    return _assert_max_queries
+
+
 @pytest.fixture(scope="session")
 async def session() -> AsyncGenerator[AsyncSession, None]:
     async with async_session_maker() as session:
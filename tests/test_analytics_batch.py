@@ -0,0 +1,112 @@
+import uuid
+
+import pytest
+
+from app.db.models import Company, CompanyMember
+from tests.conftest import (
+    async_session_maker,
+    auth_headers,
+    create_company,
+    date_params,
+    make_quiz,
+    make_user,
+    take_quiz,
+)
+
+
+async def test_batch_analytics(ac, redis):
+    owner, (first, second, admin), (quiz, other_quiz) = await create_company(
+        members=2, quizzes=2, admins=1
+    )
+    await take_quiz(ac, quiz, first.user, right=2)
+    await take_quiz(ac, other_quiz, first.user, right=1)
+    await take_quiz(ac, quiz, second.user, right=0)
+    member_ids = [str(first.member_id), str(second.member_id)]
+
+    response = await ac.post(
+        "/analytics/batch/average_score_for_each_member_quiz",
+        json={"member_ids": member_ids},
+        params=date_params(),
+        headers=auth_headers(admin.user),
+    )
+    members = {
+        member["member_id"]: {
+            q["quiz_id"]: q["average_score"] for q in member["quizzes"]
+        }
+        for member in response.json()["members"]
+    }
+    assert members == {
+        str(first.member_id): {
+            str(quiz.quiz_id): 1,
+            str(other_quiz.quiz_id): 0.5,
+        },
+        str(second.member_id): {str(quiz.quiz_id): 0},
+    }
+
+    response = await ac.post(
+        "/analytics/batch/member_average_score",
+        json={"member_ids": member_ids},
+        headers=auth_headers(owner),
+    )
+    averages = {
+        m["member_id"]: m["average_score"] for m in response.json()["members"]
+    }
+    assert averages == {member_ids[0]: 0.75, member_ids[1]: 0}
+
+    response = await ac.post(
+        "/analytics/batch/score_distribution_for_quiz",
+        json={"quiz_ids": [str(quiz.quiz_id), str(other_quiz.quiz_id)]},
+        params=date_params(),
+        headers=auth_headers(first.user),
+    )
+    single = await ac.get(
+        f"/analytics/score_distribution_for_quiz/{other_quiz.quiz_id}",
+        params=date_params(),
+        headers=auth_headers(first.user),
+    )
+    quizzes = response.json()["quizzes"]
+    assert [q["attempts"] for q in quizzes] == [2, 1]
+    assert quizzes[1] == single.json()
+
+
+async def test_batch_analytics_checks_every_id(ac):
+    owner, (first, admin), (quiz,) = await create_company(admins=1)
+    async with async_session_maker() as session:
+        stranger = make_user()
+        other = Company(name=f"batch_{uuid.uuid4().hex}", owner=stranger)
+        foreign_member = CompanyMember(user=make_user(), company=other)
+        foreign_quiz = make_quiz(other)
+        session.add_all([foreign_member, foreign_quiz])
+        await session.commit()
+
+    with pytest.raises(PermissionError):
+        await ac.post(
+            "/analytics/batch/member_average_score",
+            json={
+                "member_ids": [
+                    str(first.member_id),
+                    str(foreign_member.member_id),
+                ]
+            },
+            headers=auth_headers(owner),
+        )
+    # members may read their quizzes, not the member analytics
+    with pytest.raises(PermissionError):
+        await ac.post(
+            "/analytics/batch/member_average_score",
+            json={"member_ids": [str(first.member_id)]},
+            headers=auth_headers(first.user),
+        )
+    with pytest.raises(PermissionError):
+        await ac.post(
+            "/analytics/batch/score_distribution_for_quiz",
+            json={"quiz_ids": [str(quiz.quiz_id), str(foreign_quiz.quiz_id)]},
+            params=date_params(),
+            headers=auth_headers(admin.user),
+        )
+    response = await ac.post(
+        "/analytics/batch/member_average_score",
+        json={"member_ids": []},
+        headers=auth_headers(owner),
+    )
+    assert response.status_code == 422
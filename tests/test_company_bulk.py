@@ -0,0 +1,102 @@
+import uuid
+
+import pytest
+
+from app.db.models import Company, CompanyMember, User, UserRequest
+from app.services.auth import JWTService
+from tests.conftest import async_session_maker
+
+USERS = 6
+
+
+@pytest.fixture
+async def company_users():
+    async with async_session_maker() as session:
+        owner = User(
+            email="bulk_members_owner@example.com", hashed_password="-"
+        )
+        users = [
+            User(email=f"bulk_members_{i}@example.com", hashed_password="-")
+            for i in range(USERS)
+        ]
+        users[-1].is_active = False
+        company = Company(name="bulk members", owner=owner)
+        company.members = [CompanyMember(user=users[0])]
+        session.add_all([company, *users])
+        await session.commit()
+        return owner, company, users
+
+
+async def test_bulk_membership(ac, company_users, assert_max_queries):
+    owner, company, users = company_users
+    token = JWTService.create_access_token(data={"email": owner.email})
+    headers = {"Authorization": f"Bearer {token}"}
+    url = f"/company/action/{company.company_id}/bulk"
+    user_ids = [str(user.user_id) for user in users]
+    unknown = str(uuid.uuid4())
+
+    with assert_max_queries(4):
+        response = await ac.post(
+            f"{url}/invite",
+            json={"user_ids": [*user_ids, user_ids[1], unknown]},
+            headers=headers,
+        )
+    assert response.status_code == 200
+    statuses = [r["status"] for r in response.json()["results"]]
+    assert statuses == [
+        "already_member",
+        "invited",
+        "invited",
+        "invited",
+        "invited",
+        "not_found",
+        "not_found",
+    ]
+
+    response = await ac.post(
+        f"{url}/invite", json={"user_ids": user_ids[1:2]}, headers=headers
+    )
+    assert response.json()["results"][0]["status"] == "already_invited"
+
+    async with async_session_maker() as session:
+        user_requests = [
+            UserRequest(company_id=company.company_id, user_id=user.user_id)
+            for user in users[1:3]
+        ]
+        session.add_all(user_requests)
+        await session.commit()
+    request_ids = [str(r.request_id) for r in user_requests]
+
+    with assert_max_queries(5):
+        response = await ac.post(
+            f"{url}/confirm_user_requests",
+            json={"request_ids": [*request_ids, unknown]},
+            headers=headers,
+        )
+    statuses = [r["status"] for r in response.json()["results"]]
+    assert statuses == ["accepted", "accepted", "not_found"]
+
+    response = await ac.post(
+        f"{url}/confirm_user_requests",
+        json={"request_ids": request_ids[:1]},
+        headers=headers,
+    )
+    assert response.json()["results"][0]["status"] == "not_pending"
+
+    response = await ac.get(
+        f"/company/action/all_members/{company.company_id}"
+    )
+    members = {m["user"]["user_id"] for m in response.json()["members"]}
+    assert members == set(user_ids[:3])
+
+    with assert_max_queries(3):
+        response = await ac.post(
+            f"{url}/remove", json={"user_ids": user_ids[:4]}, headers=headers
+        )
+    statuses = [r["status"] for r in response.json()["results"]]
+    assert statuses == ["removed", "removed", "removed", "not_member"]
+
+    response = await ac.post(
+        f"{url}/remove", json={"user_ids": []}, headers=headers
+    )
+    assert response.status_code == 422
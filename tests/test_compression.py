@@ -0,0 +1,139 @@
+import asyncio
+import json
+import zlib
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from starlette.responses import JSONResponse, StreamingResponse
+
+from app.middlewares.compression import (
+    CompressionMiddleware,
+    negotiate_encoding,
+)
+
+ITEMS = [{"id": i, "name": f"item {i}"} for i in range(2000)]
+CHUNKS = [json.dumps(ITEMS[i : i + 100]).encode() for i in range(0, 2000, 100)]
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items")
+    async def get_items():
+        return JSONResponse(ITEMS, headers={"ETag": '"items"'})
+
+    @app.get("/small")
+    async def get_small():
+        return {"id": 1}
+
+    async def stream():
+        for chunk in CHUNKS:
+            yield chunk
+
+    @app.get("/stream")
+    async def get_stream():
+        return StreamingResponse(stream(), media_type="application/json")
+
+    @app.get("/events")
+    async def get_events():
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    return app
+
+
+async def _messages(middleware, path: str, accept_encoding: str = "gzip"):
+    messages = []
+    disconnected = asyncio.Event()
+
+    async def receive():
+        # the streaming response listens for a disconnect meanwhile
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "scheme": "http",
+        "server": ("t", 80),
+        "headers": [(b"accept-encoding", accept_encoding.encode())],
+    }
+    await middleware(scope, receive, send)
+    start, *bodies = messages
+    return dict((k.decode(), v.decode()) for k, v in start["headers"]), bodies
+
+
+def test_negotiate_encoding():
+    encodings = ["zstd", "br", "gzip"]
+    assert negotiate_encoding("gzip, br", encodings) == "br"
+    assert negotiate_encoding("gzip;q=1.0, br;q=0.5", encodings) == "gzip"
+    assert negotiate_encoding("br;q=0, *", encodings) == "zstd"
+    assert negotiate_encoding("gzip;q=0, deflate", encodings) is None
+    assert negotiate_encoding("", encodings) is None
+    assert negotiate_encoding("br, zstd", ["gzip"]) is None
+
+
+async def test_compressed_response():
+    app = CompressionMiddleware(_app(), encodings=["gzip"])
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://t"
+    ) as ac:
+        response = await ac.get("/items")
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.headers["etag"] == 'W/"items"'
+        assert response.json() == ITEMS
+        assert response.num_bytes_downloaded * 5 < len(response.content)
+
+        response = await ac.get("/small")
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
+
+        response = await ac.get(
+            "/items", headers={"accept-encoding": "identity"}
+        )
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.headers["etag"] == '"items"'
+
+
+async def test_streaming_chunks_compressed_one_by_one():
+    middleware = CompressionMiddleware(
+        _app(), encodings=["gzip"], thread_threshold=1024
+    )
+    headers, bodies = await _messages(middleware, "/stream")
+    assert headers["content-encoding"] == "gzip"
+
+    # every chunk is sent and decodes as soon as it is received
+    decompressor = zlib.decompressobj(31)
+    for chunk, message in zip(CHUNKS, bodies):
+        assert decompressor.decompress(message["body"]) == chunk
+        assert message["more_body"]
+    assert not bodies[-1]["more_body"]
+    assert decompressor.decompress(bodies[-1]["body"]) == b""
+    assert decompressor.eof
+    assert middleware.active == 0
+
+
+async def test_uncompressed_responses():
+    middleware = CompressionMiddleware(_app(), encodings=["gzip"])
+    headers, bodies = await _messages(middleware, "/events")
+    assert "content-encoding" not in headers
+    assert b"".join(m["body"] for m in bodies) == b"".join(CHUNKS)
+
+    # over the CPU budget
+    middleware = CompressionMiddleware(
+        _app(), encodings=["gzip"], max_concurrent=1
+    )
+    middleware.active = 1
+    headers, bodies = await _messages(middleware, "/stream")
+    assert "content-encoding" not in headers
+    assert headers["vary"] == "Accept-Encoding"
+    assert b"".join(m["body"] for m in bodies) == b"".join(CHUNKS)
+    assert middleware.active == 1
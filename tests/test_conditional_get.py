@@ -0,0 +1,166 @@
+import datetime
+
+import pytest
+from starlette.requests import Request
+
+from app.utils.conditional import PUBLIC_CACHE_CONTROL, Version
+from tests.conftest import auth_headers, create_company, take_quiz
+
+
+def _request(**headers) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "headers": [
+                (name.replace("_", "-").encode(), value.encode())
+                for name, value in headers.items()
+            ],
+        }
+    )
+
+
+@pytest.fixture
+async def company_quiz():
+    owner, (member,), (quiz,) = await create_company()
+    return quiz, owner, member.user
+
+
+def test_version_matches():
+    modified = datetime.datetime(2024, 5, 1, 12, 0, 0, 500000, datetime.UTC)
+    version = Version("marker", last_modified=modified)
+    headers = version.headers()
+    assert headers["Last-Modified"] == "Wed, 01 May 2024 12:00:00 GMT"
+
+    assert not version.matches(_request())
+    assert version.matches(_request(if_none_match=version.etag))
+    assert version.matches(_request(if_none_match=f'"x", W/{version.etag}'))
+    assert version.matches(_request(if_none_match="*"))
+    assert Version("marker").etag == version.etag
+    assert Version("other").etag != version.etag
+
+    since = headers["Last-Modified"]
+    assert version.matches(_request(if_modified_since=since))
+    assert not version.matches(
+        _request(if_modified_since="Wed, 01 May 2024 11:59:59 GMT")
+    )
+    assert not version.matches(_request(if_modified_since="not a date"))
+    # If-None-Match takes precedence
+    assert not version.matches(
+        _request(if_none_match='"x"', if_modified_since=since)
+    )
+
+
+async def test_conditional_quiz(ac, company_quiz):
+    quiz, owner, member = company_quiz
+    url = f"/quiz/{quiz.quiz_id}"
+
+    response = await ac.get(url, headers=auth_headers(member))
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert response.headers["cache-control"] == "private, no-cache"
+    last_modified = response.headers["last-modified"]
+
+    response = await ac.get(
+        url, headers=auth_headers(member, if_none_match=etag)
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    response = await ac.get(
+        url, headers=auth_headers(member, if_modified_since=last_modified)
+    )
+    assert response.status_code == 304
+
+    list_url = f"/quiz/all/{quiz.company_id}"
+    response = await ac.get(list_url)
+    list_etag = response.headers["etag"]
+    response = await ac.get(list_url, headers={"if-none-match": list_etag})
+    assert response.status_code == 304
+
+    # a new question changes the quiz and the company quizzes
+    response = await ac.post(
+        f"/quiz/add_question/{quiz.quiz_id}",
+        json={
+            "text": "another",
+            "answers": [{"text": "yes", "is_correct": True}, {"text": "no"}],
+        },
+        headers=auth_headers(owner),
+    )
+    assert response.status_code == 200
+    response = await ac.get(
+        url, headers=auth_headers(member, if_none_match=etag)
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert len(response.json()["questions"]) == 3
+    response = await ac.get(list_url, headers={"if-none-match": list_etag})
+    assert response.status_code == 200
+
+
+async def test_conditional_company_and_user(ac, company_quiz):
+    quiz, owner, _ = company_quiz
+    url = f"/company/{quiz.company_id}"
+
+    response = await ac.get(url)
+    assert response.headers["cache-control"] == PUBLIC_CACHE_CONTROL
+    etag = response.headers["etag"]
+    response = await ac.get(url, headers={"if-none-match": etag})
+    assert response.status_code == 304
+    assert response.headers["cache-control"] == PUBLIC_CACHE_CONTROL
+
+    response = await ac.patch(
+        url, json={"description": "changed"}, headers=auth_headers(owner)
+    )
+    assert response.status_code == 200
+    response = await ac.get(url, headers={"if-none-match": etag})
+    assert response.status_code == 200
+    assert response.json()["description"] == "changed"
+
+    response = await ac.get("/company/all")
+    assert response.headers["cache-control"] == PUBLIC_CACHE_CONTROL
+
+    url = f"/user/{owner.user_id}"
+    response = await ac.get(url)
+    response = await ac.get(
+        url, headers={"if-modified-since": response.headers["last-modified"]}
+    )
+    assert response.status_code == 304
+
+
+async def test_conditional_export(ac, redis, company_quiz):
+    quiz, owner, member = company_quiz
+    url = f"/quiz/answer/quiz_all/{quiz.quiz_id}"
+    params = {"response_file_type": "json"}
+
+    response = await ac.get(url, params=params, headers=auth_headers(owner))
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    response = await ac.get(
+        url, params=params, headers=auth_headers(owner, if_none_match=etag)
+    )
+    assert response.status_code == 304
+    # csv is another representation
+    response = await ac.get(
+        url,
+        params={"response_file_type": "csv"},
+        headers=auth_headers(owner, if_none_match=etag),
+    )
+    assert response.status_code == 200
+
+    quiz_etag = (
+        await ac.get(f"/quiz/{quiz.quiz_id}", headers=auth_headers(owner))
+    ).headers["etag"]
+    await take_quiz(ac, quiz, member, right=1)
+
+    response = await ac.get(
+        url, params=params, headers=auth_headers(owner, if_none_match=etag)
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert len(response.json()["user_quizzes"]) == 1
+    # attempts leave the quiz version as it is
+    response = await ac.get(
+        f"/quiz/{quiz.quiz_id}",
+        headers=auth_headers(owner, if_none_match=quiz_etag),
+    )
+    assert response.status_code == 304
@@ -0,0 +1,90 @@
+import asyncio
+
+from app.core.constants import HEALTH_PROBE_TIMEOUT
+from app.services.health import HealthService
+
+
+class _Pool:
+    def __init__(self, size: int, checked_out: int):
+        self._size = size
+        self._checked_out = checked_out
+
+    def size(self):
+        return self._size
+
+    def checkedout(self):
+        return self._checked_out
+
+    def overflow(self):
+        return self._checked_out - self._size
+
+
+class _Connection:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    async def execute(self, query):
+        return None
+
+
+class _Engine:
+    def __init__(self, pool: _Pool):
+        self.pool = pool
+        self.connects = 0
+
+    def connect(self):
+        self.connects += 1
+        return _Connection()
+
+
+class _Redis:
+    def __init__(self, delay: float = 0):
+        self._delay = delay
+
+    async def ping(self):
+        await asyncio.sleep(self._delay)
+        return True
+
+
+async def test_readiness_probes_are_cached():
+    engine = _Engine(_Pool(size=2, checked_out=1))
+    service = HealthService()
+    service._init_health(engine=engine, redis=_Redis(), max_pool_size=4)
+    try:
+        readiness = await service.get_readiness(started=True)
+        await service.get_readiness(started=True)
+    finally:
+        await service._close_health()
+
+    assert readiness.ready is True
+    assert engine.connects == 1
+    assert readiness.pool.saturation == 0.25
+    assert {probe.name for probe in readiness.probes} == {"postgres", "redis"}
+
+
+async def test_readiness_exhausted_pool_and_slow_redis():
+    engine = _Engine(_Pool(size=2, checked_out=4))
+    service = HealthService()
+    service._init_health(
+        engine=engine,
+        redis=_Redis(delay=HEALTH_PROBE_TIMEOUT * 2),
+        max_pool_size=4,
+    )
+    try:
+        readiness = await service.get_readiness(started=True)
+    finally:
+        await service._close_health()
+
+    assert readiness.ready is False
+    assert engine.connects == 0
+    assert readiness.pool.overflow == 2
+    assert all(not probe.ok for probe in readiness.probes)
+
+
+async def test_readiness_not_started():
+    readiness = await HealthService().get_readiness(started=False)
+    assert readiness.ready is False
+    assert readiness.probes == []
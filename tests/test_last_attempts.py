@@ -0,0 +1,54 @@
+from sqlalchemy import select, update
+
+from app.db.models import CompanyMember, Quiz, User, UserQuiz
+from app.jobs.last_attempts import backfill_last_attempts
+from tests.conftest import (
+    async_session_maker,
+    auth_headers,
+    create_company,
+    engine,
+    take_quiz,
+)
+
+
+async def _last_passing(ac, quiz: Quiz, owner: User):
+    response = await ac.get("/analytics/last_passing_time_for_each_quiz")
+    quizzes = {
+        q["quiz_id"]: q["last_passing"] for q in response.json()["quizzes"]
+    }
+    response = await ac.get(
+        "/analytics/company_members_with_last_pass_quiz_time/"
+        f"{quiz.company_id}",
+        headers=auth_headers(owner),
+    )
+    return quizzes.get(str(quiz.quiz_id)), response.json()["members"]
+
+
+async def test_last_attempts(ac, redis):
+    owner, (member,), (quiz,) = await create_company()
+    assert await _last_passing(ac, quiz, owner) == (None, [])
+
+    await take_quiz(ac, quiz, member.user, right=2)
+    await take_quiz(ac, quiz, member.user, right=2)
+    async with async_session_maker() as session:
+        last = await session.scalar(
+            select(UserQuiz.attempt_time)
+            .where(UserQuiz.quiz_id == quiz.quiz_id)
+            .order_by(UserQuiz.attempt_time.desc())
+        )
+    recorded = await _last_passing(ac, quiz, owner)
+    quiz_last, members = recorded
+    assert quiz_last == members[0]["last_passing"]
+    assert members == [
+        {"member_id": str(member.member_id), "last_passing": quiz_last}
+    ]
+    assert quiz_last == last.strftime("%Y-%m-%dT%H:%M:%S")
+
+    # times of attempts loaded past the recording are backfilled
+    async with async_session_maker() as session:
+        for model in (Quiz, CompanyMember):
+            await session.execute(update(model).values(last_attempt_at=None))
+        await session.commit()
+    assert await backfill_last_attempts(engine) >= 2
+    assert await _last_passing(ac, quiz, owner) == recorded
+    assert await backfill_last_attempts(engine) == 0
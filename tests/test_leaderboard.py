@@ -0,0 +1,153 @@
+import pytest
+from sqlalchemy import update
+
+from app.core.constants import LEADERBOARD_EXPIRE_TIME
+from app.db.models import CompanyMember, Quiz
+from app.jobs.leaderboards import rebuild_leaderboards
+from app.repositories.user_quiz import UserQuizRepository
+from app.services.leaderboard import (
+    company_leaderboard_key,
+    fill_leaderboard,
+    quiz_leaderboard_key,
+)
+from tests.conftest import (
+    async_session_maker,
+    auth_headers,
+    create_company,
+    engine,
+    make_user,
+    take_quiz,
+)
+
+
+@pytest.fixture
+async def company_quiz():
+    owner, members, (quiz,) = await create_company(members=2)
+    return quiz, owner, *(member.user for member in members)
+
+
+async def test_leaderboards(ac, redis, company_quiz):
+    quiz, owner, first, second = company_quiz
+    company_url = f"/analytics/leaderboard_for_company/{quiz.company_id}"
+    quiz_url = f"/analytics/leaderboard_for_quiz/{quiz.quiz_id}"
+
+    # recorded before the leaderboards are read, filled from Postgres
+    await take_quiz(ac, quiz, first, right=2)
+    await take_quiz(ac, quiz, second, right=1)
+    await take_quiz(ac, quiz, owner, right=0)
+    response = await ac.get(company_url, headers=auth_headers(owner))
+    leaderboard = response.json()
+    # the company leaderboard ranks members only, as the member averages
+    assert leaderboard["total"] == 2
+    assert [e["user_id"] for e in leaderboard["entries"]] == [
+        str(first.user_id),
+        str(second.user_id),
+    ]
+    assert [e["average_score"] for e in leaderboard["entries"]] == [1, 0.5]
+    key = company_leaderboard_key(quiz.company_id)
+    for ranking in (key, f"{key}:sums"):
+        ttl = await redis._get_redis().ttl(ranking)
+        assert 0 < ttl <= LEADERBOARD_EXPIRE_TIME
+
+    # recorded into the filled leaderboards
+    await take_quiz(ac, quiz, second, right=2)
+    await take_quiz(ac, quiz, owner, right=0)
+    for url, total in ((company_url, 2), (quiz_url, 3)):
+        response = await ac.get(f"{url}/my_rank", headers=auth_headers(second))
+        assert response.json() == {
+            "total": total,
+            "entry": {
+                "rank": 2,
+                "user_id": str(second.user_id),
+                "average_score": 0.75,
+            },
+        }
+
+    response = await ac.get(
+        quiz_url, params={"page": 3, "limit": 1}, headers=auth_headers(first)
+    )
+    assert response.json()["entries"] == [
+        {"rank": 3, "user_id": str(owner.user_id), "average_score": 0}
+    ]
+
+    # lost leaderboards are filled again in bulk
+    before = (await ac.get(company_url, headers=auth_headers(owner))).json()
+    for key in (
+        company_leaderboard_key(quiz.company_id),
+        quiz_leaderboard_key(quiz.quiz_id),
+    ):
+        await redis.delete_value(key)
+        await redis.delete_value(f"{key}:sums")
+    await rebuild_leaderboards(engine)
+    assert await redis.is_ranking_filled(quiz_leaderboard_key(quiz.quiz_id))
+    after = (await ac.get(company_url, headers=auth_headers(owner))).json()
+    assert after == before
+
+
+async def test_leaderboard_for_members_only(ac, redis, company_quiz):
+    quiz, *_ = company_quiz
+    async with async_session_maker() as session:
+        stranger = make_user()
+        session.add(stranger)
+        await session.commit()
+
+    with pytest.raises(PermissionError):
+        await ac.get(
+            f"/analytics/leaderboard_for_company/{quiz.company_id}",
+            headers=auth_headers(stranger),
+        )
+    response = await ac.get(
+        f"/analytics/leaderboard_for_company/{quiz.company_id}/my_rank",
+        headers=auth_headers(quiz.company.owner),
+    )
+    assert response.json() == {"total": 0, "entry": None}
+
+
+async def test_leaderboard_filled_once(ac, redis, company_quiz):
+    quiz, owner, first, second = company_quiz
+    key = quiz_leaderboard_key(quiz.quiz_id)
+    await redis.delete_values([key, f"{key}:sums"])
+
+    # a concurrent first read filled the leaderboard meanwhile
+    await fill_leaderboard(key, [(first.user_id, 1, 2)])
+    await fill_leaderboard(key, [(second.user_id, 2, 2)])
+    response = await ac.get(
+        f"/analytics/leaderboard_for_quiz/{quiz.quiz_id}",
+        headers=auth_headers(owner),
+    )
+    assert [e["user_id"] for e in response.json()["entries"]] == [
+        str(first.user_id)
+    ]
+    await fill_leaderboard(key, [(second.user_id, 2, 2)], replace=True)
+    assert await redis._get_redis().zrange(key, 0, -1) == [str(second.user_id)]
+
+
+async def test_leaderboard_sums_of_active_members_and_quizzes(
+    ac, redis, company_quiz
+):
+    quiz, owner, first, second = company_quiz
+    await take_quiz(ac, quiz, first, right=2)
+    await take_quiz(ac, quiz, second, right=2)
+
+    # ex-members and deleted quizzes are left out
+    async with async_session_maker() as session:
+        repo = UserQuizRepository(session)
+        await session.execute(
+            update(CompanyMember)
+            .where(CompanyMember.user_id == second.user_id)
+            .values(is_active=False)
+        )
+        sums = await repo.get_score_sums_for_each_company_user(
+            company_id=quiz.company_id
+        )
+        assert sums == [(quiz.company_id, first.user_id, 2, 2)]
+
+        await session.execute(
+            update(Quiz)
+            .where(Quiz.quiz_id == quiz.quiz_id)
+            .values(is_active=False)
+        )
+        sums = await repo.get_score_sums_for_each_company_user(
+            company_id=quiz.company_id
+        )
+        assert sums == []
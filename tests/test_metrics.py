@@ -0,0 +1,73 @@
+from app.utils.metrics import (
+    Counter,
+    Histogram,
+    MetricsExporter,
+    MetricsRegistry,
+    merge_snapshots,
+    render,
+)
+
+
+def test_histogram_render_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = Histogram(
+        "latency_seconds",
+        "latency",
+        labelnames=("route",),
+        buckets=(0.1, 1.0),
+        registry=registry,
+    )
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.5, "/a")
+    histogram.observe(5, "/a")
+
+    text = render(registry.snapshot())
+
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 2' in text
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{route="/a"} 3' in text
+
+
+def test_merge_workers_snapshots():
+    first, second = MetricsRegistry(), MetricsRegistry()
+    for registry, amount in ((first, 1), (second, 2)):
+        counter = Counter(
+            "requests_total", "requests", ("route",), registry=registry
+        )
+        counter.inc("/a", amount=amount)
+        Histogram("wait_seconds", "wait", registry=registry).observe(0.2)
+
+    merged = merge_snapshots([first.snapshot(), second.snapshot()])
+
+    assert merged["requests_total"]["samples"] == [(("/a",), 3)]
+    ((_, histogram),) = merged["wait_seconds"]["samples"]
+    assert histogram[-1] == 2
+
+
+def test_exporter_collects_other_workers(tmp_path):
+    registry = MetricsRegistry()
+    counter = Counter("requests_total", "requests", registry=registry)
+    counter.inc(amount=2)
+    (tmp_path / "1.json").write_text(
+        '{"requests_total": {"type": "counter", "help": "requests",'
+        ' "labelnames": [], "samples": [[[], 5]]}}'
+    )
+    exporter = MetricsExporter(
+        str(tmp_path), flush_interval=1, stale_after=60, registry=registry
+    )
+
+    merged = exporter.collect()
+
+    assert merged["requests_total"]["samples"] == [((), 7)]
+
+
+async def test_metrics_endpoint(ac):
+    await ac.get("/health/live")
+    response = await ac.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert (
+        'http_request_duration_seconds_count{method="GET",'
+        'route="/health/live",status="200"}' in response.text
+    )
@@ -0,0 +1,119 @@
+import datetime
+import uuid
+
+import pytest
+
+from app.db.models import Notification, User
+from app.schemas.notification import NotificationCreateScheme
+from app.services.notification import NotificationSrvice
+from app.services.notification_counter import unread_count_key
+from tests.conftest import async_session_maker, auth_headers
+
+NOW = datetime.datetime.now(datetime.timezone.utc)
+
+
+@pytest.fixture
+async def user_headers():
+    async with async_session_maker() as session:
+        user = User(
+            email=f"feed_{uuid.uuid4().hex}@example.com", hashed_password="-"
+        )
+        # two notifications share the time, as rows of one fan-out do
+        times = [NOW - datetime.timedelta(minutes=m) for m in (0, 1, 1, 2, 3)]
+        user.notifications = [
+            Notification(text=f"n{i}", time=time, status=i % 2 == 0)
+            for i, time in enumerate(times)
+        ]
+        session.add(user)
+        await session.commit()
+    return user, auth_headers(user)
+
+
+async def test_feed_pages(ac, user_headers):
+    user, headers = user_headers
+    texts, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = await ac.get(
+            "/notification/feed", params=params, headers=headers
+        )
+        feed = response.json()
+        texts += [n["text"] for n in feed["notifications"]]
+        if (cursor := feed["next_cursor"]) is None:
+            break
+    assert texts[0] == "n0"
+    assert sorted(texts[1:3]) == ["n1", "n2"]
+    assert texts[3:] == ["n3", "n4"]
+
+    response = await ac.get(
+        "/notification/feed", params={"unread": True}, headers=headers
+    )
+    feed = response.json()
+    assert [n["text"] for n in feed["notifications"]] == ["n0", "n2", "n4"]
+    assert feed["next_cursor"] is None
+
+    response = await ac.get(
+        "/notification/feed", params={"cursor": "invalid"}, headers=headers
+    )
+    assert response.status_code == 422
+
+
+async def test_unread_count(ac, redis, user_headers):
+    user, headers = user_headers
+    key = unread_count_key(user.user_id)
+    await redis.delete_value(key)
+
+    response = await ac.get("/notification/unread_count", headers=headers)
+    assert response.json() == {"unread": 3}
+    assert await redis.get_value(key) == "3"
+
+    async with async_session_maker() as session:
+        async with NotificationSrvice(session) as service:
+            await service.create_notification(
+                scheme=NotificationCreateScheme(
+                    text="new", user_id=user.user_id
+                )
+            )
+    assert await redis.get_value(key) == "4"
+
+    response = await ac.post("/notification/mark_all_as_read", headers=headers)
+    assert response.json() == {"marked": 4}
+    assert await redis.get_value(key) is None
+
+    response = await ac.get("/notification/unread_count", headers=headers)
+    assert response.json() == {"unread": 0}
+
+
+async def test_unread_count_fill_skipped_after_create(redis, user_headers):
+    user, _ = user_headers
+    key = unread_count_key(user.user_id)
+    await redis.delete_value(key)
+
+    async def create_notification():
+        async with async_session_maker() as session:
+            async with NotificationSrvice(session) as service:
+                await service.create_notification(
+                    scheme=NotificationCreateScheme(
+                        text="new", user_id=user.user_id
+                    )
+                )
+
+    async with async_session_maker() as session:
+        async with NotificationSrvice(session) as service:
+            repo = service.notification_repo
+            count = repo.count_user_unread_notifications
+
+            # a notification is created between the count and the fill
+            async def count_then_create(**kwargs):
+                unread = await count(**kwargs)
+                await create_notification()
+                return unread
+
+            repo.count_user_unread_notifications = count_then_create
+            unread = await service.get_unread_notifications_count(user=user)
+            repo.count_user_unread_notifications = count
+            assert await redis.get_value(key) is None
+
+            recounted = await service.get_unread_notifications_count(user=user)
+            assert recounted.unread == unread.unread + 1
+            assert await redis.get_value(key) == str(recounted.unread)
@@ -0,0 +1,82 @@
+import asyncio
+import json
+
+import pytest
+
+from app.db.db_redis import lifespan_redis
+from app.db.models import User
+from app.schemas.notification import NotificationCreateScheme
+from app.services.notification import NotificationSrvice
+from app.services.notification_stream import NotificationBroker
+from app.services.redis import RedisService
+from tests.conftest import async_session_maker
+
+
+@pytest.fixture
+async def broker():
+    async with lifespan_redis(None):
+        broker = NotificationBroker(queue_size=2)
+        broker._init_broker(redis=RedisService()._get_redis())
+        yield broker
+        await broker._close_broker()
+
+
+@pytest.fixture(scope="module")
+async def user():
+    async with async_session_maker() as session:
+        user = User(email="stream_user@example.com", hashed_password="-")
+        session.add(user)
+        await session.commit()
+        return user
+
+
+async def _create_notification(text: str, user: User):
+    async with async_session_maker() as session:
+        async with NotificationSrvice(session) as service:
+            await service.create_notification(
+                scheme=NotificationCreateScheme(
+                    text=text, user_id=user.user_id
+                )
+            )
+            if text == "rolled back":
+                raise ValueError(text)
+
+
+async def test_notifications_published_after_commit(broker, user):
+    async with broker.listen(user.user_id) as first:
+        async with broker.listen(user.user_id) as second:
+            with pytest.raises(ValueError):
+                await _create_notification("rolled back", user)
+            await _create_notification("committed", user)
+
+            for queue in (first, second):
+                data = await asyncio.wait_for(queue.get(), 1)
+                assert json.loads(data)["text"] == "committed"
+                assert queue.empty()
+
+    redis = RedisService()._get_redis()
+    channels = await redis.pubsub_channels("notifications:*")
+    assert broker._queues == {}
+    assert channels == []
+
+
+async def test_slow_stream_drops_notifications(broker, user):
+    async with broker.listen(user.user_id) as queue:
+        for n in range(3):
+            await _create_notification(f"notification {n}", user)
+        await asyncio.sleep(0.1)
+        assert queue.full()
+        texts = [json.loads(queue.get_nowait())["text"] for _ in range(2)]
+        assert texts == ["notification 0", "notification 1"]
+
+
+async def test_stream_events(broker, user):
+    events = broker.stream(user_id=user.user_id, keepalive=0.05)
+    assert await anext(events) == ": connected\n\n"
+    assert await anext(events) == ": keepalive\n\n"
+    await _create_notification("streamed", user)
+    event = await anext(events)
+    assert event.startswith("event: notification\ndata: ")
+    assert json.loads(event.split("data: ")[1])["text"] == "streamed"
+    await events.aclose()
+    assert broker._queues == {}
@@ -0,0 +1,266 @@
+import datetime
+import uuid
+
+from sqlalchemy import (
+    TIMESTAMP,
+    Column,
+    Integer,
+    MetaData,
+    Table,
+    event,
+    insert,
+    select,
+    text,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.constants import DAYS_DATE_FILTER_RANGE
+from app.db.models import (
+    Answer,
+    Company,
+    Question,
+    Quiz,
+    User,
+    UserQuiz,
+    UserQuizAnswers,
+    notification_partitions,
+    user_quiz_answer_partitions,
+    user_quiz_partitions,
+)
+from app.db.partitions import MonthlyPartitions, add_months, month_start
+from app.repositories.user_quiz import UserQuizRepository
+from tests.conftest import engine
+
+UTC = datetime.timezone.utc
+NOW = datetime.datetime(2026, 1, 20, 15, 30, tzinfo=UTC)
+
+
+def _events_partitions() -> MonthlyPartitions:
+    events = Table(
+        "events",
+        MetaData(),
+        Column("event_id", Integer, primary_key=True),
+        Column("time", TIMESTAMP(timezone=True), primary_key=True),
+        postgresql_partition_by="RANGE (time)",
+    )
+    return MonthlyPartitions(
+        events, "time", ahead_months=1, retention_months=2
+    )
+
+
+def test_months():
+    assert month_start(NOW) == datetime.datetime(2026, 1, 1, tzinfo=UTC)
+    assert add_months(month_start(NOW), -1) == datetime.datetime(
+        2025, 12, 1, tzinfo=UTC
+    )
+    assert add_months(month_start(NOW), 11).month == 12
+    assert add_months(month_start(NOW), 12).year == 2027
+
+
+async def test_notifications_partitions_created_with_table():
+    async with engine.connect() as conn:
+        partitions = await conn.run_sync(notification_partitions.partitions)
+    months = sorted(partitions)
+    now = month_start(datetime.datetime.now(UTC))
+    assert months[0] == notification_partitions.cutoff()
+    assert months[-1] == add_months(now, notification_partitions.ahead_months)
+    assert len(months) == (
+        notification_partitions.retention_months
+        + notification_partitions.ahead_months
+        + 1
+    )
+
+
+async def test_maintain_creates_and_drops_partitions():
+    later = add_months(datetime.datetime.now(UTC), 2)
+    async with engine.connect() as conn:
+        async with conn.begin() as transaction:
+            before = await conn.run_sync(notification_partitions.partitions)
+            created, dropped = await conn.run_sync(
+                notification_partitions.maintain, later
+            )
+            after = await conn.run_sync(notification_partitions.partitions)
+            await transaction.rollback()
+
+    assert len(created) == len(dropped) == 2
+    assert set(dropped) == {before[month] for month in sorted(before)[:2]}
+    assert set(after.values()) == set(before.values()) - set(dropped) | set(
+        created
+    )
+
+
+async def test_retained_lookup_prunes_expired_partitions():
+    cutoff = notification_partitions.cutoff()
+    old = add_months(cutoff, -1)
+    query = (
+        "EXPLAIN SELECT * FROM notifications "
+        "WHERE user_id = gen_random_uuid()"
+    )
+    async with engine.connect() as conn:
+        async with conn.begin() as transaction:
+            # an expired partition the maintenance has not dropped yet
+            await conn.run_sync(notification_partitions.create, since=old)
+            plans = []
+            for condition in ("", " AND time >= :cutoff"):
+                result = await conn.execute(
+                    text(query + condition), {"cutoff": cutoff}
+                )
+                plans.append("\n".join(row[0] for row in result))
+            await transaction.rollback()
+
+    full, retained = plans
+    assert notification_partitions.name(old) in full
+    assert notification_partitions.name(old) not in retained
+    assert notification_partitions.name(cutoff) in retained
+
+
+async def test_partition_existing_table():
+    partitions = _events_partitions()
+    rows = [
+        (1, add_months(NOW, -3)),  # expired
+        (2, add_months(NOW, -2)),
+        (3, NOW),
+        (4, add_months(NOW, 5)),  # later than the created months
+        (5, None),  # moved with the current time
+    ]
+    async with engine.connect() as conn:
+        async with conn.begin() as transaction:
+            await conn.execute(
+                text(
+                    "CREATE TABLE events "
+                    "(event_id integer PRIMARY KEY, time timestamptz)"
+                )
+            )
+            await conn.execute(
+                insert(partitions.table),
+                [{"event_id": i, "time": time} for i, time in rows],
+            )
+
+            moved = await conn.run_sync(partitions.partition_existing, NOW)
+            again = await conn.run_sync(partitions.partition_existing, NOW)
+            relkind = await conn.scalar(
+                text(
+                    "SELECT relkind::text FROM pg_class "
+                    "WHERE relname = 'events'"
+                )
+            )
+            legacy = await conn.scalar(
+                text("SELECT to_regclass('events_legacy')")
+            )
+            ids = await conn.scalars(
+                select(partitions.table.c.event_id).order_by("event_id")
+            )
+            ids = ids.all()
+            months = await conn.run_sync(partitions.partitions)
+            await transaction.rollback()
+
+    assert (moved, again) == (4, None)
+    assert (relkind, legacy) == ("p", None)
+    assert ids == [2, 3, 4, 5]
+    assert partitions.name(month_start(add_months(NOW, 5))) in months.values()
+
+
+async def test_user_quiz_partitions_created_with_table():
+    now = month_start(datetime.datetime.now(UTC))
+    async with engine.connect() as conn:
+        for partitions in (user_quiz_partitions, user_quiz_answer_partitions):
+            months = sorted(await conn.run_sync(partitions.partitions))
+            assert months[0] == now
+            assert months[-1] == add_months(now, partitions.ahead_months)
+
+
+async def test_range_analytics_scans_window_partitions():
+    to_date = datetime.datetime.now(UTC)
+    from_date = to_date - datetime.timedelta(days=DAYS_DATE_FILTER_RANGE)
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    async with engine.connect() as conn:
+        async with conn.begin() as transaction:
+            await conn.run_sync(
+                user_quiz_partitions.create, since=add_months(to_date, -6)
+            )
+            event.listen(
+                conn.sync_connection, "before_cursor_execute", capture
+            )
+            repo = UserQuizRepository(AsyncSession(bind=conn))
+            await repo.get_statistic_for_each_quiz(
+                from_date=from_date, to_date=to_date
+            )
+            event.remove(
+                conn.sync_connection, "before_cursor_execute", capture
+            )
+            statement, parameters = statements[-1]
+            result = await conn.exec_driver_sql(
+                f"EXPLAIN {statement}", parameters
+            )
+            plan = "\n".join(row[0] for row in result)
+            months = await conn.run_sync(user_quiz_partitions.partitions)
+            await transaction.rollback()
+
+    scanned = {name for name in months.values() if name in plan}
+    assert len(months) > 2
+    assert 1 <= len(scanned) <= 2
+    assert scanned <= {
+        user_quiz_partitions.name(month_start(from_date)),
+        user_quiz_partitions.name(month_start(to_date)),
+    }
+
+
+async def test_detach_old_months():
+    now = datetime.datetime.now(UTC)
+    old = add_months(month_start(now), -2)
+    user = User(email=f"detach_{uuid.uuid4().hex}@example.com")
+    company = Company(name=f"detach_{uuid.uuid4().hex}", owner=user)
+    answer = Answer(text="a", is_correct=True)
+    question = Question(text="q", answers=[answer])
+    quiz = Quiz(name="quiz", company=company, questions=[question])
+    user_quiz = UserQuiz(user=user, quiz=quiz, attempt_time=old)
+    user_quiz.answers = [UserQuizAnswers(question=question, answer=answer)]
+
+    async with engine.connect() as conn:
+        async with conn.begin() as transaction:
+            for partitions in (
+                user_quiz_partitions,
+                user_quiz_answer_partitions,
+            ):
+                await conn.run_sync(partitions.create, since=old)
+            async with AsyncSession(bind=conn) as session:
+                session.add(user_quiz)
+                await session.flush()
+
+            detached = []
+            # referencing answers first, attempts can not be detached
+            # while their rows are referenced
+            for partitions in (
+                user_quiz_answer_partitions,
+                user_quiz_partitions,
+            ):
+                detached += await conn.run_sync(partitions.detach, now)
+            remaining = await conn.run_sync(user_quiz_partitions.partitions)
+            archived = await conn.scalar(
+                text(
+                    f"SELECT count(*) FROM "
+                    f"{user_quiz_answer_partitions.name(old)}"
+                )
+            )
+            foreign_keys = await conn.scalar(
+                text(
+                    "SELECT count(*) FROM pg_constraint WHERE contype = 'f' "
+                    "AND conrelid = to_regclass(:t)"
+                ),
+                {"t": user_quiz_answer_partitions.name(old)},
+            )
+            live = await conn.scalar(
+                select(UserQuiz.user_quiz_id).where(
+                    UserQuiz.user_quiz_id == user_quiz.user_quiz_id
+                )
+            )
+            await transaction.rollback()
+
+    assert user_quiz_partitions.name(old) in detached
+    assert user_quiz_answer_partitions.name(old) in detached
+    assert min(remaining) == month_start(now)
+    assert (archived, foreign_keys, live) == (1, 0, None)
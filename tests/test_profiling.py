@@ -0,0 +1,104 @@
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from httpx import ASGITransport, AsyncClient
+
+from app.middlewares.profiling import ProfilingMiddleware
+from app.services.profiling import ProfilingService
+
+
+async def _slow_dependency():
+    await asyncio.sleep(0.1)
+
+
+def _client(directory, **kwargs) -> AsyncClient:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        await _slow_dependency()
+        return {"id": item_id}
+
+    async def events():
+        for i in range(3):
+            await asyncio.sleep(0.05)
+            yield f"data: {i}\n\n"
+
+    @app.get("/events")
+    async def get_events():
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    app.add_middleware(ProfilingMiddleware, directory=directory, **kwargs)
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://t")
+
+
+async def test_sampled_request_profile(tmp_path):
+    async with _client(str(tmp_path), sample_rate=1.0) as ac:
+        response = await ac.get("/items/1")
+    assert response.status_code == 200
+
+    (summary,) = ProfilingService(str(tmp_path)).list_profiles()
+    assert summary.reason == "sampled"
+    assert summary.route == "/items/{item_id}"
+    assert summary.time.total_ms >= 100
+    assert summary.top_functions
+    assert list(tmp_path.glob("*.prof"))
+
+
+async def test_slow_request_stack_samples(tmp_path):
+    async with _client(str(tmp_path), slow_threshold=0.02) as ac:
+        await ac.get("/items/1")
+
+    (summary,) = ProfilingService(str(tmp_path)).list_profiles()
+    assert summary.reason == "slow"
+    assert not list(tmp_path.glob("*.prof"))
+    (folded,) = tmp_path.glob("*.folded")
+    assert "_slow_dependency" in folded.read_text()
+
+
+async def test_fast_request_not_profiled(tmp_path):
+    async with _client(str(tmp_path), slow_threshold=10) as ac:
+        await ac.get("/items/1")
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_long_request_profile_truncated(tmp_path):
+    async with _client(
+        str(tmp_path), sample_rate=1.0, max_duration=0.02
+    ) as ac:
+        await ac.get("/items/1")
+    async with _client(
+        str(tmp_path / "slow"), slow_threshold=0.01, max_duration=0.05
+    ) as ac:
+        await ac.get("/items/1")
+
+    (summary,) = ProfilingService(str(tmp_path)).list_profiles()
+    assert summary.reason == "sampled"
+    assert summary.truncated
+    assert summary.time.total_ms >= 100
+
+    (summary,) = ProfilingService(str(tmp_path / "slow")).list_profiles()
+    assert summary.truncated
+    (folded,) = (tmp_path / "slow").glob("*.folded")
+    samples = sum(
+        int(line.split()[-1]) for line in folded.read_text().split("\n")
+    )
+    # sampled from 10ms to 50ms only, every 10ms
+    assert samples <= 5
+
+
+async def test_event_stream_not_profiled(tmp_path):
+    async with _client(
+        str(tmp_path), sample_rate=1.0, slow_threshold=0.01
+    ) as ac:
+        stream = asyncio.create_task(ac.get("/events"))
+        await asyncio.sleep(0.02)
+        # the open stream leaves cProfile to other requests
+        await ac.get("/items/1")
+        response = await stream
+    assert response.text == "data: 0\n\ndata: 1\n\ndata: 2\n\n"
+
+    (summary,) = ProfilingService(str(tmp_path)).list_profiles()
+    assert summary.route == "/items/{item_id}"
+    assert summary.reason == "sampled"
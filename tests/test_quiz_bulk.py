@@ -0,0 +1,127 @@
+import json
+
+import pytest
+from fastapi.exceptions import RequestValidationError
+from sqlalchemy import func, select
+
+from app.db.models import Company, CompanyMember, Notification, Quiz, User
+from app.schemas.quiz import QuizCreateRequestScheme
+from app.services.auth import JWTService
+from app.utils.streaming import iter_json_array, iter_validated
+from tests.conftest import async_session_maker
+
+
+def _quiz(name: str, questions: int = 2) -> dict:
+    return {
+        "name": name,
+        "description": None,
+        "questions": [
+            {
+                "text": f"question {i}",
+                "answers": [
+                    {"text": "yes", "is_correct": True},
+                    {"text": "no"},
+                ],
+            }
+            for i in range(questions)
+        ],
+    }
+
+
+async def _chunks(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+@pytest.mark.parametrize("size", [1, 7, 1024])
+async def test_json_array_split_in_chunks(size):
+    items = [{"a": "x]}" * i, "b": [1, {"c": "é"}]} for i in range(5)]
+    data = json.dumps(items, ensure_ascii=False).encode()
+    parsed = [item async for item in iter_json_array(_chunks(data, size))]
+    assert parsed == items
+
+
+@pytest.mark.parametrize("data", [b"[{}", b"{}", b'[{"a": 1}}]', b"[{},]"])
+async def test_json_array_invalid(data):
+    with pytest.raises(RequestValidationError):
+        [item async for item in iter_json_array(_chunks(data, 2))]
+
+
+async def test_validated_error_location():
+    body = "\n".join(
+        json.dumps(quiz) for quiz in (_quiz("a"), _quiz("b", questions=1))
+    ).encode()
+    items = iter_validated(
+        _chunks(body, 16), QuizCreateRequestScheme, "application/x-ndjson"
+    )
+    with pytest.raises(RequestValidationError) as e:
+        [item async for item in items]
+    assert e.value.errors()[0]["loc"][:2] == ("body", 1)
+
+
+@pytest.fixture
+async def company_owner():
+    async with async_session_maker() as session:
+        owner = User(email="bulk_owner@example.com", hashed_password="-")
+        members = [
+            User(email=f"bulk_member_{i}@example.com", hashed_password="-")
+            for i in range(2)
+        ]
+        company = Company(name="bulk import", owner=owner)
+        company.members = [CompanyMember(user=user) for user in members]
+        session.add(company)
+        await session.commit()
+        return owner, company
+
+
+async def test_bulk_create_quizzes(ac, company_owner):
+    owner, company = company_owner
+    token = JWTService.create_access_token(data={"email": owner.email})
+    headers = {"Authorization": f"Bearer {token}"}
+    url = f"/quiz/{company.company_id}/bulk"
+
+    body = "\n".join(json.dumps(_quiz(f"bulk {i}")) for i in range(3))
+    response = await ac.post(
+        url,
+        content=body,
+        headers={**headers, "Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 201
+    result = response.json()
+    assert (result["quizzes"], result["questions"], result["answers"]) == (
+        3,
+        6,
+        12,
+    )
+
+    response = await ac.post(
+        url,
+        json=[_quiz("bulk 3"), _quiz("bulk 4", questions=1)],
+        headers=headers,
+    )
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"][:2] == ["body", 1]
+
+    with pytest.raises(PermissionError):
+        await ac.post(
+            url, json=[_quiz("bulk 5"), _quiz("bulk 0")], headers=headers
+        )
+
+    async with async_session_maker() as session:
+        quizzes = await session.scalar(
+            select(func.count())
+            .select_from(Quiz)
+            .where(Quiz.company_id == company.company_id)
+        )
+        notifications = await session.scalars(
+            select(Notification).where(
+                Notification.user_id.in_(
+                    select(CompanyMember.user_id).where(
+                        CompanyMember.company_id == company.company_id
+                    )
+                )
+            )
+        )
+        notifications = notifications.all()
+        assert quizzes == 3
+        assert [n.text for n in notifications] == ["3 new quizzes created"] * 2
@@ -0,0 +1,49 @@
+from fastapi import APIRouter, FastAPI
+from httpx import ASGITransport, AsyncClient
+from pydantic import BaseModel
+
+from app.utils.responses import FastJSONRoute, ModelJSONResponse
+
+
+class _ItemScheme(BaseModel):
+    name: str
+    price: int
+
+
+class _ItemDetailScheme(_ItemScheme):
+    secret: str
+
+
+router = APIRouter(route_class=FastJSONRoute)
+
+
+@router.post("/item", status_code=201)
+async def create_item() -> _ItemScheme:
+    return _ItemScheme(name="item", price=1)
+
+
+@router.get("/item")
+async def get_item() -> _ItemScheme:
+    return _ItemDetailScheme(name="item", price=1, secret="secret")
+
+
+def test_model_json_response_render():
+    response = ModelJSONResponse(_ItemScheme(name="ї", price=1))
+    assert response.body == '{"name":"ї","price":1}'.encode()
+    assert ModelJSONResponse({"a": [1]}).body == b'{"a":[1]}'
+
+
+async def test_fast_json_route():
+    app = FastAPI(default_response_class=ModelJSONResponse)
+    app.include_router(router)
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as ac:
+        response = await ac.post("/item")
+        assert response.status_code == 201
+        assert response.json() == {"name": "item", "price": 1}
+
+        # subclass instance falls back to response model filtering
+        response = await ac.get("/item")
+        assert response.status_code == 200
+        assert response.json() == {"name": "item", "price": 1}
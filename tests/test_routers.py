@@ -6,3 +6,27 @@ async def test_health_check(ac):
         "detail": "ok",
         "result": "working",
     }
+
+
+async def test_readiness_before_lifespan(ac):
+    response = await ac.get("/health/ready")
+    assert response.status_code == 503
+    assert response.json()["ready"] is False
+
+
+async def test_liveness(ac):
+    response = await ac.get("/health/live")
+    assert response.status_code == 200
+    assert response.json()["status"] == "alive"
+
+
+async def test_users_list_queries(ac, assert_max_queries):
+    with assert_max_queries(1):
+        response = await ac.get("/user/all/")
+    assert response.status_code == 200
+
+
+async def test_companies_list_queries(ac, assert_max_queries):
+    with assert_max_queries(1):
+        response = await ac.get("/company/all")
+    assert response.status_code == 200
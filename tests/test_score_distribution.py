@@ -0,0 +1,94 @@
+from sqlalchemy import select
+
+from app.db.models import (
+    CompanyScoreHistogram,
+    QuizScoreHistogram,
+    UserQuiz,
+)
+from app.repositories.score_histogram import ScoreHistogramRepository
+from app.utils.histogram import merge_counts, percentile, score_bucket
+from tests.conftest import (
+    async_session_maker,
+    auth_headers,
+    create_company,
+    date_params,
+    take_quiz,
+)
+
+
+def test_score_bucket():
+    assert score_bucket(1, 3) == 33
+    assert score_bucket(3, 3) == 100
+    assert score_bucket(4, 3) == 100
+    assert score_bucket(0, 0) == 0
+
+
+def test_merged_percentiles():
+    first = {"0": 1, "50": 2}
+    second = {"50": 1, "100": 6}
+    counts = merge_counts([first, second])
+    assert counts == {0: 1, 50: 3, 100: 6}
+    assert percentile(counts, 10) == 0
+    assert percentile(counts, 25) == 50
+    assert percentile(counts, 40) == 50
+    assert percentile(counts, 50) == 100
+    assert percentile({}, 50) is None
+
+
+async def test_score_distribution(ac, redis):
+    owner, (member,), (quiz,) = await create_company()
+    dates = date_params()
+    # scores 0, 50, 50, 100 percent
+    for right in (0, 1, 1, 2):
+        await take_quiz(ac, quiz, member.user, right)
+    headers = auth_headers(owner)
+
+    response = await ac.get(
+        f"/analytics/score_distribution_for_quiz/{quiz.quiz_id}",
+        params=dates,
+        headers=headers,
+    )
+    distribution = response.json()
+    assert distribution["attempts"] == 4
+    assert distribution["median"] == 50
+    assert distribution["percentiles"]["p99"] == 100
+    assert distribution["histogram"] == [
+        {"score": 0, "count": 1},
+        {"score": 50, "count": 2},
+        {"score": 100, "count": 1},
+    ]
+
+    response = await ac.get(
+        f"/analytics/score_distribution_for_company/{quiz.company_id}",
+        params=dates,
+        headers=headers,
+    )
+    assert response.json()["histogram"] == distribution["histogram"]
+
+    # recounted from the user quizzes to the same histograms
+    async with async_session_maker() as session:
+        # an attempt of no questions, recorded as record_user_quiz does
+        attempt = UserQuiz(
+            user_id=member.user_id, quiz_id=quiz.quiz_id, total_questions=0
+        )
+        session.add(attempt)
+        await session.flush()
+        await ScoreHistogramRepository(session).add_score(
+            quiz_id=quiz.quiz_id,
+            company_id=quiz.company_id,
+            day=attempt.attempt_time.date(),
+            bucket=score_bucket(0, 0),
+        )
+        histograms = select(
+            QuizScoreHistogram.counts,
+            CompanyScoreHistogram.counts,
+        ).where(
+            QuizScoreHistogram.quiz_id == quiz.quiz_id,
+            CompanyScoreHistogram.company_id == quiz.company_id,
+            CompanyScoreHistogram.day == QuizScoreHistogram.day,
+        )
+        recorded = (await session.execute(histograms)).all()
+        await ScoreHistogramRepository(session).rebuild()
+        rebuilt = (await session.execute(histograms)).all()
+        await session.rollback()
+    assert recorded == rebuilt == [({"0": 2, "50": 2, "100": 1},) * 2]
@@ -0,0 +1,59 @@
+import uuid
+
+from app.utils.score_matrix import build_score_matrix
+from tests.conftest import (
+    auth_headers,
+    create_company,
+    date_params,
+    take_quiz,
+)
+
+
+def test_build_score_matrix():
+    members = [uuid.uuid4() for _ in range(3)]
+    quizzes = [uuid.uuid4() for _ in range(2)]
+    statistics = [
+        (members[2], quizzes[0], 4, 3),
+        (members[0], quizzes[1], 2, 2),
+        (members[2], quizzes[1], 0, 0),
+        # activated after the ids were read
+        (uuid.uuid4(), quizzes[0], 2, 1),
+        (members[1], uuid.uuid4(), 2, 1),
+    ]
+    assert build_score_matrix(members, quizzes, statistics) == [
+        [None, 1.0],
+        [None, None],
+        [0.75, 0.0],
+    ]
+    assert build_score_matrix(members, [], []) == [[], [], []]
+    assert build_score_matrix([], quizzes, []) == []
+
+
+async def test_company_score_matrix(ac, redis):
+    owner, (first, second), (quiz, other_quiz) = await create_company(
+        members=2, quizzes=2
+    )
+    await take_quiz(ac, quiz, first.user, right=2)
+    await take_quiz(ac, quiz, first.user, right=1)
+    await take_quiz(ac, other_quiz, second.user, right=0)
+
+    response = await ac.get(
+        f"/analytics/company/{quiz.company_id}/score_matrix",
+        params=date_params(),
+        headers=auth_headers(owner),
+    )
+    matrix = response.json()
+    rows = {
+        member_id: dict(zip(matrix["quiz_ids"], scores))
+        for member_id, scores in zip(matrix["member_ids"], matrix["scores"])
+    }
+    assert rows == {
+        str(first.member_id): {
+            str(quiz.quiz_id): 0.75,
+            str(other_quiz.quiz_id): None,
+        },
+        str(second.member_id): {
+            str(quiz.quiz_id): None,
+            str(other_quiz.quiz_id): 0.0,
+        },
+    }
@@ -0,0 +1,75 @@
+from sqlalchemy import update
+
+from app.db.models import (
+    CompanyMember,
+    CompanyUserScoreTotal,
+    Quiz,
+    User,
+    UserQuiz,
+    UserScoreTotal,
+)
+from app.repositories.score_total import ScoreTotalRepository
+from tests.conftest import (
+    async_session_maker,
+    auth_headers,
+    create_company,
+    take_quiz,
+)
+
+
+async def _assert_totals_recounted():
+    async with async_session_maker() as session:
+        repo = ScoreTotalRepository(session)
+        for model, keys in (
+            (UserScoreTotal, (UserQuiz.user_id,)),
+            (CompanyUserScoreTotal, (Quiz.company_id, UserQuiz.user_id)),
+        ):
+            expected = await repo.count_totals(*keys)
+            stored = await repo.get_totals(model)
+            assert {
+                key: totals
+                for key, totals in stored.items()
+                if totals != (0, 0, 0)
+            } == expected
+
+
+async def _averages(ac, user: User, member: CompanyMember):
+    user_average = await ac.get(f"/quiz/answer/average/{user.user_id}")
+    member_average = await ac.get(
+        f"/quiz/answer/member/average/{member.member_id}"
+    )
+    return (
+        user_average.json()["average_score"],
+        member_average.json()["average_score"],
+    )
+
+
+async def test_score_totals(ac, redis):
+    owner, (member,), (first, second) = await create_company(quizzes=2)
+    user = member.user
+    await take_quiz(ac, first, user, right=2)
+    await take_quiz(ac, first, user, right=1)
+    await take_quiz(ac, second, user, right=0)
+    await _assert_totals_recounted()
+    assert await _averages(ac, user, member) == (0.5, 0.5)
+
+    # attempts on a deleted quiz leave the averages
+    response = await ac.delete(
+        f"/quiz/{second.quiz_id}", headers=auth_headers(owner)
+    )
+    assert response.status_code == 200
+    await _assert_totals_recounted()
+    assert await _averages(ac, user, member) == (0.75, 0.75)
+
+    # drifted totals are recounted by the repair
+    async with async_session_maker() as session:
+        await session.execute(
+            update(UserScoreTotal)
+            .where(UserScoreTotal.user_id == user.user_id)
+            .values(correct_answers_count=0)
+        )
+        await session.commit()
+        assert await ScoreTotalRepository(session).repair() >= 1
+        await session.commit()
+    await _assert_totals_recounted()
+    assert await _averages(ac, user, member) == (0.75, 0.75)
@@ -0,0 +1,109 @@
+import datetime
+from collections import Counter
+
+from sqlalchemy import func, select
+
+from app.db.models import (
+    Answer,
+    Company,
+    CompanyMember,
+    Question,
+    Quiz,
+    User,
+    UserQuiz,
+    UserQuizAnswers,
+)
+from app.db.seed import (
+    COLUMNS,
+    DataGenerator,
+    SeedConfig,
+    _copy,
+    _create_partitions,
+)
+from tests.conftest import engine
+
+CONFIG = SeedConfig(
+    users=20,
+    companies=2,
+    members=10,
+    quizzes=3,
+    questions=4,
+    answers=3,
+    attempts=50,
+    notifications=2,
+)
+NOW = datetime.datetime.now(datetime.timezone.utc)
+
+
+def generate(config: SeedConfig = CONFIG) -> dict:
+    generator = DataGenerator(config, now=NOW)
+    rows = {
+        "users": list(generator.users()),
+        "companies": list(generator.companies_rows()),
+        "members": list(generator.members()),
+        "quizzes": list(generator.quizzes()),
+        "questions": list(generator.questions()),
+        "answers": list(generator.answers()),
+        "attempts": [],
+        "attempt_answers": [],
+    }
+    for attempts, answers in generator.attempts():
+        rows["attempts"] += attempts
+        rows["attempt_answers"] += answers
+    rows["notifications"] = list(generator.notifications())
+    return rows
+
+
+def test_generator_is_deterministic():
+    first = generate()
+    second = generate()
+    assert first["attempt_answers"] == second["attempt_answers"]
+    assert [row[:3] for row in first["users"]] == [
+        row[:3] for row in second["users"]
+    ]
+
+
+def test_generated_attempts_are_consistent():
+    rows = generate()
+    correct_answers = {row[0] for row in rows["answers"] if row[3]}
+    correct = Counter(
+        user_quiz_id
+        for _, user_quiz_id, _, _, answer_id in rows["attempt_answers"]
+        if answer_id in correct_answers
+    )
+
+    assert len(rows["attempts"]) == CONFIG.attempts
+    assert len(rows["members"]) == CONFIG.companies * CONFIG.members
+    for user_quiz_id, _, _, _, correct_count, total in rows["attempts"]:
+        assert total == CONFIG.questions
+        assert correct[user_quiz_id] == correct_count
+    attempt_times = {row[0]: row[3] for row in rows["attempts"]}
+    for _, user_quiz_id, attempt_time, _, _ in rows["attempt_answers"]:
+        assert attempt_times[user_quiz_id] == attempt_time
+    assert all(len(row) == len(COLUMNS[UserQuiz]) for row in rows["attempts"])
+
+
+async def test_copy_generated_rows():
+    rows = generate()
+    counts = {}
+    async with engine.connect() as conn:
+        async with conn.begin() as transaction:
+            await _create_partitions(conn, DataGenerator(CONFIG, now=NOW))
+            for model, key in (
+                (User, "users"),
+                (Company, "companies"),
+                (CompanyMember, "members"),
+                (Quiz, "quizzes"),
+                (Question, "questions"),
+                (Answer, "answers"),
+                (UserQuiz, "attempts"),
+                (UserQuizAnswers, "attempt_answers"),
+            ):
+                await _copy(conn, model, rows[key], counts)
+            loaded = await conn.scalar(
+                select(func.count()).select_from(UserQuizAnswers)
+            )
+            await transaction.rollback()
+
+    assert counts["user_quizzes"] == CONFIG.attempts
+    assert loaded >= CONFIG.attempts * CONFIG.questions
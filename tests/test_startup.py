@@ -0,0 +1,13 @@
+from benchmarks.startup import measure_import
+
+# generous budget, catches heavy imports sneaking back to the import path
+IMPORT_TIME_BUDGET_US = 10_000_000
+LAZY_MODULES = ("numpy", "pandas", "uvicorn")
+
+
+def test_app_import_without_lazy_settings_env():
+    import_time = measure_import("app.main")
+
+    assert import_time.total_us < IMPORT_TIME_BUDGET_US
+    for module in LAZY_MODULES:
+        assert module not in import_time.modules
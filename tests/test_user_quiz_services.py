@@ -0,0 +1,41 @@
+import datetime
+import uuid
+
+from app.schemas.user_quiz import ListUserQuizDetailScheme
+from app.services.user_quiz import UserQuizService
+
+
+def _user_quiz_row(user_quiz_id, user_answer_id=None):
+    return {
+        "user_quiz_id": user_quiz_id,
+        "user_id": uuid.uuid4(),
+        "quiz_id": uuid.uuid4(),
+        "correct_answers_count": 1,
+        "total_questions": 2,
+        "attempt_time": datetime.datetime.now(datetime.timezone.utc),
+        "user_answer_id": user_answer_id,
+        "question_id": uuid.uuid4() if user_answer_id else None,
+        "answer_id": uuid.uuid4() if user_answer_id else None,
+    }
+
+
+def test_build_user_quizzes_groups_answer_rows():
+    first, second = uuid.uuid4(), uuid.uuid4()
+    rows = [
+        _user_quiz_row(first, uuid.uuid4()),
+        _user_quiz_row(first, uuid.uuid4()),
+        _user_quiz_row(second),
+    ]
+    scheme = UserQuizService._build_user_quizzes(rows)
+    assert isinstance(scheme, ListUserQuizDetailScheme)
+    assert [uq.user_quiz_id for uq in scheme.user_quizzes] == [first, second]
+    assert len(scheme.user_quizzes[0].answers) == 2
+    assert scheme.user_quizzes[0].answers[0].user_quiz_id == first
+    assert scheme.user_quizzes[1].answers == []
+
+
+async def test_stream_export_chunks():
+    content = "x" * 100_000
+    chunks = [chunk async for chunk in UserQuizService.stream_export(content)]
+    assert len(chunks) == 2
+    assert b"".join(chunks) == content.encode()